@@ -5,39 +5,75 @@ Este arquivo contém a lógica principal do grafo LangGraph e a função
 de processamento de URLs.
 """
 
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pprint import pprint
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
-from langgraph.graph import StateGraph, START, END
 from constants import State
-from nodes import step_descriptor, step_decision, step_think_more, step_finalize
-from routes import decision_router
+from fetcher import AsyncFetcher
+from instrumentation import RunTrace, track_run
+from nodes import (
+    step_fetch,
+    step_persist,
+    step_descriptor,
+    step_decision,
+    step_think_more,
+    step_finalize,
+    step_insight,
+    step_trends,
+    step_reflect,
+    step_merge,
+)
+from routes import decision_router, error_router, fetch_router, parallel_round_router, merged_round_router
+
+# O LangGraph e o LangChain só são importados ao compilar o primeiro grafo
+# e na primeira chamada ao modelo, para que importar este módulo seja rápido
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+    from langgraph.graph import StateGraph
 
 load_dotenv()
 
 
-def build_graph():
+def build_graph(checkpointer: Optional["BaseCheckpointSaver"] = None):
     """
     Constrói o grafo de processamento para avaliação de negócios.
     
     O grafo implementa o seguinte fluxo:
-    1. step_descriptor: Extrai e descreve o conteúdo do site
-    2. step_decision: Decide se há informações suficientes
-    3. step_think_more: Gera insights adicionais (se necessário)
-    4. step_finalize: Produz a avaliação final
+    1. step_fetch: Coleta o conteúdo do site (crawl das páginas relevantes)
+       e, se ele não mudou desde a última avaliação, a reaproveita
+    2. step_descriptor: Descreve o conteúdo do site
+    3. step_decision: Decide se há informações suficientes
+    4. step_think_more: Gera insights adicionais (se necessário)
+    5. step_finalize: Produz a avaliação final
+    6. step_persist: Guarda a avaliação com as impressões digitais do conteúdo
+    
+    Args:
+        checkpointer: Se informado, guarda o estado a cada nó concluído
     
     Returns:
         CompiledGraph: Grafo compilado pronto para execução
     """
+    from langgraph.graph import StateGraph, START, END
+    
     graph_builder = StateGraph(State)
     
     # Adiciona os nós do grafo
+    graph_builder.add_node("step_fetch", step_fetch)
     graph_builder.add_node("step_descriptor", step_descriptor)
     graph_builder.add_node("step_decision", step_decision)
     graph_builder.add_node("step_think_more", step_think_more)
     graph_builder.add_node("step_finalize", step_finalize)
+    graph_builder.add_node("step_persist", step_persist)
     
     # Configura as transições entre nós
-    graph_builder.add_edge(START, "step_descriptor")
+    graph_builder.add_edge(START, "step_fetch")
+    _add_fetch_edges(graph_builder)
     graph_builder.add_edge("step_descriptor", "step_decision")
     
     # Roteamento condicional baseado na decisão
@@ -54,29 +90,183 @@ def build_graph():
     graph_builder.add_edge("step_think_more", "step_decision")
     
     # Finalização do processamento
-    graph_builder.add_edge("step_finalize", END)
+    graph_builder.add_edge("step_finalize", "step_persist")
+    graph_builder.add_edge("step_persist", END)
     
     # Compila e retorna o grafo
-    return graph_builder.compile()
+    return graph_builder.compile(checkpointer=checkpointer)
 
-def process_url(url: str) -> dict:
+
+def _add_fetch_edges(graph_builder: "StateGraph") -> None:
     """
-    Processa uma URL e retorna o resultado da avaliação de negócio.
+    Liga step_fetch à descrição ou, se a avaliação anterior foi
+    reaproveitada ou o site não pôde ser lido, direto ao fim do grafo.
+    
+    Args:
+        graph_builder: Grafo em construção
+    """
+    from langgraph.graph import END
+    
+    graph_builder.add_conditional_edges(
+        "step_fetch",
+        fetch_router,
+        {"step_descriptor": "step_descriptor", "reuse": END, "error": END},
+    )
+
+
+def _build_round_graph(
+    round_nodes: Dict[str, Callable],
+    router: Callable,
+    checkpointer: Optional["BaseCheckpointSaver"] = None,
+):
+    """
+    Constrói um grafo em que cada rodada de insights roda em paralelo
+    (fan-out do LangGraph) e converge em step_merge.
+    
+    Args:
+        round_nodes: Nós executados em paralelo em cada rodada
+        router: Função de roteamento após step_merge
+        checkpointer: Se informado, guarda o estado a cada nó concluído
+        
+    Returns:
+        CompiledGraph: Grafo compilado pronto para execução
+    """
+    from langgraph.graph import StateGraph, START, END
+    
+    graph_builder = StateGraph(State)
+    
+    graph_builder.add_node("step_fetch", step_fetch)
+    graph_builder.add_node("step_descriptor", step_descriptor)
+    for name, node in round_nodes.items():
+        graph_builder.add_node(name, node)
+    graph_builder.add_node("step_merge", step_merge)
+    graph_builder.add_node("step_trends_final", step_trends)
+    graph_builder.add_node("step_finalize", step_finalize)
+    graph_builder.add_node("step_persist", step_persist)
+    
+    # Primeira rodada logo após a coleta e a descrição
+    graph_builder.add_edge(START, "step_fetch")
+    _add_fetch_edges(graph_builder)
+    for name in round_nodes:
+        graph_builder.add_edge("step_descriptor", name)
+    
+    # step_merge espera todos os nós da rodada
+    graph_builder.add_edge(list(round_nodes), "step_merge")
+    graph_builder.add_conditional_edges(
+        "step_merge",
+        router,
+        list(round_nodes) + ["step_trends_final", "step_finalize"],
+    )
+    
+    graph_builder.add_edge("step_trends_final", "step_finalize")
+    graph_builder.add_edge("step_finalize", "step_persist")
+    graph_builder.add_edge("step_persist", END)
+    
+    return graph_builder.compile(checkpointer=checkpointer)
+
+
+def build_parallel_graph(checkpointer: Optional["BaseCheckpointSaver"] = None):
+    """
+    Constrói o grafo do modo "parallel".
+    
+    Em cada rodada, a decisão, o próximo insight (especulativo) e as
+    tendências do insight anterior são gerados em paralelo. No pior caso
+    (três iterações) o caminho crítico cai de 11 para 6 chamadas
+    sequenciais ao modelo, com as mesmas entradas de cada prompt.
+    
+    Args:
+        checkpointer: Se informado, guarda o estado a cada nó concluído
+    
+    Returns:
+        CompiledGraph: Grafo compilado pronto para execução
+    """
+    return _build_round_graph(
+        {"step_decision": step_decision, "step_insight": step_insight, "step_trends": step_trends},
+        parallel_round_router,
+        checkpointer,
+    )
+
+
+def build_merged_graph(checkpointer: Optional["BaseCheckpointSaver"] = None):
+    """
+    Constrói o grafo do modo "merged".
+    
+    Decisão e novo insight saem de uma única chamada estruturada
+    (step_reflect), em paralelo com as tendências do insight anterior.
+    Além do caminho crítico menor, reduz o número total de chamadas.
+    
+    Args:
+        checkpointer: Se informado, guarda o estado a cada nó concluído
+    
+    Returns:
+        CompiledGraph: Grafo compilado pronto para execução
+    """
+    return _build_round_graph(
+        {"step_reflect": step_reflect, "step_trends": step_trends},
+        merged_round_router,
+        checkpointer,
+    )
+
+
+# Construtores disponíveis, indexados pelo nome da configuração do grafo
+GRAPH_BUILDERS: Dict[str, Callable[..., Any]] = {
+    "default": build_graph,
+    "parallel": build_parallel_graph,
+    "merged": build_merged_graph,
+}
+
+# Registro de grafos já compilados, compartilhado por todo o processo. A
+# chave é o modo ou, para grafos com checkpoints, o par (modo, checkpointer)
+_compiled_graphs: Dict[Any, Any] = {}
+_compiled_graphs_lock = threading.Lock()
+
+
+def get_graph(mode: str = "default", checkpointer: Optional["BaseCheckpointSaver"] = None):
+    """
+    Retorna o grafo compilado para a configuração informada.
+    
+    Cada configuração é construída e compilada uma única vez por processo e
+    reutilizada por todas as requisições (sessões do Streamlit, lotes, etc.).
+    O primeiro uso concorrente é protegido por um lock, de forma que apenas
+    uma thread compila o grafo.
+    
+    Args:
+        mode: Nome da configuração do grafo (chave de GRAPH_BUILDERS)
+        checkpointer: Se informado, o grafo guarda o estado a cada nó
+            concluído (um grafo compilado por checkpointer)
+        
+    Returns:
+        CompiledGraph: Grafo compilado compartilhado
+    """
+    key = mode if checkpointer is None else (mode, checkpointer)
+    graph = _compiled_graphs.get(key)
+    if graph is not None:
+        return graph
+    
+    if mode not in GRAPH_BUILDERS:
+        raise ValueError(f"Configuração de grafo desconhecida: {mode}")
+    
+    with _compiled_graphs_lock:
+        graph = _compiled_graphs.get(key)
+        if graph is None:
+            graph = GRAPH_BUILDERS[mode](checkpointer=checkpointer)
+            _compiled_graphs[key] = graph
+    return graph
+
+def _initial_state(url: str, content: str = "") -> State:
+    """
+    Monta o estado inicial do processamento para uma URL.
     
     Args:
         url: URL do site a ser analisado
+        content: Conteúdo já coletado (vazio: step_fetch faz o download)
         
     Returns:
-        dict: Resultado da análise contendo:
-            - descriptor: Descrição do negócio
-            - thoughts: Lista de insights gerados
-            - market_trends: Tendências de mercado identificadas
-            - rating: Nota de 1-10
-            - final_answer: Resumo final da avaliação
+        State: Estado inicial do grafo
     """
-    # Estado inicial do processamento
-    initial_state: State = {
+    return {
         "url": url,
+        "conteudo": content,
         "descricao": "",
         "tendencias_mercado": "",
         "avaliacao": 0,
@@ -84,40 +274,488 @@ def process_url(url: str) -> dict:
         "enough": False,
         "interacoes": 0,
         "pensamentos": [],
+        "resumo_pensamentos": "",
+        "pensamentos_resumidos": 0,
+        "insight_pendente": "",
+        "tendencias_ref": 0,
+        "impressao": "",
+        "simhash": 0,
+        "reutilizado": False,
     }
 
-    # Executa o grafo de processamento
-    graph = build_graph()
-    final_result = None
+
+def error_result(message: str) -> dict:
+    """
+    Resultado padrão quando não é possível processar a URL.
     
-    for result in graph.stream(initial_state):
-        final_result = result
+    Args:
+        message: Mensagem detalhando o erro ocorrido
+        
+    Returns:
+        dict: Resultado no mesmo formato de process_url
+    """
+    return {
+        "descriptor": "Erro no processamento",
+        "thoughts": [],
+        "market_trends": "",
+        "rating": 0,
+        "final_answer": "Não foi possível processar a URL fornecida.",
+        "error": message,
+    }
+
+
+@contextmanager
+def _run_context(use_llm_cache: bool) -> Iterator[Tuple[dict, RunTrace]]:
+    """
+    Contexto de uma execução do grafo: contadores do cache de respostas,
+    medições de tempo/tokens e, se pedido, desvio do cache.
     
-    # Formata e retorna o resultado final
-    if final_result and 'step_finalize' in final_result:
-        state = final_result['step_finalize']
-        return {
+    Args:
+        use_llm_cache: Se False, ignora respostas do modelo já guardadas
+        
+    Yields:
+        Tuple[dict, RunTrace]: Contadores do cache e medições da execução
+    """
+    from llm_cache import bypass_llm_cache, track_llm_cache
+    
+    with track_run() as trace, track_llm_cache() as cache_stats, bypass_llm_cache(not use_llm_cache):
+        yield cache_stats, trace
+
+
+def _run_config(
+    force_refresh: bool,
+    llm: Optional["BaseChatModel"] = None,
+    fetcher: Optional[AsyncFetcher] = None,
+) -> dict:
+    """
+    Configuração repassada aos nós em uma execução do grafo.
+    
+    Args:
+        force_refresh: Se True, não reaproveita avaliações anteriores
+        llm: Modelo desta execução (padrão: o do processo)
+        fetcher: Cliente HTTP desta execução (padrão: o do processo)
+        
+    Returns:
+        dict: Config do LangGraph
+    """
+    configurable: Dict[str, Any] = {"force_refresh": force_refresh}
+    if llm is not None:
+        configurable["llm"] = llm
+    if fetcher is not None:
+        configurable["fetcher"] = fetcher
+    return {"configurable": configurable}
+
+
+def _format_result(
+    state: Optional[dict],
+    cache_stats: Optional[dict] = None,
+    trace: Optional[RunTrace] = None,
+) -> dict:
+    """
+    Converte o estado final do grafo no resultado retornado ao usuário.
+    
+    Args:
+        state: Estado final produzido pelo grafo
+        cache_stats: Contadores do cache de respostas do modelo na execução
+        trace: Medições da execução
+        
+    Returns:
+        dict: Resultado formatado da análise
+    """
+    if state and error_router(state) == "error":
+        # Site que não pôde ser lido: o erro fica isolado nesta URL
+        result = error_result(state["conteudo"])
+    elif state and state.get("resposta_final"):
+        result = {
             "descriptor": state.get("descricao", ""),
             "thoughts": state.get("pensamentos", []),
             "market_trends": state.get("tendencias_mercado", ""),
             "rating": state.get("avaliacao", 0),
-            "final_answer": state.get("resposta_final", "")
+            "final_answer": state.get("resposta_final", ""),
+            "reused": state.get("reutilizado", False),
         }
     else:
+        result = error_result("O grafo terminou sem uma avaliação final.")
+    if cache_stats is not None:
+        result["llm_cache_hits"] = cache_stats["hits"]
+    if trace is not None:
+        result["trace"] = trace.summary()
+        result["trace"]["iterations"] = (state or {}).get("interacoes", 0)
+    return result
+
+
+def process_url(
+    url: str,
+    use_llm_cache: bool = True,
+    mode: str = "default",
+    force_refresh: bool = False,
+    llm: Optional["BaseChatModel"] = None,
+    fetcher: Optional[AsyncFetcher] = None,
+) -> dict:
+    """
+    Processa uma URL e retorna o resultado da avaliação de negócio.
+    
+    Args:
+        url: URL do site a ser analisado
+        use_llm_cache: Se False, ignora respostas do modelo já guardadas
+        mode: Configuração do grafo ("default", "parallel" ou "merged")
+        force_refresh: Se True, avalia de novo mesmo que o conteúdo não tenha
+            mudado desde a última avaliação
+        llm: Modelo único desta execução (padrão: roteamento por nó de models.get_router())
+        fetcher: Cliente HTTP desta execução (padrão: fetcher.get_fetcher())
+        
+    Returns:
+        dict: Resultado da análise contendo:
+            - descriptor: Descrição do negócio
+            - thoughts: Lista de insights gerados
+            - market_trends: Tendências de mercado identificadas
+            - rating: Nota de 1-10
+            - final_answer: Resumo final da avaliação
+            - reused: True se a avaliação anterior foi reaproveitada
+            - llm_cache_hits: Chamadas ao modelo atendidas pelo cache
+            - trace: Tempos e tokens por nó e por tipo de chamada
+    """
+    # Executa o grafo de processamento
+    graph = get_graph(mode)
+    with _run_context(use_llm_cache) as (cache_stats, trace):
+        final_state = graph.invoke(_initial_state(url), _run_config(force_refresh, llm, fetcher))
+    
+    # Formata e retorna o resultado final
+    return _format_result(final_state, cache_stats, trace)
+
+
+def process_checkpointed(
+    url: str,
+    thread_id: str,
+    checkpointer: "BaseCheckpointSaver",
+    use_llm_cache: bool = True,
+    mode: str = "default",
+    force_refresh: bool = False,
+    llm: Optional["BaseChatModel"] = None,
+    fetcher: Optional[AsyncFetcher] = None,
+) -> dict:
+    """
+    Processa uma URL guardando o estado do grafo a cada nó concluído.
+    
+    Se já existe um checkpoint de thread_id (uma execução interrompida no
+    meio), a avaliação é retomada a partir do último nó concluído em vez
+    de recomeçar do download.
+    
+    Args:
+        url: URL do site a ser analisado
+        thread_id: Identificador da execução no checkpointer
+        checkpointer: Onde os checkpoints são guardados
+        use_llm_cache: Se False, ignora respostas do modelo já guardadas
+        mode: Configuração do grafo ("default", "parallel" ou "merged")
+        force_refresh: Se True, avalia de novo mesmo que o conteúdo não tenha
+            mudado desde a última avaliação
+        llm: Modelo único desta execução (padrão: roteamento por nó de models.get_router())
+        fetcher: Cliente HTTP desta execução (padrão: fetcher.get_fetcher())
+        
+    Returns:
+        dict: Resultado da análise no mesmo formato de process_url
+    """
+    graph = get_graph(mode, checkpointer)
+    config = _run_config(force_refresh, llm, fetcher)
+    config["configurable"]["thread_id"] = thread_id
+    
+    snapshot = graph.get_state(config)
+    with _run_context(use_llm_cache) as (cache_stats, trace):
+        if snapshot.values and not snapshot.next:
+            # A execução terminou antes da interrupção; só faltou entregar
+            final_state = snapshot.values
+        else:
+            # Entrada None retoma do último checkpoint
+            graph_input = None if snapshot.next else _initial_state(url)
+            final_state = graph.invoke(graph_input, config)
+    return _format_result(final_state, cache_stats, trace)
+
+
+async def aprocess_url(
+    url: str,
+    use_llm_cache: bool = True,
+    mode: str = "default",
+    force_refresh: bool = False,
+    llm: Optional["BaseChatModel"] = None,
+    fetcher: Optional[AsyncFetcher] = None,
+    content: str = "",
+) -> dict:
+    """
+    Versão assíncrona de process_url, baseada em ainvoke do grafo.
+    
+    Args:
+        url: URL do site a ser analisado
+        use_llm_cache: Se False, ignora respostas do modelo já guardadas
+        mode: Configuração do grafo ("default", "parallel" ou "merged")
+        force_refresh: Se True, avalia de novo mesmo que o conteúdo não tenha
+            mudado desde a última avaliação
+        llm: Modelo único desta execução (padrão: roteamento por nó de models.get_router())
+        fetcher: Cliente HTTP desta execução (padrão: fetcher.get_fetcher())
+        content: Conteúdo já coletado (por exemplo, pelo pipeline); o
+            download é pulado
+        
+    Returns:
+        dict: Resultado da análise no mesmo formato de process_url
+    """
+    graph = get_graph(mode)
+    with _run_context(use_llm_cache) as (cache_stats, trace):
+        final_state = await graph.ainvoke(_initial_state(url, content), _run_config(force_refresh, llm, fetcher))
+    return _format_result(final_state, cache_stats, trace)
+
+
+def _stream_event(mode: str, chunk: Any) -> Optional[dict]:
+    """
+    Converte um item de graph.stream em um evento de streaming.
+    
+    Args:
+        mode: Modo de streaming do LangGraph ("messages" ou "updates")
+        chunk: Conteúdo emitido pelo LangGraph
+        
+    Returns:
+        Optional[dict]: Evento "token" ou "node", ou None se não há nada a emitir
+    """
+    if mode == "messages":
+        message, metadata = chunk
+        if not message.content:
+            return None
         return {
-            "descriptor": "Erro no processamento",
-            "thoughts": [],
-            "market_trends": "",
-            "rating": 0,
-            "final_answer": "Não foi possível processar a URL fornecida."
+            "type": "token",
+            "node": metadata.get("langgraph_node", ""),
+            "message_id": message.id,
+            "delta": message.content,
         }
+    if mode == "updates":
+        for node, update in chunk.items():
+            return {"type": "node", "node": node, "update": update or {}}
+    return None
+
+
+def stream_url(
+    url: str,
+    use_llm_cache: bool = True,
+    mode: str = "default",
+    force_refresh: bool = False,
+    llm: Optional["BaseChatModel"] = None,
+    fetcher: Optional[AsyncFetcher] = None,
+) -> Iterator[dict]:
+    """
+    Processa uma URL emitindo eventos à medida que o grafo avança.
+    
+    Eventos emitidos (dicionários com a chave "type"):
+        - "token": trecho de texto gerado pelo modelo ("node", "message_id", "delta")
+        - "node": conclusão de um nó do grafo ("node", "update")
+        - "result": resultado final, no mesmo formato de process_url ("result")
+    
+    Args:
+        url: URL do site a ser analisado
+        use_llm_cache: Se False, ignora respostas do modelo já guardadas
+        mode: Configuração do grafo ("default", "parallel" ou "merged")
+        force_refresh: Se True, avalia de novo mesmo que o conteúdo não tenha
+            mudado desde a última avaliação
+        llm: Modelo único desta execução (padrão: roteamento por nó de models.get_router())
+        fetcher: Cliente HTTP desta execução (padrão: fetcher.get_fetcher())
+        
+    Yields:
+        dict: Eventos de progresso e, por último, o resultado
+    """
+    graph = get_graph(mode)
+    final_state = None
+    with _run_context(use_llm_cache) as (cache_stats, trace):
+        for stream_mode, chunk in graph.stream(
+            _initial_state(url),
+            _run_config(force_refresh, llm, fetcher),
+            stream_mode=["messages", "updates", "values"],
+        ):
+            if stream_mode == "values":
+                final_state = chunk
+                continue
+            event = _stream_event(stream_mode, chunk)
+            if event is not None:
+                yield event
+    yield {"type": "result", "result": _format_result(final_state, cache_stats, trace)}
+
+
+async def astream_url(
+    url: str,
+    use_llm_cache: bool = True,
+    mode: str = "default",
+    force_refresh: bool = False,
+    llm: Optional["BaseChatModel"] = None,
+    fetcher: Optional[AsyncFetcher] = None,
+) -> AsyncIterator[dict]:
+    """
+    Versão assíncrona de stream_url, baseada em astream do grafo.
+    
+    Args:
+        url: URL do site a ser analisado
+        use_llm_cache: Se False, ignora respostas do modelo já guardadas
+        mode: Configuração do grafo ("default", "parallel" ou "merged")
+        force_refresh: Se True, avalia de novo mesmo que o conteúdo não tenha
+            mudado desde a última avaliação
+        llm: Modelo único desta execução (padrão: roteamento por nó de models.get_router())
+        fetcher: Cliente HTTP desta execução (padrão: fetcher.get_fetcher())
+        
+    Yields:
+        dict: Eventos de progresso e, por último, o resultado
+    """
+    graph = get_graph(mode)
+    final_state = None
+    with _run_context(use_llm_cache) as (cache_stats, trace):
+        async for stream_mode, chunk in graph.astream(
+            _initial_state(url),
+            _run_config(force_refresh, llm, fetcher),
+            stream_mode=["messages", "updates", "values"],
+        ):
+            if stream_mode == "values":
+                final_state = chunk
+                continue
+            event = _stream_event(stream_mode, chunk)
+            if event is not None:
+                yield event
+    yield {"type": "result", "result": _format_result(final_state, cache_stats, trace)}
+
+
+async def astream_many(
+    urls: Iterable[str],
+    max_concurrency: int = 8,
+    use_llm_cache: bool = True,
+    mode: str = "default",
+    force_refresh: bool = False,
+    llm: Optional["BaseChatModel"] = None,
+    fetcher: Optional[AsyncFetcher] = None,
+) -> AsyncIterator[Tuple[int, str, dict]]:
+    """
+    Processa várias URLs concorrentemente, entregando cada resultado assim
+    que ele fica pronto.
+    
+    Falhas são isoladas por URL: uma exceção vira um resultado de erro
+    (com a chave "error") e não interrompe as demais execuções.
+    
+    Args:
+        urls: URLs a serem analisadas
+        max_concurrency: Número máximo de grafos executando ao mesmo tempo
+        use_llm_cache: Se False, ignora respostas do modelo já guardadas
+        mode: Configuração do grafo ("default", "parallel" ou "merged")
+        force_refresh: Se True, avalia de novo mesmo que o conteúdo não tenha
+            mudado desde a última avaliação
+        llm: Modelo único desta execução (padrão: roteamento por nó de models.get_router())
+        fetcher: Cliente HTTP desta execução (padrão: fetcher.get_fetcher())
+        
+    Yields:
+        Tuple[int, str, dict]: Índice da URL na entrada, a URL e o resultado
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency deve ser maior ou igual a 1")
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def _run(index: int, url: str) -> Tuple[int, str, dict]:
+        async with semaphore:
+            try:
+                result = await aprocess_url(url, use_llm_cache, mode, force_refresh, llm, fetcher)
+            except Exception as e:
+                result = error_result(f"Exception: {str(e)}")
+        return index, url, result
+    
+    tasks = [asyncio.ensure_future(_run(i, url)) for i, url in enumerate(urls)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Cancela o que restar se o consumidor abandonar o iterador
+        for task in tasks:
+            task.cancel()
+
+
+async def aprocess_many(
+    urls: Iterable[str],
+    max_concurrency: int = 8,
+    use_llm_cache: bool = True,
+    mode: str = "default",
+    force_refresh: bool = False,
+    llm: Optional["BaseChatModel"] = None,
+    fetcher: Optional[AsyncFetcher] = None,
+) -> List[dict]:
+    """
+    Processa várias URLs concorrentemente e retorna os resultados na ordem
+    de entrada.
+    
+    Args:
+        urls: URLs a serem analisadas
+        max_concurrency: Número máximo de grafos executando ao mesmo tempo
+        use_llm_cache: Se False, ignora respostas do modelo já guardadas
+        mode: Configuração do grafo ("default", "parallel" ou "merged")
+        force_refresh: Se True, avalia de novo mesmo que o conteúdo não tenha
+            mudado desde a última avaliação
+        llm: Modelo único desta execução (padrão: roteamento por nó de models.get_router())
+        fetcher: Cliente HTTP desta execução (padrão: fetcher.get_fetcher())
+        
+    Returns:
+        List[dict]: Resultados na mesma ordem das URLs fornecidas
+    """
+    urls = list(urls)
+    results: List[Optional[dict]] = [None] * len(urls)
+    async for index, _, result in astream_many(
+        urls, max_concurrency, use_llm_cache, mode, force_refresh, llm, fetcher
+    ):
+        results[index] = result
+    return results
+
+
+def process_many(
+    urls: Iterable[str],
+    max_concurrency: int = 8,
+    on_result: Optional[Callable[[int, str, dict], None]] = None,
+    use_llm_cache: bool = True,
+    mode: str = "default",
+    force_refresh: bool = False,
+    llm: Optional["BaseChatModel"] = None,
+    fetcher: Optional[AsyncFetcher] = None,
+) -> List[dict]:
+    """
+    Versão síncrona de aprocess_many.
+    
+    Os nós do grafo são síncronos e rodam no executor padrão do event loop,
+    por isso o executor é dimensionado para max_concurrency. Não deve ser
+    chamada de dentro de um event loop em execução (use aprocess_many).
+    
+    Args:
+        urls: URLs a serem analisadas
+        max_concurrency: Número máximo de grafos executando ao mesmo tempo
+        on_result: Callback opcional chamado com (índice, url, resultado)
+            à medida que cada URL termina
+        use_llm_cache: Se False, ignora respostas do modelo já guardadas
+        mode: Configuração do grafo ("default", "parallel" ou "merged")
+        force_refresh: Se True, avalia de novo mesmo que o conteúdo não tenha
+            mudado desde a última avaliação
+        llm: Modelo único desta execução (padrão: roteamento por nó de models.get_router())
+        fetcher: Cliente HTTP desta execução (padrão: fetcher.get_fetcher())
+        
+    Returns:
+        List[dict]: Resultados na mesma ordem das URLs fornecidas
+    """
+    urls = list(urls)
+    
+    async def _run() -> List[dict]:
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=max_concurrency))
+        results: List[Optional[dict]] = [None] * len(urls)
+        async for index, url, result in astream_many(
+            urls, max_concurrency, use_llm_cache, mode, force_refresh, llm, fetcher
+        ):
+            results[index] = result
+            if on_result is not None:
+                on_result(index, url, result)
+        return results
+    
+    return asyncio.run(_run())
 
 if __name__ == "__main__":
     """
     Exemplo de uso do backend.
     """
-    # URL de teste
-    test_url = "https://example.com"
+    # URL de teste (para muitas URLs, use python -m cli)
+    test_url = sys.argv[1] if len(sys.argv) > 1 else "https://example.com"
     
     print("🤖 AI Agent - Teste do Backend")
     print("=" * 40)
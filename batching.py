@@ -0,0 +1,293 @@
+"""
+Lotes de prompts entre URLs do AI Agent - Avaliação de Negócios
+
+Este arquivo contém o agrupamento das chamadas curtas ao modelo (a
+descrição do site e a decisão de parada) de avaliações simultâneas. A
+primeira chamada de um tipo abre um lote e espera uma janela curta
+(LLM_BATCH_WINDOW); as chamadas do mesmo tipo que chegam nesse intervalo
+entram no lote, enviado como uma única requisição com os itens numerados
+e resposta estruturada (structured.DescriptorBatch/DecisionBatch). Cada
+resposta volta para a execução do grafo que a pediu. Itens sem resposta
+válida, ou todos os itens de um lote que falhou, são refeitos
+individualmente pelo nó, de modo que o resultado nunca depende do lote.
+
+Um lote com N itens economiza N-1 requisições: quando o orçamento de
+requisições por minuto do provedor é o gargalo, a vazão de um lote de
+URLs sobe. O custo é a espera da janela em cada uma dessas chamadas.
+
+O agrupamento é opcional: WEBSCRAP_LLM_BATCH=on liga o agrupador do
+processo (get_batcher()) e config["configurable"]["batcher"] escolhe
+outro para uma execução (False desliga).
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+from constants import LLM_BATCH, LLM_BATCH_MAX_ITEMS, LLM_BATCH_WINDOW
+from instrumentation import Span, current_node, detached, record
+from prompt_context import batch_messages, count_tokens
+from structured import DecisionBatch, DescriptorBatch, parse_structured
+
+if TYPE_CHECKING:
+    from langchain_core.messages import AIMessage, BaseMessage
+
+# Chama o modelo com o prompt do lote e o formato de resposta pedido
+BatchInvoke = Callable[[Sequence["BaseMessage"], Type[BaseModel]], "AIMessage"]
+
+
+@dataclass(frozen=True)
+class BatchKind:
+    """
+    Tipo de chamada agrupável.
+
+    Attributes:
+        model: Modelo da resposta do lote (campo "itens")
+        field: Campo de cada item com a resposta
+        task: Instrução do prompt do lote, aplicada a cada item
+    """
+    model: Type[BaseModel]
+    field: str
+    task: str
+
+
+DESCRIPTOR, DECISION = "descriptor", "decision"
+
+KINDS: Dict[str, BatchKind] = {
+    DESCRIPTOR: BatchKind(
+        DescriptorBatch,
+        "descricao",
+        "Para cada item, forneça um descritor conciso de uma linha resumindo o conteúdo do site. "
+        'Responda apenas com um JSON no formato {"itens": [{"id": número do item, "descricao": "..."}]}, '
+        "com um elemento por item.",
+    ),
+    DECISION: BatchKind(
+        DecisionBatch,
+        "suficiente",
+        "Para cada item, diga se você tem informações suficientes para avaliar esta ideia de negócio "
+        "de forma confiável. "
+        'Responda apenas com um JSON no formato {"itens": [{"id": número do item, "suficiente": true ou false}]}, '
+        "com um elemento por item.",
+    ),
+}
+
+
+@dataclass
+class _Pending:
+    """
+    Item de um lote, à espera da resposta.
+    """
+    text: str
+    tokens: int
+    submitted: float = field(default_factory=time.perf_counter)
+    done: threading.Event = field(default_factory=threading.Event)
+    answer: Any = None
+    # Parcela da requisição do lote: modelo, tokens e espera
+    share: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class _Batch:
+    kind: str
+    invoke: BatchInvoke
+    items: List[_Pending] = field(default_factory=list)
+    full: threading.Event = field(default_factory=threading.Event)
+
+
+class PromptBatcher:
+    """
+    Agrupa chamadas do mesmo tipo de execuções simultâneas do grafo.
+
+    Uso:
+        descricao = batcher.submit(DESCRIPTOR, conteudo, invoke)
+        if descricao is None:
+            ...  # chamada individual
+    """
+
+    def __init__(self, window: float = LLM_BATCH_WINDOW, max_items: int = LLM_BATCH_MAX_ITEMS):
+        """
+        Args:
+            window: Espera máxima, em segundos, por outros itens depois do
+                primeiro de um lote
+            max_items: Itens por lote (um lote cheio é enviado na hora)
+        """
+        self.window = window
+        self.max_items = max_items
+        self._open: Dict[Tuple[str, Hashable], _Batch] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def submit(self, kind: str, text: str, invoke: BatchInvoke, group: Hashable = None) -> Any:
+        """
+        Põe um item no lote aberto do seu tipo (ou abre um) e espera a resposta.
+
+        Quem abre o lote espera a janela e envia a requisição; os demais
+        só esperam. Um lote com um único item não é enviado: o nó faz a
+        chamada de sempre.
+
+        Args:
+            kind: DESCRIPTOR ou DECISION
+            text: Contexto do item (conteúdo ou PromptContext.context())
+            invoke: Chamada ao modelo usada se este item abrir o lote
+            group: Só itens do mesmo grupo (por exemplo, o mesmo modelo)
+                vão para o mesmo lote
+
+        Returns:
+            Any: Valor do campo de resposta do item (str na descrição, bool
+                na decisão), ou None se o item deve ser chamado individualmente
+        """
+        pending = _Pending(text, count_tokens(text))
+        key = (kind, group)
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open[key] = _Batch(kind, invoke)
+            batch.items.append(pending)
+            if len(batch.items) >= self.max_items:
+                del self._open[key]
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._open.get(key) is batch:
+                    del self._open[key]
+            self._flush(batch)
+        pending.done.wait()
+
+        # A parcela da requisição entra no trace da execução do item
+        if pending.share is not None:
+            wall_ms = (time.perf_counter() - pending.submitted) * 1000
+            record(Span(kind="llm", name=current_node() or "llm", wall_ms=wall_ms, **pending.share), aggregate=False)
+        return pending.answer
+
+    def _flush(self, batch: _Batch) -> None:
+        """
+        Envia o lote e distribui as respostas (chamado por quem o abriu).
+
+        Args:
+            batch: Lote fechado
+        """
+        items, kind = batch.items, KINDS[batch.kind]
+        answers: Dict[int, Any] = {}
+        usage: Dict[str, int] = {}
+        model_name = None
+        started = time.perf_counter()
+        try:
+            if len(items) > 1:
+                prompt = batch_messages([item.text for item in items], kind.task)
+                # A requisição conta uma vez nas métricas; cada execução recebe a sua parcela
+                with detached() as shared:
+                    message = batch.invoke(prompt, kind.model)
+                usage = getattr(message, "usage_metadata", None) or {}
+                # Modelo que respondeu (o último da rota tentado), com o nome da rota
+                model_name = shared.spans[-1].model if shared.spans else None
+                for answer in parse_structured(message.content.strip(), kind.model).itens:
+                    value = getattr(answer, kind.field)
+                    # Descrição vazia conta como item sem resposta
+                    if not (isinstance(value, str) and not value.strip()):
+                        answers[answer.id] = value
+        except Exception:
+            # Lote falhou ou resposta fora do esquema: cada item segue sozinho
+            answers = {}
+        finally:
+            total_tokens = sum(item.tokens for item in items) or 1
+            for number, item in enumerate(items, 1):
+                item.answer = answers.get(number)
+                if item.answer is not None:
+                    item.share = {
+                        "model": model_name,
+                        "prompt_tokens": round(usage.get("input_tokens", 0) * item.tokens / total_tokens),
+                        "completion_tokens": round(usage.get("output_tokens", 0) / len(items)),
+                        "queue_ms": (started - item.submitted) * 1000,
+                        "batch": len(items),
+                    }
+                item.done.set()
+            self._count(batch.kind, items, answers)
+
+    def _count(self, kind: str, items: List[_Pending], answers: Dict[int, Any]) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(kind, {"batches": 0, "items": 0, "singles": 0, "fallbacks": 0})
+            if len(items) == 1:
+                entry["singles"] += 1
+                return
+            answered = sum(item.answer is not None for item in items)
+            entry["batches"] += 1
+            entry["items"] += len(items)
+            entry["fallbacks"] += len(items) - answered
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Estatísticas por tipo de chamada.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Lotes enviados, itens neles, tamanho
+                médio, itens refeitos individualmente ("fallbacks"), chamadas
+                que ficaram sozinhas na janela ("singles") e requisições
+                economizadas
+        """
+        with self._lock:
+            return {
+                kind: {
+                    **entry,
+                    "avg_size": entry["items"] / entry["batches"] if entry["batches"] else 0.0,
+                    "requests_saved": entry["items"] - entry["batches"] - entry["fallbacks"],
+                }
+                for kind, entry in self._stats.items()
+            }
+
+
+_batcher: Optional[PromptBatcher] = None
+_batcher_enabled = LLM_BATCH.lower() == "on"
+_batcher_lock = threading.Lock()
+
+
+def get_batcher() -> Optional[PromptBatcher]:
+    """
+    Retorna o agrupador do processo.
+
+    Defina WEBSCRAP_LLM_BATCH=on para ligá-lo (ou use set_batcher).
+
+    Returns:
+        Optional[PromptBatcher]: Instância única, ou None se desligado
+    """
+    global _batcher
+    if not _batcher_enabled:
+        return None
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = PromptBatcher()
+    return _batcher
+
+
+def set_batcher(batcher: Optional[PromptBatcher]) -> None:
+    """
+    Substitui o agrupador do processo (None desliga). Para uma única
+    execução, use config["configurable"]["batcher"].
+
+    Args:
+        batcher: Novo agrupador
+    """
+    global _batcher, _batcher_enabled
+    with _batcher_lock:
+        _batcher, _batcher_enabled = batcher, batcher is not None
+
+
+def resolve_batcher(option: Union[PromptBatcher, bool, None]) -> Optional[PromptBatcher]:
+    """
+    Agrupador de uma execução: o informado na configuração ou o do processo.
+
+    Args:
+        option: Valor de config["configurable"]["batcher"] (False desliga)
+
+    Returns:
+        Optional[PromptBatcher]: Agrupador a usar, ou None
+    """
+    if option is None:
+        return get_batcher()
+    return option or None
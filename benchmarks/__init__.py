@@ -0,0 +1,6 @@
+"""
+Benchmarks do AI Agent - Avaliação de Negócios
+
+Scripts de medição executados a partir da raiz do projeto, por exemplo:
+    python -m benchmarks.bench_graph
+"""
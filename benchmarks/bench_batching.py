@@ -0,0 +1,106 @@
+"""
+Benchmark do agrupamento de prompts entre URLs: requisições e vazão com
+o mesmo limite de requisições por minuto.
+
+Avalia um lote de URLs do corpus local com process_many, com e sem o
+agrupamento das chamadas de descrição e de decisão (batching.py). O
+FakeChatModel faz o papel do provedor e o escalonador aplica um limite
+de requisições por minuto sem pico inicial, de modo que o limite é o
+gargalo desde a primeira chamada. Informa tempo total, URLs por minuto,
+requisições ao modelo (total e por URL), requisições por minuto de fato
+e o tamanho médio dos lotes, e confere que as notas não mudam.
+
+Uso:
+    python -m benchmarks.bench_batching [--urls 16] [--rpm 600] [--window 0.05]
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.fixtures import FixtureServer, fixture_urls, load_corpus
+
+
+def _setup_offline() -> None:
+    os.environ["WEBSCRAP_LLM_CACHE"] = "off"
+    os.environ["WEBSCRAP_CONTENT_CACHE"] = "off"
+    os.environ["WEBSCRAP_RESULT_STORE"] = "off"
+
+
+def _run(urls: List[str], args: argparse.Namespace, batcher: Optional[Any]) -> Dict[str, Any]:
+    """
+    Avalia as URLs com ou sem agrupamento.
+
+    Args:
+        urls: URLs a avaliar
+        args: Opções da linha de comando
+        batcher: Agrupador (None: sem agrupamento)
+
+    Returns:
+        Dict[str, Any]: Tempo total, requisições, notas e estatísticas dos lotes
+    """
+    from backend import process_many
+    from batching import set_batcher
+    from benchmarks.fake_llm import FakeChatModel, decision_script
+    from nodes import set_llm
+    from scheduler import LLMScheduler, set_scheduler
+
+    # Sem pico: o orçamento por minuto vale desde a primeira requisição
+    set_scheduler(
+        LLMScheduler(requests_per_minute=args.rpm, tokens_per_minute=1e12, max_concurrency=32, burst_seconds=1)
+    )
+    model = FakeChatModel(latency=args.latency, script=decision_script([False] * args.rounds + [True]))
+    set_llm(model)
+    set_batcher(batcher)
+
+    start = time.perf_counter()
+    results = process_many(urls, max_concurrency=len(urls))
+    elapsed = time.perf_counter() - start
+    errors = [result["error"] for result in results if result.get("error")]
+    if errors:
+        raise RuntimeError(errors[0])
+    return {
+        "seconds": elapsed,
+        "requests": model.calls,
+        "ratings": sorted({result["rating"] for result in results}),
+        "batches": batcher.stats() if batcher is not None else {},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--urls", type=int, default=16, help="URLs avaliadas ao mesmo tempo")
+    parser.add_argument("--rpm", type=float, default=600, help="Limite de requisições por minuto")
+    parser.add_argument("--latency", type=float, default=0.1, help="Latência do modelo falso (s)")
+    parser.add_argument("--window", type=float, default=0.05, help="Janela dos lotes (s)")
+    parser.add_argument("--max-items", type=int, default=16, help="Itens por lote")
+    parser.add_argument("--rounds", type=int, default=1, help="Decisões False antes do True")
+    args = parser.parse_args()
+
+    _setup_offline()
+    from batching import PromptBatcher
+
+    with FixtureServer(load_corpus()) as server:
+        urls = fixture_urls(server.base_url, list(server.pages), args.urls)
+        results = {
+            "individual": _run(urls, args, None),
+            "em lote": _run(urls, args, PromptBatcher(window=args.window, max_items=args.max_items)),
+        }
+
+    print(f"{'cenário':<12} {'tempo_s':>8} {'URLs/min':>9} {'requisições':>12} {'req/URL':>8} {'req/min':>8} {'notas':>8}")
+    for name, result in results.items():
+        minutes = result["seconds"] / 60
+        print(
+            f"{name:<12} {result['seconds']:8.1f} {args.urls / minutes:9.1f} {result['requests']:12d} "
+            f"{result['requests'] / args.urls:8.1f} {result['requests'] / minutes:8.0f} {result['ratings']!s:>8}"
+        )
+    for kind, stats in results["em lote"]["batches"].items():
+        print(
+            f"  {kind}: {stats['batches']} lotes, {stats['avg_size']:.1f} itens em média, "
+            f"{stats['singles']} sozinhos, {stats['fallbacks']} refeitos, {stats['requests_saved']} requisições a menos"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark da parada antecipada: chamadas ao modelo por URL.
+
+Avalia as URLs do corpus local com o FakeChatModel respondendo que a
+informação é suficiente depois de N rodadas de insights e conta as
+chamadas ao modelo por URL. O cenário "nunca" (todas as decisões False)
+reproduz o comportamento anterior à saída estruturada, em que a decisão
+nunca era reconhecida e o laço sempre ia até MAX_ITERACOES; a economia de
+cada cenário é medida contra ele. Cada política de parada (policies.py)
+é medida em todos os cenários, com a média de iterações e as decisões
+tomadas sem chamar o modelo.
+
+Uso:
+    python -m benchmarks.bench_decision [--urls 5] [--mode parallel]
+    python -m benchmarks.bench_decision --policies llm,budget+novelty+llm
+"""
+
+import argparse
+import os
+from typing import List
+
+from benchmarks.fixtures import FixtureServer, fixture_urls, load_corpus
+
+
+def _setup_offline(args: argparse.Namespace) -> None:
+    # Antes de importar constants, que lê os limites do ambiente
+    os.environ["WEBSCRAP_STOP_TOKENS"] = str(args.token_budget)
+    os.environ["WEBSCRAP_LLM_CACHE"] = "off"
+    os.environ["WEBSCRAP_CONTENT_CACHE"] = "off"
+    os.environ["WEBSCRAP_RESULT_STORE"] = "off"
+
+    from scheduler import LLMScheduler, set_scheduler
+
+    set_scheduler(LLMScheduler(requests_per_minute=1e9, tokens_per_minute=1e12, max_concurrency=32))
+
+
+def calls_per_url(urls: List[str], decisions: List[bool], mode: str) -> float:
+    """
+    Média de chamadas ao modelo por URL com um roteiro de decisões.
+
+    Args:
+        urls: URLs a avaliar
+        decisions: Respostas de step_decision, em ordem, para cada URL
+        mode: Configuração do grafo
+
+    Returns:
+        float: Chamadas por URL
+    """
+    from backend import process_url
+    from benchmarks.fake_llm import FakeChatModel, decision_script
+
+    total = 0
+    for url in urls:
+        # Um modelo por URL: o roteiro recomeça a cada avaliação
+        model = FakeChatModel(script=decision_script(decisions))
+        result = process_url(url, mode=mode, llm=model)
+        if result.get("error"):
+            raise RuntimeError(f"{url}: {result['error']}")
+        total += model.calls
+    return total / len(urls)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--urls", type=int, default=5, help="URLs por cenário")
+    parser.add_argument("--mode", default="default", choices=("default", "parallel"), help="Configuração do grafo")
+    parser.add_argument("--policies", default="llm,novelty,novelty+llm,budget+llm", help="Políticas de parada a comparar")
+    parser.add_argument("--token-budget", type=int, default=600, help="Orçamento de tokens da política budget")
+    args = parser.parse_args()
+
+    _setup_offline(args)
+    from constants import MAX_ITERACOES
+    from policies import policy_stats, reset_policy_stats, set_stop_policy
+
+    # Cenários: suficiente depois de 0..MAX_ITERACOES-1 rodadas, e nunca
+    scenarios = [(f"após {rounds}", [False] * rounds + [True]) for rounds in range(MAX_ITERACOES)]
+    scenarios.append(("nunca", [False]))
+
+    with FixtureServer(load_corpus()) as server:
+        urls = fixture_urls(server.base_url, list(server.pages), args.urls)
+        for spec in args.policies.split(","):
+            set_stop_policy(spec)
+            results = []
+            for name, decisions in scenarios:
+                reset_policy_stats()
+                calls = calls_per_url(urls, decisions, args.mode)
+                stats = next(iter(policy_stats().values()))
+                results.append((name, calls, stats))
+
+            # "nunca" com o modelo decidindo equivale ao laço antigo, sempre até o limite
+            baseline = MAX_ITERACOES * 3 + 2
+            print(f"política {spec}")
+            print(f"  {'suficiente':<12} {'chamadas/URL':>14} {'economia':>10} {'iterações':>10} {'decisões locais/URL':>20}")
+            for name, calls, stats in results:
+                print(
+                    f"  {name:<12} {calls:14.1f} {(baseline - calls) / baseline:>10.0%} "
+                    f"{stats['avg_iterations']:10.1f} {stats['calls_saved'] / len(urls):20.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
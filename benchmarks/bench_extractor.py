@@ -0,0 +1,84 @@
+"""
+Benchmark da extração de texto: BeautifulSoup completo x extrator em streaming.
+
+Mede tempo e pico de memória (tracemalloc) para cada documento do corpus.
+Sem --corpus, gera um corpus sintético com páginas de tamanhos variados.
+O pico de memória do lxml inclui apenas as alocações feitas pelo Python,
+não as da libxml2.
+
+Uso:
+    python -m benchmarks.bench_extractor [--corpus DIR] [--repeat 5]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+from bs4 import BeautifulSoup
+
+from constants import CONTENT_CHAR_BUDGET
+from extractor import extract_text
+
+from benchmarks.fixtures import load_corpus
+
+
+def _bs4_full(html: str) -> str:
+    # Caminho anterior: árvore completa e get_text do documento inteiro
+    soup = BeautifulSoup(html, "html.parser")
+    return soup.get_text(separator=" ", strip=True)[:1000]
+
+
+def _measure(func: Callable[[str], str], html: str, repeat: int) -> Dict[str, float]:
+    """
+    Mede o tempo médio e o pico de memória de uma extração.
+
+    Args:
+        func: Função de extração
+        html: Documento HTML
+        repeat: Número de repetições para o tempo médio
+
+    Returns:
+        Dict[str, float]: Tempo em ms e pico de memória em KB
+    """
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(html)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": elapsed, "peak_kb": peak / 1024}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", default="", help="Diretório com arquivos .html")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-chars", type=int, default=CONTENT_CHAR_BUDGET)
+    args = parser.parse_args()
+
+    methods = {
+        "bs4 completo": _bs4_full,
+        "streaming html.parser": lambda html: extract_text(html, args.max_chars, "html.parser"),
+    }
+    try:
+        import lxml  # noqa: F401
+
+        methods["streaming lxml"] = lambda html: extract_text(html, args.max_chars, "lxml")
+    except ImportError:
+        pass
+
+    print(f"{'documento':<22} {'método':<24} {'tempo (ms)':>12} {'pico (KB)':>12}")
+    for name, html in load_corpus(args.corpus):
+        for method, func in methods.items():
+            result = _measure(func, html, args.repeat)
+            print(f"{name:<22} {method:<24} {result['ms']:12.2f} {result['peak_kb']:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Microbenchmark do custo de preparação do grafo por requisição.
+
+Compara o caminho antigo (build_graph() a cada chamada de process_url)
+com o registro de grafos compilados (get_graph()).
+
+Uso:
+    python -m benchmarks.bench_graph [--repeat 200]
+"""
+
+import argparse
+import time
+
+from backend import build_graph, get_graph
+
+
+def _measure(func, repeat: int) -> float:
+    """
+    Mede o tempo médio de uma chamada, em microssegundos.
+    
+    Args:
+        func: Função sem argumentos a ser medida
+        repeat: Número de repetições
+        
+    Returns:
+        float: Tempo médio por chamada em microssegundos
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    
+    # Aquece o registro para medir apenas o caminho quente
+    get_graph()
+    
+    before = _measure(build_graph, args.repeat)
+    after = _measure(get_graph, args.repeat)
+    
+    print(f"build_graph() por requisição: {before:10.1f} µs")
+    print(f"get_graph() por requisição:   {after:10.1f} µs")
+    print(f"Redução: {before / after:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
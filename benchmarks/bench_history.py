@@ -0,0 +1,115 @@
+"""
+Benchmark do histórico de avaliações: busca e paginação no SQLite.
+
+Grava N avaliações sintéticas em um SQLiteResultStore temporário e mede
+a latência p50/p95 de consultas típicas da interface (primeira página,
+busca por texto, filtros por nota e domínio, páginas adiante), com o
+índice FTS5 e com a busca por LIKE usada quando o SQLite não tem FTS5.
+O texto sintético sorteia palavras com frequência de Zipf em um
+vocabulário de alguns milhares de palavras, de modo que os termos de
+negócio buscados aparecem em uma fração pequena das avaliações, como em
+textos reais.
+
+Uso:
+    python -m benchmarks.bench_history [--entries 10000] [--repeat 20]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.bench_process import _percentile
+
+WORDS = (
+    "saas fintech logística varejo saúde educação marketplace pagamentos crédito "
+    "seguros agronegócio energia assinatura plataforma clientes receita"
+).split()
+
+# Vocabulário: palavras sintéticas e, espalhadas no meio, as de WORDS
+VOCABULARY_SIZE = 5000
+
+QUERIES: Dict[str, Dict[str, Any]] = {
+    "primeira página": {},
+    "texto": {"query": "fintech pagam"},
+    "texto + nota": {"query": "logística", "min_rating": 8, "order": "rating"},
+    "relevância": {"query": "saude assinatura", "order": "relevance"},
+    "domínio": {"domain": "site42.com"},
+    "página 20": {"offset": 20 * 20},
+}
+
+
+def _vocabulary(rng: random.Random) -> Tuple[List[str], List[float]]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(VOCABULARY_SIZE)]
+    for position, word in enumerate(WORDS):
+        words[50 + position * 20] = word
+    # Pesos acumulados: choices() não precisa recalculá-los a cada frase
+    return words, list(itertools.accumulate(1 / rank for rank in range(1, VOCABULARY_SIZE + 1)))
+
+
+def _evaluation(rng: random.Random, index: int, vocabulary: Tuple[List[str], List[float]]) -> Dict[str, Any]:
+    words, cum_weights = vocabulary
+
+    def sentence(size: int) -> str:
+        return " ".join(rng.choices(words, cum_weights=cum_weights, k=size))
+
+    return {
+        "descricao": f"Empresa {index}: {sentence(30)}",
+        "pensamentos": [sentence(20) for _ in range(3)],
+        "tendencias_mercado": sentence(20),
+        "avaliacao": rng.randint(1, 10),
+        "resposta_final": sentence(40),
+    }
+
+
+def _measure(store: Any, repeat: int) -> Dict[str, List[float]]:
+    samples: Dict[str, List[float]] = {}
+    for name, query in QUERIES.items():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            store.search(limit=20, **query)
+            samples.setdefault(name, []).append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=10_000, help="Avaliações no histórico")
+    parser.add_argument("--repeat", type=int, default=20, help="Repetições de cada consulta")
+    args = parser.parse_args()
+
+    from result_store import SQLiteResultStore
+
+    directory = tempfile.mkdtemp()
+    try:
+        store = SQLiteResultStore(os.path.join(directory, "results.sqlite"))
+        rng = random.Random(0)
+        vocabulary = _vocabulary(rng)
+        start = time.perf_counter()
+        for index in range(args.entries):
+            evaluation = _evaluation(rng, index, vocabulary)
+            store.save(f"https://site{index % 1000}.com/", f"h{index}", index, evaluation)
+        print(f"{args.entries} avaliações gravadas em {time.perf_counter() - start:.1f}s")
+
+        results = {"fts5": _measure(store, args.repeat)}
+        store._fts = False
+        results["like"] = _measure(store, args.repeat)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"{'consulta':<16} " + " ".join(f"{f'{name} p50/p95 ms':>22}" for name in results))
+    for query in QUERIES:
+        cells = []
+        for samples in results.values():
+            values = samples[query]
+            cells.append(f"{_percentile(values, 50) * 1000:10.2f} /{_percentile(values, 95) * 1000:9.2f}")
+        print(f"{query:<16} " + " ".join(f"{cell:>22}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
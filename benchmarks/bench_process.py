@@ -0,0 +1,329 @@
+"""
+Benchmark offline de ponta a ponta: process_url, lote, pipeline, streaming e reavaliação.
+
+Sobe um FixtureServer local com o corpus de páginas e troca o modelo por
+um FakeChatModel com latência configurável e respostas roteirizadas, de
+modo que nenhuma chamada sai da máquina. Cada caminho roda em um
+subprocesso próprio (para que o pico de RSS seja só dele) e informa
+latência p50/p95/p99, URLs por segundo e pico de RSS. O caminho
+"rescore" mede a segunda passada sobre as mesmas URLs, com o
+armazenamento de avaliações ligado (conteúdo sem mudanças) e o caminho
+"pipeline" mede o mesmo lote de "batch" em etapas (pipeline.Pipeline),
+com a concorrência de "batch" nos grafos. Os números são
+comparados com benchmarks/baseline.json; uma piora acima da tolerância
+faz o script terminar com código 1.
+
+Uso:
+    python -m benchmarks.bench_process [--urls 30] [--llm-latency 0.02]
+    python -m benchmarks.bench_process --corpus DIR --save-baseline
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.fixtures import FixtureServer, fixture_urls, load_corpus
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+PATHS = ("single", "batch", "pipeline", "stream", "rescore")
+
+# Métricas em que valores maiores são melhores; nas demais, menores
+HIGHER_IS_BETTER = {"urls_per_sec"}
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """
+    Percentil por interpolação linear.
+
+    Args:
+        values: Amostras
+        q: Percentil entre 0 e 100
+
+    Returns:
+        float: Valor do percentil (0.0 sem amostras)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss é informado em KB no Linux e em bytes no macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _setup_offline(args: argparse.Namespace) -> None:
+    """
+    Prepara o processo para rodar sem rede externa: caches desligados,
+    modelo falso e escalonador sem cotas.
+
+    Args:
+        args: Argumentos da linha de comando
+    """
+    os.environ.setdefault("GROQ_API_KEY", "benchmark-offline")
+    os.environ["WEBSCRAP_LLM_CACHE"] = "off"
+    os.environ["WEBSCRAP_CONTENT_CACHE"] = "off"
+    os.environ["WEBSCRAP_RESULT_STORE"] = "off"
+
+    import nodes
+    from benchmarks.fake_llm import FakeChatModel, decision_script
+    from scheduler import LLMScheduler, set_scheduler
+
+    nodes.set_llm(FakeChatModel(
+        latency=args.llm_latency,
+        latency_jitter=args.llm_jitter,
+        script=decision_script([False] * args.rounds + [True]),
+    ))
+    set_scheduler(LLMScheduler(
+        requests_per_minute=1e9, tokens_per_minute=1e12, max_concurrency=args.concurrency * 4
+    ))
+
+
+def _run_single(urls: List[str], args: argparse.Namespace) -> Dict[str, List[float]]:
+    from backend import process_url
+
+    latencies = []
+    for url in urls:
+        start = time.perf_counter()
+        process_url(url, mode=args.mode)
+        latencies.append(time.perf_counter() - start)
+    return {"latency": latencies}
+
+
+def _run_batch(urls: List[str], args: argparse.Namespace) -> Dict[str, List[float]]:
+    from backend import process_many
+
+    results = process_many(urls, max_concurrency=args.concurrency, mode=args.mode)
+    # Latência de cada avaliação dentro do lote, medida pela instrumentação
+    return {"latency": [result["trace"]["total_ms"] / 1000 for result in results if "trace" in result]}
+
+
+def _run_pipeline(urls: List[str], args: argparse.Namespace) -> Dict[str, List[float]]:
+    from pipeline import Pipeline
+
+    results = Pipeline(llm_concurrency=args.concurrency, mode=args.mode).run(urls)
+    # Latência de cada URL: etapas e esperas nas filas
+    return {"latency": [sum(result["trace"]["pipeline"].values()) / 1000 for result in results]}
+
+
+def _run_stream(urls: List[str], args: argparse.Namespace) -> Dict[str, List[float]]:
+    from backend import stream_url
+
+    latencies, first_token = [], []
+    for url in urls:
+        start = time.perf_counter()
+        first = None
+        for event in stream_url(url, mode=args.mode):
+            if first is None and event["type"] == "token":
+                first = time.perf_counter() - start
+        latencies.append(time.perf_counter() - start)
+        if first is not None:
+            first_token.append(first)
+    return {"latency": latencies, "first_token": first_token}
+
+
+def _prepare_rescore(urls: List[str], args: argparse.Namespace) -> None:
+    import atexit
+    import shutil
+    import tempfile
+
+    from backend import process_url
+    from result_store import SQLiteResultStore, set_result_store
+
+    # Primeira passada (não medida): guarda as avaliações
+    directory = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, directory, True)
+    set_result_store(SQLiteResultStore(os.path.join(directory, "results.sqlite")))
+    for url in urls:
+        process_url(url, mode=args.mode)
+
+
+RUNNERS: Dict[str, Callable[[List[str], argparse.Namespace], Dict[str, List[float]]]] = {
+    "single": _run_single,
+    "batch": _run_batch,
+    "pipeline": _run_pipeline,
+    "stream": _run_stream,
+    "rescore": _run_single,
+}
+
+# Preparação (não medida) de cada caminho, antes do aquecimento
+PREPARE: Dict[str, Callable[[List[str], argparse.Namespace], None]] = {
+    "rescore": _prepare_rescore,
+}
+
+
+def _child(args: argparse.Namespace) -> None:
+    """
+    Executa um caminho no processo corrente e imprime o resultado em JSON.
+
+    Args:
+        args: Argumentos da linha de comando (com --only, --base-url e --pages)
+    """
+    _setup_offline(args)
+    from backend import get_graph
+
+    start = time.perf_counter()
+    get_graph(args.mode)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    urls = fixture_urls(args.base_url, args.pages.split(","), args.urls)
+    if args.only in PREPARE:
+        PREPARE[args.only](urls, args)
+    # Aquecimento: conexões, imports tardios e caminhos de código frios
+    RUNNERS[args.only](urls[:1], args)
+
+    start = time.perf_counter()
+    samples = RUNNERS[args.only](urls, args)
+    elapsed = time.perf_counter() - start
+
+    latency = samples["latency"]
+    report = {
+        "p50_ms": _percentile(latency, 50) * 1000,
+        "p95_ms": _percentile(latency, 95) * 1000,
+        "p99_ms": _percentile(latency, 99) * 1000,
+        "urls_per_sec": len(urls) / elapsed,
+        "peak_rss_mb": _peak_rss_mb(),
+        "graph_compile_ms": compile_ms,
+    }
+    if samples.get("first_token"):
+        report["first_token_p50_ms"] = _percentile(samples["first_token"], 50) * 1000
+    print(json.dumps(report))
+
+
+def _run_path(path: str, base_url: str, pages: List[str], args: argparse.Namespace) -> Dict[str, float]:
+    """
+    Executa um caminho em um subprocesso.
+
+    Args:
+        path: Um dos caminhos de PATHS
+        base_url: Endereço do FixtureServer
+        pages: Nomes das páginas do corpus
+        args: Argumentos da linha de comando
+
+    Returns:
+        Dict[str, float]: Métricas do caminho
+    """
+    command = [
+        sys.executable, "-m", "benchmarks.bench_process",
+        "--only", path,
+        "--base-url", base_url,
+        "--pages", ",".join(pages),
+        "--urls", str(args.urls),
+        "--concurrency", str(args.concurrency),
+        "--llm-latency", str(args.llm_latency),
+        "--llm-jitter", str(args.llm_jitter),
+        "--rounds", str(args.rounds),
+        "--mode", args.mode,
+    ]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float
+) -> List[str]:
+    """
+    Compara os resultados com a linha de base.
+
+    Args:
+        results: Métricas por caminho
+        baseline: Métricas gravadas por caminho
+        tolerance: Piora relativa aceita (0.25 = 25%)
+
+    Returns:
+        List[str]: Descrição das regressões encontradas
+    """
+    regressions = []
+    for path, metrics in results.items():
+        for name, value in metrics.items():
+            reference = baseline.get(path, {}).get(name)
+            if not reference:
+                continue
+            change = (value - reference) / reference
+            worse = -change if name in HIGHER_IS_BETTER else change
+            if name != "graph_compile_ms" and worse > tolerance:
+                regressions.append(f"{path}.{name}: {reference:.1f} -> {value:.1f} ({change:+.0%})")
+    return regressions
+
+
+def _print_table(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]]) -> None:
+    columns = ("p50_ms", "p95_ms", "p99_ms", "urls_per_sec", "peak_rss_mb")
+    print(f"{'caminho':<8} " + " ".join(f"{column:>14}" for column in columns))
+    for path, metrics in results.items():
+        print(f"{path:<8} " + " ".join(f"{metrics[column]:14.1f}" for column in columns))
+        if baseline and path in baseline:
+            deltas = []
+            for column in columns:
+                reference = baseline[path].get(column)
+                deltas.append(f"{(metrics[column] - reference) / reference:+14.0%}" if reference else " " * 14)
+            print(f"{'  vs base':<8} " + " ".join(deltas))
+        if "first_token_p50_ms" in metrics:
+            print(f"{'':<8} primeiro token p50: {metrics['first_token_p50_ms']:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", default="", help="Diretório com páginas .html gravadas")
+    parser.add_argument("--urls", type=int, default=30, help="URLs por caminho")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concorrência do lote")
+    parser.add_argument("--llm-latency", type=float, default=0.02, help="Latência do modelo falso (s)")
+    parser.add_argument("--llm-jitter", type=float, default=0.01, help="Variação da latência (s)")
+    parser.add_argument("--server-latency", type=float, default=0.0, help="Atraso do servidor local (s)")
+    parser.add_argument("--rounds", type=int, default=2, help="Decisões False antes do True")
+    parser.add_argument("--mode", default="default", help="Configuração do grafo")
+    parser.add_argument("--paths", default=",".join(PATHS), help="Caminhos a medir")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Grava os resultados como linha de base")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Piora relativa aceita")
+    # Uso interno: execução de um caminho no subprocesso
+    parser.add_argument("--only", choices=PATHS, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--pages", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.only:
+        _child(args)
+        return
+
+    corpus = load_corpus(args.corpus)
+    results = {}
+    with FixtureServer(corpus, latency=args.server_latency) as server:
+        pages = list(server.pages)
+        for path in args.paths.split(","):
+            results[path] = _run_path(path, server.base_url, pages, args)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print_table(results, baseline)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            rounded = {path: {k: round(v, 2) for k, v in metrics.items()} for path, metrics in results.items()}
+            json.dump(rounded, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"linha de base gravada em {args.baseline}")
+        return
+
+    if baseline:
+        regressions = _compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSÃO {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
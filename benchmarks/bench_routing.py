@@ -0,0 +1,116 @@
+"""
+Benchmark do roteamento de modelos: um modelo para tudo contra nós leves
+no modelo rápido.
+
+Dois FakeChatModel fazem o papel dos modelos: o principal, mais lento,
+e o rápido. O cenário "único" manda todos os nós para o principal; o
+"roteado" usa as rotas padrão (models.default_routes) e o "com falhas"
+faz o modelo rápido falhar a cada N chamadas, para medir as chamadas
+desviadas para a reserva. Informa latência p50/p95 por URL, chamadas e
+tempo por modelo e confere que a nota final não muda.
+
+Uso:
+    python -m benchmarks.bench_routing [--urls 10] [--large-latency 0.3] [--fast-latency 0.05]
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Dict, List
+
+from benchmarks.bench_process import _percentile
+from benchmarks.fixtures import FixtureServer, fixture_urls, load_corpus
+
+LARGE, FAST = "principal", "rapido"
+
+
+def _setup_offline() -> None:
+    os.environ["WEBSCRAP_LLM_CACHE"] = "off"
+    os.environ["WEBSCRAP_CONTENT_CACHE"] = "off"
+    os.environ["WEBSCRAP_RESULT_STORE"] = "off"
+
+    from scheduler import LLMScheduler, set_scheduler
+
+    # Sem novas tentativas no escalonador: a falha vai direto para a reserva
+    set_scheduler(LLMScheduler(requests_per_minute=1e9, tokens_per_minute=1e12, max_concurrency=32, max_retries=0))
+
+
+def _run(urls: List[str], router: Any) -> Dict[str, Any]:
+    """
+    Avalia as URLs com um roteamento.
+
+    Args:
+        urls: URLs a avaliar
+        router: Roteamento de modelos
+
+    Returns:
+        Dict[str, Any]: Latências, notas e chamadas/tempo por modelo
+    """
+    from backend import process_url
+    from models import set_router
+
+    set_router(router)
+    latencies, ratings = [], []
+    by_model: Dict[str, Dict[str, float]] = {}
+    for url in urls:
+        start = time.perf_counter()
+        result = process_url(url)
+        latencies.append(time.perf_counter() - start)
+        ratings.append(result["rating"])
+        for model, entry in result["trace"]["models"].items():
+            totals = by_model.setdefault(model, {"calls": 0, "ms": 0.0, "fallbacks": 0, "errors": 0})
+            for key in totals:
+                totals[key] += entry.get(key, 0)
+    return {"latency": latencies, "ratings": ratings, "models": by_model}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--urls", type=int, default=10, help="URLs por cenário")
+    parser.add_argument("--large-latency", type=float, default=0.3, help="Latência do modelo principal (s)")
+    parser.add_argument("--fast-latency", type=float, default=0.05, help="Latência do modelo rápido (s)")
+    parser.add_argument("--fail-every", type=int, default=4, help="Falha do modelo rápido a cada N chamadas")
+    parser.add_argument("--rounds", type=int, default=2, help="Decisões False antes do True")
+    args = parser.parse_args()
+
+    _setup_offline()
+    from benchmarks.fake_llm import FakeChatModel, decision_script
+    from models import DEFAULT_ROUTE, FAST_NODES, ModelRouter
+
+    script = decision_script([False] * args.rounds + [True])
+    routes = {node: [FAST, LARGE] for node in FAST_NODES}
+    routes[DEFAULT_ROUTE] = [LARGE]
+
+    def models(fail_every: int = 0) -> Dict[str, Any]:
+        return {
+            LARGE: FakeChatModel(latency=args.large_latency, script=script),
+            FAST: FakeChatModel(latency=args.fast_latency, script=script, fail_every=fail_every),
+        }
+
+    scenarios = {
+        "único": lambda: ModelRouter({DEFAULT_ROUTE: [LARGE]}, models=models()),
+        "roteado": lambda: ModelRouter(routes, models=models()),
+        "com falhas": lambda: ModelRouter(routes, models=models(args.fail_every)),
+    }
+
+    with FixtureServer(load_corpus()) as server:
+        urls = fixture_urls(server.base_url, list(server.pages), args.urls)
+        results = {name: _run(urls, make_router()) for name, make_router in scenarios.items()}
+
+    print(f"{'cenário':<12} {'p50_ms':>10} {'p95_ms':>10} {'notas':>8}  chamadas por modelo")
+    for name, result in results.items():
+        models_text = "  ".join(
+            f"{model}: {entry['calls']:.0f} ({entry['ms'] / max(entry['calls'], 1):.0f} ms"
+            + (f", {entry['fallbacks']:.0f} reservas" if entry["fallbacks"] else "")
+            + (f", {entry['errors']:.0f} erros" if entry["errors"] else "")
+            + ")"
+            for model, entry in sorted(result["models"].items())
+        )
+        print(
+            f"{name:<12} {_percentile(result['latency'], 50) * 1000:10.1f} "
+            f"{_percentile(result['latency'], 95) * 1000:10.1f} {sorted(set(result['ratings']))!s:>8}  {models_text}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark do escalonador de chamadas contra um provedor falso com cota.
+
+Dispara muitas chamadas concorrentes, de várias "URLs", contra o
+FakeChatModel configurado com uma cota de requisições por janela. Compara
+as chamadas diretas (sem escalonador) com as chamadas passando pelo
+LLMScheduler configurado com a mesma cota.
+
+Uso:
+    python -m benchmarks.bench_scheduler [--calls 200] [--threads 32]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+from benchmarks.fake_llm import FakeChatModel
+from scheduler import LLMScheduler, status_code_of
+
+
+def _run(call: Callable[[int], None], calls: int, threads: int) -> Dict[str, float]:
+    """
+    Executa as chamadas em um pool de threads.
+
+    Args:
+        call: Função que recebe o índice da chamada
+        calls: Número total de chamadas
+        threads: Número de threads concorrentes
+
+    Returns:
+        Dict[str, float]: Sucessos, falhas e duração
+    """
+    outcome = {"ok": 0, "failed": 0}
+
+    def task(i: int) -> None:
+        try:
+            call(i)
+            outcome["ok"] += 1
+        except Exception as exc:
+            if status_code_of(exc) is None:
+                raise
+            outcome["failed"] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(task, range(calls)))
+    outcome["seconds"] = time.perf_counter() - start
+    return outcome
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--urls", type=int, default=10)
+    parser.add_argument("--rate-limit", type=int, default=40, help="Requisições por janela")
+    parser.add_argument("--window", type=float, default=2.0, help="Janela da cota em segundos")
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    per_minute = args.rate_limit * 60 / args.window
+
+    # Sem escalonador: cada 429 vira uma falha da avaliação
+    model = FakeChatModel(latency=args.latency, rate_limit=args.rate_limit, rate_window=args.window)
+    direct = _run(lambda i: model.invoke(f"prompt {i}"), args.calls, args.threads)
+    print(
+        f"direto:        {direct['ok']:4d} ok, {direct['failed']:4d} falhas, "
+        f"{model.rejected:4d} respostas 429, {direct['seconds']:.2f}s"
+    )
+
+    # Com escalonador: orçamento igual à cota, rodízio entre URLs e backoff
+    time.sleep(args.window)
+    model = FakeChatModel(latency=args.latency, rate_limit=args.rate_limit, rate_window=args.window)
+    scheduler = LLMScheduler(
+        requests_per_minute=per_minute,
+        tokens_per_minute=1e9,
+        max_concurrency=args.threads,
+        base_delay=0.1,
+        burst_seconds=args.window,
+    )
+    scheduled = _run(
+        lambda i: scheduler.run(lambda: model.invoke(f"prompt {i}"), key=f"url-{i % args.urls}"),
+        args.calls,
+        args.threads,
+    )
+    stats = scheduler.stats()
+    print(
+        f"escalonado:    {scheduled['ok']:4d} ok, {scheduled['failed']:4d} falhas, "
+        f"{model.rejected:4d} respostas 429, {scheduled['seconds']:.2f}s"
+    )
+    print(
+        f"  espera média {stats['wait_seconds_avg'] * 1000:.0f} ms, "
+        f"máxima {stats['wait_seconds_max'] * 1000:.0f} ms, "
+        f"novas tentativas {stats['retries']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
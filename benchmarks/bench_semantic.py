@@ -0,0 +1,224 @@
+"""
+Benchmark do cache semântico: acertos entre sites feitos sobre um mesmo
+modelo e chamadas ao modelo economizadas.
+
+Gera famílias de sites sintéticos: cada família é um negócio (franquia
+ou SaaS white-label) com várias unidades que mudam só cidade, telefone,
+endereço e uma frase local; famílias do mesmo setor compartilham parte
+do vocabulário, para medir acertos falsos. Primeiro mede o índice
+isolado (semantic_cache.SemanticCache) com vários limiares: acertos
+dentro da família, acertos em outra família e tempo de consulta. Depois
+avalia as URLs em sequência com o FakeChatModel, com e sem o cache
+semântico, e compara as chamadas ao modelo por URL.
+
+Uso:
+    python -m benchmarks.bench_semantic [--families 16] [--variants 5]
+"""
+
+import argparse
+import os
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.bench_process import _percentile
+from benchmarks.fixtures import FixtureServer
+
+SECTORS = {
+    "pizzaria": (
+        "massa de fermentação natural", "forno a lenha", "entrega em 30 minutos", "rodízio às terças",
+        "ingredientes importados da Itália", "opções veganas", "bordas recheadas", "cardápio infantil",
+        "vinhos selecionados", "programa de fidelidade", "espaço para eventos", "sobremesas artesanais",
+    ),
+    "academia": (
+        "musculação com equipamentos novos", "aulas de spinning", "avaliação física gratuita",
+        "personal trainer", "funcionamento 24 horas", "piscina aquecida", "aulas de yoga",
+        "aplicativo de treinos", "estacionamento próprio", "planos sem fidelidade", "crossfit", "nutricionista",
+    ),
+    "contabilidade": (
+        "abertura de empresas", "folha de pagamento", "emissão de notas fiscais", "conciliação bancária",
+        "imposto de renda", "relatórios mensais", "planejamento tributário", "certificado digital",
+        "atendimento por chat", "integração com bancos", "gestão de MEI", "consultoria financeira",
+    ),
+    "escola de idiomas": (
+        "aulas de inglês", "turmas reduzidas", "professores nativos", "intercâmbio", "aulas online ao vivo",
+        "preparatório para exames", "espanhol para negócios", "material didático próprio",
+        "conversação", "cursos para crianças", "certificado internacional", "plataforma de exercícios",
+    ),
+    "clínica odontológica": (
+        "implantes dentários", "clareamento", "ortodontia invisível", "atendimento de urgência",
+        "planos odontológicos", "odontopediatria", "limpeza e prevenção", "próteses",
+        "raio-x digital", "parcelamento sem juros", "tratamento de canal", "lentes de contato dental",
+    ),
+    "software de gestão": (
+        "controle de estoque", "frente de caixa", "emissão de boletos", "relatórios de vendas",
+        "aplicativo para vendedores", "integração com marketplaces", "gestão de clientes",
+        "ordens de serviço", "suporte 24 horas", "backup na nuvem", "multiempresa", "API aberta",
+    ),
+    "lavanderia": (
+        "lavagem a seco", "coleta e entrega", "passadoria", "lavagem de tapetes", "produtos hipoalergênicos",
+        "assinatura mensal", "autoatendimento", "lavagem de tênis", "higienização de edredons",
+        "pagamento por aplicativo", "pronto em 24 horas", "lavagem de uniformes",
+    ),
+    "pet shop": (
+        "banho e tosa", "consultas veterinárias", "ração premium", "hotel para cães", "vacinação",
+        "adestramento", "acessórios importados", "taxi dog", "creche canina", "farmácia veterinária",
+        "petiscos naturais", "plano de saúde pet",
+    ),
+}
+
+CITIES = (
+    "São Paulo", "Rio de Janeiro", "Belo Horizonte", "Curitiba", "Porto Alegre", "Salvador", "Recife",
+    "Fortaleza", "Goiânia", "Campinas", "Florianópolis", "Manaus", "Belém", "Vitória", "Natal",
+)
+
+BRAND_WORDS = ("Nova", "Prime", "Vila", "Mais", "Bem", "Top", "Boa", "Real", "Max", "Viva", "Fácil", "Forte")
+
+
+def templated_corpus(families: int, variants: int, seed: int = 0) -> List[Tuple[str, str, str]]:
+    """
+    Sites sintéticos em famílias de unidades quase iguais.
+
+    Args:
+        families: Número de negócios (distribuídos entre os setores)
+        variants: Unidades de cada negócio
+        seed: Semente do sorteio
+
+    Returns:
+        List[Tuple[str, str, str]]: Trios (nome da página, família, HTML)
+    """
+    rng = random.Random(seed)
+    sectors = list(SECTORS)
+    corpus = []
+    for family in range(families):
+        sector = sectors[family % len(sectors)]
+        brand = f"{rng.choice(BRAND_WORDS)} {sector.title()} {rng.choice(BRAND_WORDS)}"
+        features = rng.sample(SECTORS[sector], 7)
+        body = (
+            f"<h1>{brand}</h1><p>A {brand} é referência em {sector}, com {features[0]} e {features[1]}.</p>"
+            f"<h2>Serviços</h2><ul>" + "".join(f"<li>{feature.capitalize()}</li>" for feature in features[2:])
+            + f"</ul><p>Desde {rng.randint(1990, 2020)}, a {brand} atende clientes que buscam {features[2]} "
+            f"e {features[3]}, com equipe própria e atendimento personalizado.</p>"
+        )
+        for variant in range(variants):
+            city = CITIES[(family + variant) % len(CITIES)]
+            local = (
+                f"<h2>Unidade {city}</h2><p>Rua {rng.choice(BRAND_WORDS)} {rng.randint(10, 2000)}, {city}. "
+                f"Telefone ({rng.randint(11, 99)}) {rng.randint(3000, 9999)}-{rng.randint(1000, 9999)}. "
+                f"Gerente: {rng.choice(('Ana', 'Bruno', 'Carla', 'Diego', 'Elisa'))}.</p>"
+            )
+            html = f"<html><head><title>{brand} {city}</title></head><body>{body}{local}</body></html>"
+            corpus.append((f"f{family}-u{variant}", f"f{family}", html))
+    return corpus
+
+
+def measure_index(corpus: List[Tuple[str, str, str]], thresholds: List[float]) -> Dict[float, Dict[str, float]]:
+    """
+    Acertos do índice por limiar: a primeira unidade de cada família é
+    guardada e as demais são consultadas.
+
+    Args:
+        corpus: Sites em famílias (templated_corpus)
+        thresholds: Limiares de similaridade
+
+    Returns:
+        Dict[float, Dict[str, float]]: Por limiar: taxa de acertos na
+            família certa, acertos em outra família e consulta p50/p95 (ms)
+    """
+    from extractor import parse_html
+    from semantic_cache import SemanticCache
+
+    texts = [(family, parse_html(html).text) for _, family, html in corpus]
+    results = {}
+    for threshold in thresholds:
+        cache = SemanticCache(threshold=threshold)
+        seen, right, wrong, lookups, latency = set(), 0, 0, 0, []
+        for family, text in texts:
+            if family not in seen:
+                cache.add("descriptor", text, family)
+                seen.add(family)
+                continue
+            start = time.perf_counter()
+            found = cache.lookup("descriptor", text)
+            latency.append(time.perf_counter() - start)
+            lookups += 1
+            right += found == family
+            wrong += found is not None and found != family
+        results[threshold] = {
+            "hit_rate": right / lookups,
+            "false_hits": wrong / lookups,
+            "p50_ms": _percentile(latency, 50) * 1000,
+            "p95_ms": _percentile(latency, 95) * 1000,
+        }
+    return results
+
+
+def run_urls(urls: List[str], cache: Any) -> Dict[str, Any]:
+    """
+    Avalia as URLs em sequência com ou sem o cache semântico.
+
+    Args:
+        urls: URLs a avaliar
+        cache: Cache semântico (None: desligado)
+
+    Returns:
+        Dict[str, Any]: Chamadas ao modelo, tempo e estatísticas do cache
+    """
+    from backend import process_url
+    from benchmarks.fake_llm import FakeChatModel, decision_script
+    from nodes import set_llm
+    from semantic_cache import set_semantic_cache
+
+    model = FakeChatModel(script=decision_script([False, True]))
+    set_llm(model)
+    set_semantic_cache(cache)
+    start = time.perf_counter()
+    for url in urls:
+        result = process_url(url)
+        if result.get("error"):
+            raise RuntimeError(f"{url}: {result['error']}")
+    return {
+        "calls": model.calls,
+        "seconds": time.perf_counter() - start,
+        "stats": cache.stats() if cache is not None else {},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--families", type=int, default=16, help="Negócios (famílias de sites)")
+    parser.add_argument("--variants", type=int, default=5, help="Unidades por negócio")
+    parser.add_argument("--thresholds", default="0.8,0.85,0.9,0.95", help="Limiares medidos no índice")
+    args = parser.parse_args()
+
+    os.environ["WEBSCRAP_LLM_CACHE"] = "off"
+    os.environ["WEBSCRAP_CONTENT_CACHE"] = "off"
+    os.environ["WEBSCRAP_RESULT_STORE"] = "off"
+    from scheduler import LLMScheduler, set_scheduler
+    from semantic_cache import SemanticCache
+
+    set_scheduler(LLMScheduler(requests_per_minute=1e9, tokens_per_minute=1e12, max_concurrency=32))
+    corpus = templated_corpus(args.families, args.variants)
+
+    print(f"{'limiar':>6} {'acertos':>8} {'falsos':>8} {'p50_ms':>8} {'p95_ms':>8}")
+    for threshold, stats in measure_index(corpus, [float(value) for value in args.thresholds.split(",")]).items():
+        print(
+            f"{threshold:6.2f} {stats['hit_rate']:8.0%} {stats['false_hits']:8.0%} "
+            f"{stats['p50_ms']:8.2f} {stats['p95_ms']:8.2f}"
+        )
+
+    with FixtureServer([(name, html) for name, _, html in corpus]) as server:
+        urls = [f"{server.base_url}/{name}" for name, _, _ in corpus]
+        results = {"sem cache": run_urls(urls, None), "semântico": run_urls(urls, SemanticCache())}
+
+    print(f"\n{'cenário':<10} {'chamadas/URL':>13} {'tempo_s':>8} {'acertos':>8} {'entradas':>9} {'memória_KB':>11}")
+    for name, result in results.items():
+        stats = result["stats"]
+        print(
+            f"{name:<10} {result['calls'] / len(urls):13.2f} {result['seconds']:8.2f} "
+            f"{stats.get('hit_rate', 0):8.0%} {stats.get('entries', 0):9d} {stats.get('bytes', 0) / 1024:11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark do tempo de partida: importação dos módulos e primeiro grafo.
+
+Cada medição roda em um interpretador novo (como um worker ou a linha de
+comando recém-iniciados). A importação é medida com `python -X importtime`,
+que informa o tempo acumulado de cada módulo; o relatório mostra o tempo
+total de cada ponto de entrada e os módulos mais caros que ele carrega. O
+tempo até o primeiro grafo soma a importação do backend e a compilação do
+grafo, que carrega o LangGraph e o modelo.
+
+Uso:
+    python -m benchmarks.bench_startup [--modules backend,jobs,cli] [--top 8]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ("backend", "nodes", "jobs", "cli")
+
+# Código executado no subprocesso para medir o primeiro grafo
+FIRST_GRAPH = (
+    "import time; start = time.perf_counter(); "
+    "from backend import get_graph; get_graph(); "
+    "print((time.perf_counter() - start) * 1000)"
+)
+
+
+def _run(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    # Sem chave de API: a importação não deve depender dela
+    env = {key: value for key, value in os.environ.items() if key != "GROQ_API_KEY"}
+    return subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def import_profile(module: str) -> Tuple[float, float, List[Tuple[str, float]]]:
+    """
+    Importa um módulo em um interpretador novo.
+
+    Args:
+        module: Nome do módulo
+
+    Returns:
+        Tuple: Tempo de importação do módulo (ms), tempo de parede do
+            processo (ms) e tempo acumulado (ms) de cada módulo carregado
+    """
+    start = time.perf_counter()
+    stderr = _run(f"import {module}", importtime=True).stderr
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    # Os submódulos aparecem antes do módulo que os importou, com mais
+    # recuo; os de nível superior (um espaço) delimitam cada importação,
+    # o que separa o que o módulo carrega da partida do interpretador
+    children: List[Tuple[str, float]] = []
+    total_ms = 0.0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative_us, name = line.split("|")
+        if not cumulative_us.strip().isdigit():
+            continue
+        ms = int(cumulative_us) / 1000
+        if name.startswith("  "):
+            children.append((name.strip(), ms))
+        elif name.strip() == module:
+            total_ms = ms
+            break
+        else:
+            children = []
+    return total_ms, wall_ms, sorted(children, key=lambda item: item[1], reverse=True)
+
+
+def first_graph_ms() -> float:
+    """
+    Tempo até o primeiro grafo compilado em um interpretador novo.
+
+    Returns:
+        float: Milissegundos desde o início da importação do backend
+    """
+    return float(_run(FIRST_GRAPH).stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", default=",".join(MODULES), help="Módulos a importar")
+    parser.add_argument("--top", type=int, default=8, help="Módulos mais caros a listar")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições (vale a menor)")
+    args = parser.parse_args()
+
+    for module in args.modules.split(","):
+        runs = [import_profile(module) for _ in range(args.repeat)]
+        total_ms, wall_ms, modules = min(runs, key=lambda run: run[0])
+        print(f"{module}: importação {total_ms:.1f} ms, processo {wall_ms:.1f} ms")
+        for name, ms in modules[:args.top]:
+            print(f"    {ms:8.1f} ms  {name}")
+
+    graph_ms = min(first_graph_ms() for _ in range(args.repeat))
+    print(f"primeiro grafo (importação + compilação): {graph_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
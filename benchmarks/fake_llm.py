@@ -0,0 +1,256 @@
+"""
+Modelo de chat falso para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém um modelo de chat local e determinístico, compatível
+com a interface do LangChain, para exercitar o grafo, o escalonador e os
+benchmarks sem acesso ao provedor. Ele pode simular latência e a cota do
+provedor, respondendo com erros 429 quando o limite de requisições por
+minuto é excedido, e aceita respostas roteirizadas por trecho do prompt.
+As respostas dos nós com saída estruturada são objetos JSON; os prompts
+em lote (batching.py) recebem uma resposta por item, cada uma como se o
+item tivesse vindo sozinho.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from prompt_context import BATCH_ITEM_HEADER, BATCH_TASK_HEADER
+
+
+class FakeProviderError(Exception):
+    """
+    Erro HTTP simulado do provedor (429 ou 5xx).
+    """
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(f"Erro simulado do provedor (status {status_code})")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+# Trechos dos prompts que identificam os nós com saída estruturada
+DECISION_PATTERN = '{"suficiente": true ou false}'
+REFLECTION_PATTERN = '"insight": "..."'
+FINAL_PATTERN = '"avaliacao"'
+# Prompts em lote e o campo pedido em cada item
+BATCH_PATTERN = '{"itens": ['
+_BATCH_FIELD = re.compile(r'"id": número do item, "(\w+)"')
+_BATCH_ITEM = re.compile(rf"^{re.escape(BATCH_ITEM_HEADER)} (\d+)$", re.MULTILINE)
+
+
+def default_responder(prompt: str) -> str:
+    """
+    Resposta determinística para os prompts dos nós do grafo.
+
+    Args:
+        prompt: Texto completo do prompt
+
+    Returns:
+        str: Resposta no formato esperado por cada nó
+    """
+    if DECISION_PATTERN in prompt:
+        return '{"suficiente": false}'
+    if REFLECTION_PATTERN in prompt:
+        return '{"suficiente": false, "insight": "O modelo de receita recorrente precisa ser validado."}'
+    if FINAL_PATTERN in prompt:
+        return '{"resumo": "Negócio com proposta clara e mercado em crescimento.", "avaliacao": 7}'
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+    return f"Resposta simulada {digest} para o trecho analisado."
+
+
+def decision_script(
+    decisions: Sequence[bool], rating: int = 7, summary: str = "Negócio com proposta clara."
+) -> List[Tuple[str, Union[str, List[str]]]]:
+    """
+    Roteiro para o FakeChatModel com as decisões de step_decision e a nota
+    de step_finalize.
+
+    Args:
+        decisions: Respostas sucessivas de step_decision ("suficiente"),
+            repetidas em ciclo
+        rating: Nota devolvida por step_finalize
+        summary: Texto do resumo final
+
+    Returns:
+        List[Tuple[str, Union[str, List[str]]]]: Valor para o campo script
+    """
+    return [
+        (DECISION_PATTERN, [json.dumps({"suficiente": bool(decision)}) for decision in decisions]),
+        (FINAL_PATTERN, json.dumps({"resumo": summary, "avaliacao": rating}, ensure_ascii=False)),
+    ]
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Modelo de chat falso com latência e cota configuráveis.
+
+    Attributes:
+        latency: Tempo de resposta simulado, em segundos
+        latency_jitter: Variação máxima somada à latência, derivada do hash
+            do prompt (determinística)
+        script: Pares (trecho do prompt, resposta ou lista de respostas);
+            o primeiro trecho contido no prompt define a resposta, e listas
+            são percorridas em ciclo a cada chamada
+        rate_limit: Cota simulada do provedor, em requisições por janela
+            (None = sem limite)
+        rate_window: Duração da janela da cota, em segundos
+        fail_every: Se > 0, a cada N chamadas uma falha com status 503
+    """
+
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    script: List[Tuple[str, Union[str, List[str]]]] = []
+    rate_limit: Optional[int] = None
+    rate_window: float = 60.0
+    fail_every: int = 0
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _window: Deque[float] = PrivateAttr(default_factory=deque)
+    _calls: int = PrivateAttr(default=0)
+    _rejected: int = PrivateAttr(default=0)
+    _script_calls: Dict[str, int] = PrivateAttr(default_factory=dict)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def rejected(self) -> int:
+        return self._rejected
+
+    def respond(self, prompt: str) -> str:
+        """
+        Gera a resposta para um prompt: a do roteiro, se algum trecho casar,
+        senão default_responder. Subclasses podem sobrescrever.
+
+        Args:
+            prompt: Texto completo do prompt
+
+        Returns:
+            str: Texto da resposta
+        """
+        if BATCH_PATTERN in prompt:
+            return self._respond_batch(prompt)
+        for pattern, replies in self.script:
+            if pattern in prompt:
+                if isinstance(replies, str):
+                    return replies
+                with self._lock:
+                    count = self._script_calls.get(pattern, 0)
+                    self._script_calls[pattern] = count + 1
+                return replies[count % len(replies)]
+        return default_responder(prompt)
+
+    def _respond_batch(self, prompt: str) -> str:
+        """
+        Resposta de um prompt em lote: cada item é respondido por respond(),
+        com o trecho do prompt individual do mesmo nó (as decisões seguem o
+        roteiro de decision_script item a item).
+
+        Args:
+            prompt: Texto completo do prompt em lote
+
+        Returns:
+            str: JSON no formato {"itens": [{"id": ..., campo: ...}]}
+        """
+        field = _BATCH_FIELD.search(prompt).group(1)
+        parts = _BATCH_ITEM.split(prompt.split(BATCH_TASK_HEADER, 1)[0])
+        items = []
+        for number, text in zip(parts[1::2], parts[2::2]):
+            if field == "suficiente":
+                try:
+                    value = json.loads(self.respond(f"{text.strip()}\n{DECISION_PATTERN}"))["suficiente"]
+                except (ValueError, KeyError):
+                    value = False
+            else:
+                value = self.respond(text.strip())
+            items.append({"id": int(number), field: value})
+        return json.dumps({"itens": items}, ensure_ascii=False)
+
+    def _delay(self, prompt: str) -> float:
+        if not self.latency_jitter:
+            return self.latency
+        fraction = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:4], 16) / 0xFFFF
+        return self.latency + self.latency_jitter * fraction
+
+    def _admit(self) -> None:
+        """
+        Aplica a cota simulada e as falhas periódicas do provedor.
+        """
+        with self._lock:
+            self._calls += 1
+            now = time.monotonic()
+            if self.fail_every and self._calls % self.fail_every == 0:
+                self._rejected += 1
+                raise FakeProviderError(503)
+            if self.rate_limit is not None:
+                while self._window and now - self._window[0] >= self.rate_window:
+                    self._window.popleft()
+                if len(self._window) >= self.rate_limit:
+                    self._rejected += 1
+                    retry_after = self.rate_window - (now - self._window[0])
+                    raise FakeProviderError(429, retry_after=retry_after)
+                self._window.append(now)
+
+    def _answer(self, messages: List[BaseMessage]) -> AIMessage:
+        self._admit()
+        prompt = "\n".join(str(message.content) for message in messages)
+        delay = self._delay(prompt)
+        if delay:
+            time.sleep(delay)
+        text = self.respond(prompt)
+        input_tokens = len(prompt) // 4
+        output_tokens = len(text) // 4
+        return AIMessage(
+            content=text,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+            response_metadata={"model_name": self._llm_type},
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=self._answer(messages))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        message = self._answer(messages)
+        words = message.content.split(" ")
+        for i, word in enumerate(words):
+            chunk = ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content=word if i == len(words) - 1 else word + " ",
+                    usage_metadata=message.usage_metadata if i == 0 else None,
+                    response_metadata=message.response_metadata if i == len(words) - 1 else {},
+                )
+            )
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
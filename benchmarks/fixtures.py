@@ -0,0 +1,168 @@
+"""
+Fixtures dos benchmarks: corpus de páginas HTML e servidor HTTP local.
+
+O corpus vem de um diretório com páginas gravadas (*.html) ou, sem
+diretório, de páginas sintéticas de tamanhos variados. O FixtureServer
+serve esse corpus em 127.0.0.1, para que downloads e extração sejam
+medidos sem depender de sites reais.
+"""
+
+import glob
+import http.server
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Tamanhos aproximados (em KB) das páginas do corpus sintético
+SYNTHETIC_SIZES_KB = (50, 500, 3000)
+
+
+def synthetic_page(size_kb: int, topic: str = "gestão financeira") -> str:
+    """
+    Gera uma landing page sintética com menu, scripts e muito conteúdo.
+
+    Args:
+        size_kb: Tamanho aproximado da página em KB
+        topic: Assunto do produto, para diferenciar as páginas
+
+    Returns:
+        str: Documento HTML
+    """
+    head = (
+        "<html><head><title>Startup</title><style>body{margin:0}</style>"
+        "<script>window.dataLayer=[];" + "var x=1;" * 2000 + "</script></head><body>"
+        "<nav><a href='/'>Home</a><a href='/about'>Sobre</a></nav>"
+    )
+    section = (
+        f"<section><h2>Produto</h2><p>Plataforma de {topic} para "
+        "pequenas empresas, com conciliação bancária automática &amp; relatórios.</p>"
+        "<ul><li>Integração com bancos</li><li>Emissão de notas</li></ul></section>"
+    )
+    repeat = max(1, size_kb * 1024 // len(section))
+    return head + section * repeat + "</body></html>"
+
+
+def load_corpus(directory: str = "", sizes_kb: Sequence[int] = SYNTHETIC_SIZES_KB) -> List[Tuple[str, str]]:
+    """
+    Carrega o corpus de páginas.
+
+    Args:
+        directory: Diretório com páginas gravadas (*.htm*); vazio para o
+            corpus sintético
+        sizes_kb: Tamanhos das páginas sintéticas
+
+    Returns:
+        List[Tuple[str, str]]: Pares (nome, documento HTML)
+    """
+    if not directory:
+        return [(f"sintetico-{kb}KB", synthetic_page(kb, f"produto {kb}")) for kb in sizes_kb]
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.htm*"))):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            corpus.append((os.path.basename(path), f.read()))
+    return corpus
+
+
+def fixture_urls(base_url: str, names: Sequence[str], count: int) -> List[str]:
+    """
+    Lista de URLs distintas percorrendo as páginas em rodízio.
+
+    Args:
+        base_url: Endereço do FixtureServer
+        names: Nomes das páginas do corpus
+        count: Número de URLs
+
+    Returns:
+        List[str]: URLs do servidor local
+    """
+    names = sorted(names)
+    return [f"{base_url}/{names[i % len(names)]}?i={i}" for i in range(count)]
+
+
+class FixtureServer:
+    """
+    Servidor HTTP local que serve o corpus em /<nome>. Parâmetros de query
+    são ignorados, de modo que /<nome>?i=1 e /<nome>?i=2 são URLs
+    distintas com o mesmo conteúdo.
+
+    Uso:
+        with FixtureServer(load_corpus()) as server:
+            server.urls(100)
+    """
+
+    def __init__(self, corpus: List[Tuple[str, str]], latency: float = 0.0):
+        """
+        Args:
+            corpus: Pares (nome, documento HTML)
+            latency: Atraso simulado antes de cada resposta, em segundos
+        """
+        self.pages: Dict[str, bytes] = {name: html.encode("utf-8") for name, html in corpus}
+        self.latency = latency
+        self._server: Optional[http.server.ThreadingHTTPServer] = None
+
+    def _handler(self):
+        pages = self.pages
+        latency = self.latency
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if latency:
+                    time.sleep(latency)
+                body = pages.get(self.path.lstrip("/").split("?", 1)[0])
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # O cliente interrompe a leitura ao atingir o orçamento
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def urls(self, count: int) -> List[str]:
+        """
+        Lista de URLs distintas percorrendo o corpus em rodízio.
+
+        Args:
+            count: Número de URLs
+
+        Returns:
+            List[str]: URLs do servidor local
+        """
+        return fixture_urls(self.base_url, list(self.pages), count)
+
+    def start(self) -> "FixtureServer":
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
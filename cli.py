@@ -0,0 +1,371 @@
+"""
+Linha de comando do AI Agent - Avaliação de Negócios
+
+Avalia muitas URLs sem a interface: lê as URLs de um CSV, de um JSONL ou
+da entrada padrão, roda os grafos com concorrência configurável e grava
+cada resultado assim que ele fica pronto (JSONL ou Parquet). Se o arquivo
+de saída já existe, as URLs avaliadas com sucesso são puladas, de modo
+que uma execução interrompida pode ser retomada com o mesmo comando.
+O progresso (vazão e tempo restante) vai para a saída de erro.
+
+Uso:
+    python -m cli urls.csv -o resultados.jsonl [--concurrency 16]
+    python -m cli urls.csv -o resultados.jsonl --pipeline
+    python -m cli urls.csv -o resultados.jsonl --batch-prompts
+    cat urls.txt | python -m cli - -o resultados.parquet
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TextIO
+
+from url_lists import read_url_stream
+
+# Colunas da saída Parquet (o trace, se pedido, vai como JSON)
+PARQUET_COLUMNS = (
+    "url", "descriptor", "thoughts", "market_trends", "rating",
+    "final_answer", "reused", "llm_cache_hits", "error", "trace",
+)
+
+
+def read_urls(path: str, input_format: Optional[str] = None) -> List[str]:
+    """
+    Lê as URLs de entrada, sem repetições e na ordem original.
+
+    Args:
+        path: Arquivo de entrada ou "-" para a entrada padrão
+        input_format: "csv", "jsonl" ou "lines" (padrão: pela extensão;
+            "lines" para a entrada padrão)
+
+    Returns:
+        List[str]: URLs normalizadas (com esquema)
+    """
+    if input_format is None:
+        extension = os.path.splitext(path)[1].lower()
+        input_format = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(extension, "lines")
+
+    if path == "-":
+        return read_url_stream(io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8"), input_format)
+    with open(path, encoding="utf-8", newline="") as stream:
+        return read_url_stream(stream, input_format)
+
+
+class ResultWriter:
+    """
+    Saída em JSONL: uma linha por resultado, gravada e descarregada assim
+    que a URL termina. Linhas incompletas (interrupção no meio de uma
+    escrita) são ignoradas na retomada.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Arquivo JSONL (criado ou estendido)
+        """
+        self.path = path
+
+    def _read_records(self, path: str) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def completed(self) -> Set[str]:
+        """
+        URLs já avaliadas com sucesso (resultados com erro são refeitos).
+
+        Returns:
+            Set[str]: URLs a pular
+        """
+        return {
+            record["url"] for record in self._read_records(self.path)
+            if "url" in record and not record.get("error")
+        }
+
+    def open(self) -> None:
+        # Completa uma última linha sem quebra antes de estender o arquivo
+        needs_newline = False
+        if os.path.exists(self.path) and os.path.getsize(self.path):
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        self._file = open(self.path, "a", encoding="utf-8")
+        if needs_newline:
+            self._file.write("\n")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetResultWriter(ResultWriter):
+    """
+    Saída em Parquet. Um arquivo Parquet só é legível depois de fechado,
+    por isso os resultados são gravados à medida que chegam em um arquivo
+    JSONL ao lado (<saída>.partial.jsonl) e reunidos no Parquet no fim da
+    execução. A retomada considera os dois arquivos.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Arquivo Parquet
+        """
+        super().__init__(path + ".partial.jsonl")
+        self.parquet_path = path
+
+    def _parquet_records(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.parquet_path):
+            return []
+        import pyarrow.parquet as pq
+
+        return pq.read_table(self.parquet_path).to_pylist()
+
+    def completed(self) -> Set[str]:
+        done = super().completed()
+        done.update(record["url"] for record in self._parquet_records() if not record.get("error"))
+        return done
+
+    def close(self) -> None:
+        super().close()
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        records = self._parquet_records() + list(self._read_records(self.path))
+        table = pa.Table.from_pylist(
+            [{column: _parquet_value(record.get(column)) for column in PARQUET_COLUMNS} for record in records],
+            schema=pa.schema([
+                ("url", pa.string()),
+                ("descriptor", pa.string()),
+                ("thoughts", pa.list_(pa.string())),
+                ("market_trends", pa.string()),
+                ("rating", pa.int64()),
+                ("final_answer", pa.string()),
+                ("reused", pa.bool_()),
+                ("llm_cache_hits", pa.int64()),
+                ("error", pa.string()),
+                ("trace", pa.string()),
+            ]),
+        )
+        # Grava em um arquivo temporário para não perder o Parquet anterior
+        temporary = self.parquet_path + ".tmp"
+        pq.write_table(table, temporary)
+        os.replace(temporary, self.parquet_path)
+        os.remove(self.path)
+
+
+def _parquet_value(value: Any) -> Any:
+    return json.dumps(value, ensure_ascii=False) if isinstance(value, dict) else value
+
+
+class Progress:
+    """
+    Linha de progresso na saída de erro: concluídas, vazão, tempo restante
+    estimado e erros.
+    """
+
+    def __init__(self, total: int, stream: TextIO = sys.stderr, interval: float = 0.5):
+        """
+        Args:
+            total: URLs a avaliar nesta execução
+            stream: Onde escrever
+            interval: Intervalo mínimo entre atualizações, em segundos
+        """
+        self.total = total
+        self.stream = stream
+        self.interval = interval
+        self.done = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self._last = 0.0
+        self._rendered = -1
+
+    def update(self, error: bool = False) -> None:
+        self.done += 1
+        self.errors += int(error)
+        now = time.monotonic()
+        if now - self._last >= self.interval or self.done == self.total:
+            self._last = now
+            self.render(now)
+
+    def render(self, now: Optional[float] = None) -> None:
+        elapsed = (now or time.monotonic()) - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = (self.total - self.done) / rate if rate > 0 else 0.0
+        eta = f"{int(remaining // 3600):d}:{int(remaining % 3600 // 60):02d}:{int(remaining % 60):02d}"
+        self._rendered = self.done
+        self.stream.write(
+            f"\r{self.done}/{self.total} URLs  {rate:.2f} URLs/s  ETA {eta}  erros {self.errors}  "
+        )
+        self.stream.flush()
+
+    def finish(self) -> None:
+        if self._rendered != self.done:
+            self.render()
+        self.stream.write("\n")
+        self.stream.flush()
+
+
+def run(
+    urls: Iterable[str],
+    writer: ResultWriter,
+    concurrency: int = 8,
+    mode: str = "default",
+    use_llm_cache: bool = True,
+    force_refresh: bool = False,
+    include_trace: bool = False,
+    progress: bool = True,
+    pipeline: bool = False,
+) -> Dict[str, int]:
+    """
+    Avalia as URLs ainda não concluídas na saída e grava cada resultado
+    assim que ele fica pronto.
+
+    Args:
+        urls: URLs de entrada
+        writer: Saída dos resultados
+        concurrency: Grafos executando ao mesmo tempo
+        mode: Configuração do grafo ("default", "parallel" ou "merged")
+        use_llm_cache: Se False, ignora respostas do modelo já guardadas
+        force_refresh: Se True, não reaproveita avaliações anteriores
+        include_trace: Se True, inclui as medições de cada execução
+        progress: Se True, mostra o progresso na saída de erro
+        pipeline: Se True, usa pipeline.Pipeline (download, extração e
+            modelo em etapas separadas; concurrency vale para a etapa do
+            modelo) e, com progress, mostra a ocupação de cada etapa
+
+    Returns:
+        Dict[str, int]: Contadores "total", "skipped", "done" e "errors"
+    """
+    urls = list(urls)
+    completed = writer.completed()
+    pending = [url for url in urls if url not in completed]
+    counts = {"total": len(urls), "skipped": len(urls) - len(pending), "done": 0, "errors": 0}
+    meter = Progress(len(pending)) if progress and pending else None
+
+    def on_result(index: int, url: str, result: dict) -> None:
+        if not include_trace:
+            result.pop("trace", None)
+        writer.write({"url": url, **result})
+        counts["done"] += 1
+        counts["errors"] += int(bool(result.get("error")))
+        if meter is not None:
+            meter.update(error=bool(result.get("error")))
+
+    writer.open()
+    try:
+        if pending:
+            # Importado só aqui: --help, erros de argumentos e retomadas já
+            # concluídas não carregam o grafo
+            if pipeline:
+                from pipeline import Pipeline
+
+                stages = Pipeline(
+                    llm_concurrency=concurrency,
+                    use_llm_cache=use_llm_cache,
+                    mode=mode,
+                    force_refresh=force_refresh,
+                )
+                stages.run(pending, on_result=on_result)
+            else:
+                from backend import process_many
+
+                process_many(
+                    pending,
+                    max_concurrency=concurrency,
+                    on_result=on_result,
+                    use_llm_cache=use_llm_cache,
+                    mode=mode,
+                    force_refresh=force_refresh,
+                )
+    finally:
+        writer.close()
+        if meter is not None:
+            meter.finish()
+    if pipeline and pending and progress:
+        for name, stage in stages.stats().items():
+            print(
+                f"{name:<6} {stage['workers']:>3} workers  ocupação {stage['occupancy']:4.0%}  "
+                f"fila máx. {stage['queue_max']}  bloqueada {stage['blocked_s']:.1f}s",
+                file=sys.stderr,
+            )
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", help="CSV, JSONL ou arquivo com uma URL por linha ('-' para a entrada padrão)")
+    parser.add_argument("-o", "--output", required=True, help="Arquivo de saída (.jsonl ou .parquet)")
+    parser.add_argument("--input-format", choices=("csv", "jsonl", "lines"), help="Formato da entrada")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Grafos simultâneos")
+    parser.add_argument("--mode", default="default", help="Configuração do grafo")
+    parser.add_argument("--no-llm-cache", action="store_true", help="Ignora respostas guardadas do modelo")
+    parser.add_argument("--force-refresh", action="store_true", help="Avalia de novo sites sem mudanças")
+    parser.add_argument("--trace", action="store_true", help="Inclui as medições de cada execução")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Sem linha de progresso")
+    parser.add_argument("--pipeline", action="store_true", help="Download, extração e modelo em etapas separadas")
+    parser.add_argument(
+        "--batch-prompts", action="store_true", help="Agrupa descrições e decisões de URLs simultâneas em lotes"
+    )
+    args = parser.parse_args()
+
+    if args.output.endswith(".parquet"):
+        if importlib.util.find_spec("pyarrow") is None:
+            parser.error("a saída Parquet requer o pyarrow (pip install pyarrow)")
+        writer: ResultWriter = ParquetResultWriter(args.output)
+    else:
+        writer = ResultWriter(args.output)
+
+    batcher = None
+    if args.batch_prompts:
+        from batching import PromptBatcher, set_batcher
+
+        batcher = PromptBatcher()
+        set_batcher(batcher)
+
+    urls = read_urls(args.input, args.input_format)
+    try:
+        counts = run(
+            urls,
+            writer,
+            concurrency=args.concurrency,
+            mode=args.mode,
+            use_llm_cache=not args.no_llm_cache,
+            force_refresh=args.force_refresh,
+            include_trace=args.trace,
+            progress=not args.quiet,
+            pipeline=args.pipeline,
+        )
+    except KeyboardInterrupt:
+        print("interrompido; rode o mesmo comando para continuar", file=sys.stderr)
+        sys.exit(130)
+
+    print(
+        f"{counts['done']} avaliadas, {counts['skipped']} já concluídas, {counts['errors']} com erro",
+        file=sys.stderr,
+    )
+    if batcher is not None and not args.quiet:
+        for kind, stats in batcher.stats().items():
+            print(
+                f"lotes de {kind}: {stats['batches']} ({stats['avg_size']:.1f} itens em média), "
+                f"{stats['requests_saved']} requisições a menos",
+                file=sys.stderr,
+            )
+    if counts["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Comparação de várias URLs para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém a avaliação de uma lista de URLs em segundo plano,
+usada pelo modo de comparação da interface. Um event loop em uma thread
+própria roda os grafos com concorrência limitada (aprocess_url), e a
+interface só lê o estado de cada URL a cada atualização, sem bloquear as
+execuções do script do Streamlit. URLs avaliadas há menos de
+RESULT_MAX_AGE vêm do armazenamento de resultados, sem nova avaliação, e
+qualquer URL na fila ou em andamento pode ser cancelada.
+
+Uso:
+    comparison = Comparison(urls).start()
+    comparison.rows()      # estado e resultado de cada URL
+    comparison.cancel(3)   # cancela a quarta URL
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from backend import aprocess_url, error_result
+from constants import COMPARISON_CONCURRENCY, RESULT_MAX_AGE
+from crawler import canonicalize
+from result_store import get_result_store
+
+# Estados de cada URL da comparação
+QUEUED, RUNNING, DONE, STORED, FAILED, CANCELLED = "queued", "running", "done", "stored", "failed", "cancelled"
+
+# Estados finais (a URL não muda mais)
+FINISHED = (DONE, STORED, FAILED, CANCELLED)
+
+
+@dataclass
+class ComparisonItem:
+    """
+    Uma URL da comparação.
+
+    Attributes:
+        url: URL avaliada
+        status: QUEUED, RUNNING, DONE, STORED (do armazenamento), FAILED
+            ou CANCELLED
+        result: Resultado no formato de process_url (DONE, STORED e FAILED)
+        started_at: Início da avaliação (time.time())
+        finished_at: Fim da avaliação
+    """
+    url: str
+    status: str = QUEUED
+    result: Optional[dict] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def seconds(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class Comparison:
+    """
+    Avaliação de várias URLs em segundo plano, com cancelamento por URL.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        max_concurrency: int = COMPARISON_CONCURRENCY,
+        force_refresh: bool = False,
+        mode: str = "default",
+    ):
+        """
+        Args:
+            urls: URLs a comparar
+            max_concurrency: Avaliações simultâneas
+            force_refresh: Se True, avalia de novo mesmo as URLs com
+                avaliação recente guardada
+            mode: Configuração do grafo
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency deve ser maior ou igual a 1")
+        self.items = [ComparisonItem(url) for url in urls]
+        self.max_concurrency = max_concurrency
+        self.force_refresh = force_refresh
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._cancelled: Set[int] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "Comparison":
+        """
+        Recupera as avaliações recentes guardadas e começa as demais em
+        uma thread própria.
+
+        Returns:
+            Comparison: A própria comparação
+        """
+        if not self.force_refresh:
+            store = get_result_store()
+            for item in self.items:
+                stored = store.latest(canonicalize(item.url))
+                if stored is not None and time.time() - stored.created_at <= RESULT_MAX_AGE:
+                    item.status, item.result = STORED, stored.to_result()
+        if any(item.status == QUEUED for item in self.items):
+            self._thread = threading.Thread(target=asyncio.run, args=(self._run(),), daemon=True)
+            self._thread.start()
+        return self
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        # Os nós do grafo são síncronos e rodam no executor padrão do loop
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=self.max_concurrency))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        with self._lock:
+            self._loop = loop
+            self._tasks = {
+                index: asyncio.ensure_future(self._evaluate(index, semaphore))
+                for index, item in enumerate(self.items)
+                if item.status == QUEUED
+            }
+            tasks = list(self._tasks.values())
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _evaluate(self, index: int, semaphore: asyncio.Semaphore) -> None:
+        """
+        Avalia uma URL quando houver vaga.
+
+        Args:
+            index: Posição da URL na comparação
+            semaphore: Limite de avaliações simultâneas
+        """
+        item = self.items[index]
+        try:
+            async with semaphore:
+                if index in self._cancelled:
+                    raise asyncio.CancelledError
+                self._update(item, RUNNING, started_at=time.time())
+                result = await aprocess_url(item.url, mode=self.mode, force_refresh=self.force_refresh)
+            self._update(item, FAILED if result.get("error") else DONE, result=result)
+        except asyncio.CancelledError:
+            self._update(item, CANCELLED)
+        except Exception as e:
+            self._update(item, FAILED, result=error_result(f"Exception: {str(e)}"))
+
+    def _update(self, item: ComparisonItem, status: str, **fields: Any) -> None:
+        with self._lock:
+            item.status = status
+            for name, value in fields.items():
+                setattr(item, name, value)
+            if status in FINISHED:
+                item.finished_at = time.time()
+
+    def cancel(self, index: int) -> bool:
+        """
+        Cancela uma URL na fila ou em andamento. Uma chamada ao modelo já
+        iniciada termina, mas o grafo não passa para o próximo nó.
+
+        Args:
+            index: Posição da URL na comparação
+
+        Returns:
+            bool: True se a URL ainda não tinha terminado
+        """
+        with self._lock:
+            if self.items[index].status in FINISHED:
+                return False
+            self._cancelled.add(index)
+            task, loop = self._tasks.get(index), self._loop
+        if task is not None and loop is not None:
+            loop.call_soon_threadsafe(task.cancel)
+        return True
+
+    def cancel_all(self) -> int:
+        """
+        Cancela todas as URLs que ainda não terminaram.
+
+        Returns:
+            int: URLs canceladas
+        """
+        return sum(self.cancel(index) for index in range(len(self.items)))
+
+    @property
+    def finished(self) -> bool:
+        with self._lock:
+            return all(item.status in FINISHED for item in self.items)
+
+    def counts(self) -> Dict[str, int]:
+        """
+        URLs por estado.
+
+        Returns:
+            Dict[str, int]: Quantidade de URLs em cada estado
+        """
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for item in self.items:
+                counts[item.status] = counts.get(item.status, 0) + 1
+        return counts
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """
+        Linhas da tabela de comparação, na ordem das URLs.
+
+        Returns:
+            List[Dict[str, Any]]: Por URL: posição, URL, estado, nota,
+                descrição, tendências de mercado, erro e segundos de avaliação
+        """
+        with self._lock:
+            rows = []
+            for index, item in enumerate(self.items):
+                result = item.result or {}
+                rows.append({
+                    "index": index,
+                    "url": item.url,
+                    "status": item.status,
+                    "rating": result.get("rating") if item.status in (DONE, STORED) else None,
+                    "descriptor": result.get("descriptor", ""),
+                    "market_trends": result.get("market_trends", ""),
+                    "error": result.get("error"),
+                    "seconds": item.seconds,
+                })
+        return rows
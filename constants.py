@@ -1,12 +1,127 @@
+import os
 from typing import List, Dict, Any
 from typing_extensions import TypedDict
 
+# Diretório dos caches locais (conteúdo das páginas, respostas do modelo, etc.)
+CACHE_DIR = os.getenv("WEBSCRAP_CACHE_DIR", ".cache")
+
+# Validade do conteúdo das páginas: cobre uma reavaliação semanal com folga
+CONTENT_CACHE_TTL = float(os.getenv("WEBSCRAP_CONTENT_CACHE_TTL", 10 * 24 * 3600))
+# Falhas de download são guardadas por pouco tempo
+CONTENT_CACHE_NEGATIVE_TTL = float(os.getenv("WEBSCRAP_CONTENT_CACHE_NEGATIVE_TTL", 5 * 60))
+# Tamanho máximo do cache de conteúdo em disco
+CONTENT_CACHE_MAX_BYTES = int(os.getenv("WEBSCRAP_CONTENT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Número máximo de rodadas de insights por avaliação
+MAX_ITERACOES = 3
+
+# Orçamento de caracteres de texto extraído por página
+CONTENT_CHAR_BUDGET = int(os.getenv("WEBSCRAP_CONTENT_CHAR_BUDGET", 4000))
+
+# Crawl do site antes da descrição: páginas (incluindo a inicial), orçamento
+# de tokens do conteúdo selecionado e prazo total em segundos
+CRAWL_MAX_PAGES = int(os.getenv("WEBSCRAP_CRAWL_MAX_PAGES", 4))
+CRAWL_TOKEN_BUDGET = int(os.getenv("WEBSCRAP_CRAWL_TOKEN_BUDGET", 800))
+CRAWL_TIMEOUT = float(os.getenv("WEBSCRAP_CRAWL_TIMEOUT", 8))
+
+# Pipeline de lotes (ver pipeline.py): downloads simultâneos, processos de
+# extração, crawls simultâneos, grafos simultâneos e capacidade das filas
+# entre as etapas
+PIPELINE_FETCH_CONCURRENCY = int(os.getenv("WEBSCRAP_PIPELINE_FETCH", 32))
+PIPELINE_PARSE_WORKERS = int(os.getenv("WEBSCRAP_PIPELINE_PARSE", max(1, (os.cpu_count() or 2) - 1)))
+PIPELINE_CRAWL_CONCURRENCY = int(os.getenv("WEBSCRAP_PIPELINE_CRAWL", 16))
+PIPELINE_LLM_CONCURRENCY = int(os.getenv("WEBSCRAP_PIPELINE_LLM", 8))
+PIPELINE_QUEUE_SIZE = int(os.getenv("WEBSCRAP_PIPELINE_QUEUE", 16))
+
+# Comparação de URLs na interface (ver comparison.py): avaliações
+# simultâneas e máximo de URLs por comparação
+COMPARISON_CONCURRENCY = int(os.getenv("WEBSCRAP_COMPARISON_CONCURRENCY", 4))
+COMPARISON_MAX_URLS = int(os.getenv("WEBSCRAP_COMPARISON_MAX_URLS", 20))
+
+# Contexto dos prompts, em tokens: descrição e tendências, insights
+# recentes mantidos na íntegra, resumo dos insights antigos e cada item dele
+PROMPT_FIELD_TOKEN_BUDGET = int(os.getenv("WEBSCRAP_PROMPT_FIELD_TOKENS", 150))
+PROMPT_INSIGHT_TOKEN_BUDGET = int(os.getenv("WEBSCRAP_PROMPT_INSIGHT_TOKENS", 250))
+PROMPT_SUMMARY_TOKEN_BUDGET = int(os.getenv("WEBSCRAP_PROMPT_SUMMARY_TOKENS", 120))
+PROMPT_SUMMARY_ITEM_TOKENS = 30
+
+# Reaproveitamento de avaliações: bits de diferença no SimHash aceitos como
+# conteúdo quase igual e idade máxima da avaliação reaproveitada
+RESULT_NEAR_DUPLICATE_BITS = int(os.getenv("WEBSCRAP_RESULT_NEAR_DUPLICATE_BITS", 3))
+RESULT_MAX_AGE = float(os.getenv("WEBSCRAP_RESULT_MAX_AGE", 30 * 24 * 3600))
+
+# Fila de avaliações: prazo de posse de um job sem sinal de vida do worker
+# (depois dele o job volta para a fila), tentativas por job e workers
+JOB_LEASE_SECONDS = float(os.getenv("WEBSCRAP_JOB_LEASE", 60))
+JOB_MAX_ATTEMPTS = int(os.getenv("WEBSCRAP_JOB_MAX_ATTEMPTS", 3))
+JOB_WORKERS = int(os.getenv("WEBSCRAP_JOB_WORKERS", 2))
+
+# Validade e tamanho máximo do cache de respostas do modelo
+LLM_CACHE_TTL = float(os.getenv("WEBSCRAP_LLM_CACHE_TTL", 30 * 24 * 3600))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("WEBSCRAP_LLM_CACHE_MAX_ENTRIES", 50_000))
+
+# Orçamentos do provedor do modelo e política de novas tentativas
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("WEBSCRAP_LLM_RPM", 30))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("WEBSCRAP_LLM_TPM", 8000))
+LLM_MAX_CONCURRENCY = int(os.getenv("WEBSCRAP_LLM_MAX_CONCURRENCY", 8))
+LLM_MAX_RETRIES = int(os.getenv("WEBSCRAP_LLM_MAX_RETRIES", 5))
+# Estimativa de tokens de resposta reservada para cada chamada
+LLM_COMPLETION_TOKENS_ESTIMATE = 300
+# Modelos do roteamento por nó (ver models.py): o principal fica com a
+# avaliação final; o rápido atende os nós leves, com o principal de reserva
+LLM_MODEL = os.getenv("WEBSCRAP_LLM_MODEL", "openai/gpt-oss-120b")
+LLM_FAST_MODEL = os.getenv("WEBSCRAP_LLM_FAST_MODEL", "openai/gpt-oss-20b")
+# Rotas adicionais no formato "nó=modelo,reserva;nó=modelo" ("*" = demais nós)
+LLM_ROUTES = os.getenv("WEBSCRAP_LLM_ROUTES", "")
+# Tempo máximo de uma chamada antes de passar ao modelo de reserva, em segundos
+LLM_TIMEOUT = float(os.getenv("WEBSCRAP_LLM_TIMEOUT", 30))
+# Saída estruturada das decisões e da nota: "json_schema" (resposta
+# restrita ao esquema), "json_object" (apenas JSON válido) ou "off" (só
+# as instruções do prompt, para provedores sem suporte)
+LLM_STRUCTURED_OUTPUT = os.getenv("WEBSCRAP_STRUCTURED_OUTPUT", "json_schema")
+
+# Lotes de prompts entre URLs (ver batching.py): "on" junta as chamadas de
+# descrição e de decisão de avaliações simultâneas em uma requisição; a
+# janela de espera (s) e o máximo de itens por lote
+LLM_BATCH = os.getenv("WEBSCRAP_LLM_BATCH", "off")
+LLM_BATCH_WINDOW = float(os.getenv("WEBSCRAP_LLM_BATCH_WINDOW", 0.05))
+LLM_BATCH_MAX_ITEMS = int(os.getenv("WEBSCRAP_LLM_BATCH_MAX_ITEMS", 16))
+
+# Cache semântico de respostas (ver semantic_cache.py): "on" reaproveita
+# respostas entre prompts quase iguais; similaridade de cosseno mínima e
+# memória máxima do índice
+SEMANTIC_CACHE = os.getenv("WEBSCRAP_SEMANTIC_CACHE", "off")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("WEBSCRAP_SEMANTIC_THRESHOLD", 0.9))
+SEMANTIC_CACHE_MAX_BYTES = int(os.getenv("WEBSCRAP_SEMANTIC_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Política de parada do laço de insights (ver policies.py) e seus limites
+STOP_POLICY = os.getenv("WEBSCRAP_STOP_POLICY", "llm")
+# Fração mínima de palavras novas no último insight para continuar
+STOP_NOVELTY_THRESHOLD = float(os.getenv("WEBSCRAP_STOP_NOVELTY", 0.4))
+# Orçamento de tokens do modelo e de tempo (s) de cada URL
+STOP_TOKEN_BUDGET = int(os.getenv("WEBSCRAP_STOP_TOKENS", 4000))
+STOP_TIME_BUDGET = float(os.getenv("WEBSCRAP_STOP_SECONDS", 30))
+
 class State(TypedDict):
     url: str
+    # Conteúdo coletado do site (trechos selecionados pelo crawler)
+    conteudo: str
     descricao: str
     tendencias_mercado: str
     avaliacao: int
     resposta_final: str
     enough: bool
     interacoes: int
-    pensamentos: List[str]
\ No newline at end of file
+    pensamentos: List[str]
+    # Resumo compacto dos insights mais antigos e quantos deles já estão nele
+    resumo_pensamentos: str
+    pensamentos_resumidos: int
+    # Insight gerado em paralelo com a decisão, ainda não incorporado
+    insight_pendente: str
+    # Quantos pensamentos já estão refletidos em tendencias_mercado
+    tendencias_ref: int
+    # Impressões digitais do conteúdo (hash exato e SimHash)
+    impressao: str
+    simhash: int
+    # True quando a avaliação anterior foi reaproveitada
+    reutilizado: bool
@@ -0,0 +1,297 @@
+"""
+Cache persistente do conteúdo das páginas para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém o cache em disco usado por fetch_website_content. O
+conteúdo extraído de cada URL é guardado com validade (TTL) e com os
+cabeçalhos ETag/Last-Modified para revalidação condicional. Falhas ficam
+em um cache negativo com TTL curto, o tamanho total é limitado com
+remoção LRU e o banco SQLite pode ser compartilhado entre processos.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from constants import (
+    CACHE_DIR,
+    CONTENT_CACHE_MAX_BYTES,
+    CONTENT_CACHE_NEGATIVE_TTL,
+    CONTENT_CACHE_TTL,
+)
+
+
+@dataclass
+class CacheEntry:
+    """
+    Entrada do cache de conteúdo.
+
+    Attributes:
+        url: URL da página
+        text: Conteúdo textual (ou mensagem de erro, se is_error)
+        etag: Cabeçalho ETag da última resposta
+        last_modified: Cabeçalho Last-Modified da última resposta
+        is_error: True para entradas do cache negativo
+        expires_at: Momento (epoch) em que a entrada deixa de ser válida
+    """
+    url: str
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    is_error: bool = False
+    expires_at: float = 0.0
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class ContentCache:
+    """
+    Interface do cache de conteúdo. A implementação padrão não guarda
+    nada, o que permite desligar o cache sem alterar os nós.
+    """
+
+    def __init__(self):
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "negative_hits": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        Busca a entrada de uma URL, válida ou expirada.
+
+        Args:
+            url: URL da página
+
+        Returns:
+            Optional[CacheEntry]: Entrada encontrada ou None
+        """
+        self._count("misses")
+        return None
+
+    def set(
+        self,
+        url: str,
+        text: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        is_error: bool = False,
+    ) -> None:
+        """
+        Guarda o conteúdo de uma URL.
+
+        Args:
+            url: URL da página
+            text: Conteúdo textual ou mensagem de erro
+            etag: Cabeçalho ETag da resposta
+            last_modified: Cabeçalho Last-Modified da resposta
+            is_error: True para guardar no cache negativo
+        """
+
+    def refresh(self, url: str) -> None:
+        """
+        Renova a validade de uma entrada revalidada (resposta 304).
+
+        Args:
+            url: URL da página
+        """
+        self._count("revalidated")
+
+    def clear(self) -> None:
+        """
+        Remove todas as entradas.
+        """
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Estatísticas de uso do cache neste processo.
+
+        Returns:
+            Dict[str, float]: Contadores e taxa de acerto
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"] + stats["stale"] + stats["negative_hits"]
+        stats["hit_rate"] = (stats["hits"] + stats["negative_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+class SQLiteContentCache(ContentCache):
+    """
+    Cache de conteúdo em um arquivo SQLite (modo WAL), seguro para uso
+    por várias threads e processos ao mesmo tempo.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = CONTENT_CACHE_TTL,
+        negative_ttl: float = CONTENT_CACHE_NEGATIVE_TTL,
+        max_bytes: int = CONTENT_CACHE_MAX_BYTES,
+    ):
+        """
+        Args:
+            path: Caminho do arquivo SQLite
+            ttl: Validade das páginas baixadas com sucesso, em segundos
+            negative_ttl: Validade das falhas, em segundos
+            max_bytes: Tamanho máximo do conteúdo guardado
+        """
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    is_error INTEGER NOT NULL DEFAULT 0,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT text, etag, last_modified, is_error, expires_at FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            conn.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), url))
+
+        entry = CacheEntry(url, row[0], row[1], row[2], bool(row[3]), row[4])
+        if not entry.fresh:
+            self._count("stale")
+        elif entry.is_error:
+            self._count("negative_hits")
+        else:
+            self._count("hits")
+        return entry
+
+    def set(
+        self,
+        url: str,
+        text: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        is_error: bool = False,
+    ) -> None:
+        now = time.time()
+        ttl = self.negative_ttl if is_error else self.ttl
+        size = len(text.encode("utf-8"))
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, text, etag, last_modified, int(is_error), size, now + ttl, now),
+            )
+            self._evict(conn)
+
+    def refresh(self, url: str) -> None:
+        super().refresh(url)
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE pages SET expires_at = ?, last_access = ? WHERE url = ?",
+                (now + self.ttl, now, url),
+            )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """
+        Remove as entradas menos usadas recentemente até caber no limite.
+
+        Args:
+            conn: Conexão com a transação corrente
+        """
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for url, size in conn.execute("SELECT url, size FROM pages ORDER BY last_access"):
+            victims.append((url,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM pages WHERE url = ?", victims)
+
+    def clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM pages")
+
+    def stats(self) -> Dict[str, float]:
+        stats = super().stats()
+        with self._connection() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()
+        stats["entries"] = entries
+        stats["size_bytes"] = size
+        return stats
+
+
+_content_cache: Optional[ContentCache] = None
+_content_cache_lock = threading.Lock()
+
+
+def get_content_cache() -> ContentCache:
+    """
+    Retorna o cache de conteúdo do processo.
+
+    O cache em disco fica em CACHE_DIR; defina WEBSCRAP_CONTENT_CACHE=off
+    para desligá-lo.
+
+    Returns:
+        ContentCache: Cache configurado
+    """
+    global _content_cache
+    if _content_cache is None:
+        with _content_cache_lock:
+            if _content_cache is None:
+                if os.getenv("WEBSCRAP_CONTENT_CACHE", "on").lower() == "off":
+                    _content_cache = ContentCache()
+                else:
+                    _content_cache = SQLiteContentCache(os.path.join(CACHE_DIR, "content.sqlite"))
+    return _content_cache
+
+
+def set_content_cache(cache: ContentCache) -> None:
+    """
+    Substitui o cache de conteúdo do processo (por exemplo, por outra
+    implementação de ContentCache).
+
+    Args:
+        cache: Nova instância de cache
+    """
+    global _content_cache
+    with _content_cache_lock:
+        _content_cache = cache
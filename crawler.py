@@ -0,0 +1,537 @@
+"""
+Crawler do site para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém a etapa de coleta que alimenta o descritor. Além da
+página informada, o crawler baixa em paralelo algumas páginas do mesmo
+domínio com mais chance de descrever o negócio (sobre, preços, produto),
+respeitando o robots.txt e eliminando duplicatas pela URL canônica. Os
+downloads têm um prazo total e os que não terminarem a tempo são
+cancelados. Por fim, os trechos mais informativos de todas as páginas são
+escolhidos dentro de um orçamento de tokens.
+"""
+
+import asyncio
+import hashlib
+import re
+import time
+import urllib.robotparser
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from constants import CRAWL_MAX_PAGES, CRAWL_TIMEOUT, CRAWL_TOKEN_BUDGET
+from content_cache import get_content_cache
+from extractor import ParsedHTML, TextExtractor
+from fetcher import AsyncFetcher, FetchResult, get_fetcher
+from instrumentation import Span, record, span
+
+# Nome usado na consulta ao robots.txt
+ROBOTS_USER_AGENT = "WebScrapAgent"
+
+# Parâmetros de rastreamento removidos na forma canônica da URL
+TRACKING_PARAMS = ("utm_", "gclid", "fbclid", "mc_cid", "mc_eid", "ref")
+
+# Extensões que não são páginas HTML
+SKIP_EXTENSIONS = (
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip",
+    ".mp4", ".mp3", ".css", ".js", ".xml", ".json", ".ico",
+)
+
+# Peso de cada termo encontrado no caminho ou no texto de um link
+LINK_KEYWORDS = {
+    "sobre": 3, "about": 3, "quem-somos": 3, "quem somos": 3, "empresa": 3, "company": 3,
+    "pricing": 3, "precos": 3, "preços": 3, "planos": 3, "plans": 3,
+    "produto": 2, "product": 2, "solucoes": 2, "soluções": 2, "solutions": 2,
+    "features": 2, "recursos": 2, "funcionalidades": 2, "servicos": 2, "serviços": 2,
+    "services": 2, "como-funciona": 2, "how-it-works": 2,
+    "clientes": 1, "customers": 1, "cases": 1, "faq": 1, "equipe": 1, "team": 1,
+    "login": -5, "signin": -5, "sign-in": -5, "entrar": -5, "signup": -5, "cadastro": -5,
+    "register": -5, "cart": -5, "carrinho": -5, "checkout": -5, "privacy": -5,
+    "privacidade": -5, "termos": -5, "terms": -5, "cookie": -5, "careers": -5,
+    "carreiras": -5, "vagas": -5, "jobs": -5,
+}
+
+# Termos que indicam texto útil para avaliar o negócio
+CHUNK_KEYWORDS = (
+    "produto", "product", "plataforma", "platform", "cliente", "customer", "preço", "price",
+    "plano", "plan", "empresa", "company", "solução", "solution", "serviço", "service",
+    "mercado", "market", "missão", "mission", "fundad", "founded", "equipe", "team",
+    "receita", "revenue", "assinatura", "subscription",
+)
+
+# Frases típicas de texto repetitivo (banners, rodapés, formulários)
+BOILERPLATE = (
+    "cookie", "todos os direitos", "all rights reserved", "política de privacidade",
+    "privacy policy", "newsletter", "javascript", "faça login", "sign in",
+)
+
+# Tamanho aproximado dos trechos considerados na seleção
+CHUNK_CHARS = 400
+
+# Quantidade de texto (múltiplo do orçamento) a partir da qual os
+# downloads pendentes são cancelados
+ENOUGH_TEXT_FACTOR = 3
+
+
+@dataclass
+class Page:
+    """
+    Página baixada pelo crawler.
+
+    Attributes:
+        url: URL final da página
+        text: Texto visível extraído
+        canonical: URL canônica (declarada na página ou normalizada)
+    """
+    url: str
+    text: str
+    canonical: str
+
+
+@dataclass
+class CrawlResult:
+    """
+    Resultado do crawl de um site.
+
+    Attributes:
+        content: Trechos selecionados, prontos para o prompt (ou a
+            mensagem de erro da página inicial)
+        pages: Páginas baixadas, a inicial primeiro
+        skipped_robots: Links descartados pelo robots.txt
+        cancelled: Downloads cancelados por prazo ou por texto suficiente
+        parse_seconds: Tempo total de extração de texto
+        error: True se a página inicial não pôde ser baixada
+    """
+    content: str
+    pages: List[Page] = field(default_factory=list)
+    skipped_robots: int = 0
+    cancelled: int = 0
+    parse_seconds: float = 0.0
+    error: bool = False
+
+
+def canonicalize(url: str) -> str:
+    """
+    Forma canônica de uma URL, usada para eliminar duplicatas: esquema e
+    host em minúsculas, sem porta padrão, fragmento, parâmetros de
+    rastreamento ou barra final.
+
+    Args:
+        url: URL absoluta
+
+    Returns:
+        str: URL canônica
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def site_domain(url: str) -> str:
+    """
+    Domínio do site de uma URL, sem o "www." (o mesmo para todas as
+    páginas do site).
+
+    Args:
+        url: URL absoluta
+
+    Returns:
+        str: Domínio em minúsculas
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def score_link(url: str, text: str) -> float:
+    """
+    Pontua um link pela chance de a página descrever o negócio.
+
+    Args:
+        url: URL absoluta do link
+        text: Texto do link
+
+    Returns:
+        float: Pontuação (links com pontuação <= 0 não são baixados)
+    """
+    path = urlsplit(url).path.lower()
+    haystack = f"{path} {text.lower()}"
+    score = sum(weight for keyword, weight in LINK_KEYWORDS.items() if keyword in haystack)
+    depth = len([segment for segment in path.split("/") if segment])
+    return score - 0.5 * max(0, depth - 1)
+
+
+def candidate_links(base_url: str, links: List[Tuple[str, str]]) -> List[Tuple[float, str]]:
+    """
+    Seleciona e ordena os links do mesmo site que valem ser baixados.
+
+    Args:
+        base_url: URL final da página inicial
+        links: Pares (href, texto) encontrados na página inicial
+
+    Returns:
+        List[Tuple[float, str]]: Pares (pontuação, URL canônica), do
+            melhor para o pior, sem duplicatas
+    """
+    site = site_domain(base_url)
+    home = canonicalize(base_url)
+    best = {}
+    for href, text in links:
+        if href.startswith(("mailto:", "tel:", "javascript:", "#")):
+            continue
+        url = urljoin(base_url, href)
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or site_domain(url) != site:
+            continue
+        if parts.path.lower().endswith(SKIP_EXTENSIONS):
+            continue
+        canonical = canonicalize(url)
+        if canonical == home:
+            continue
+        score = score_link(url, text)
+        if score > 0 and score > best.get(canonical, 0):
+            best[canonical] = score
+    return sorted(((score, url) for url, score in best.items()), key=lambda item: (-item[0], item[1]))
+
+
+class _RobotsCache:
+    """
+    Regras do robots.txt por origem, mantidas em memória (LRU). Usado
+    apenas dentro do loop do fetcher.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._parsers: "OrderedDict[str, Optional[urllib.robotparser.RobotFileParser]]" = OrderedDict()
+
+    async def allowed(self, fetcher: AsyncFetcher, url: str) -> bool:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if origin in self._parsers:
+            self._parsers.move_to_end(origin)
+        else:
+            response = await fetcher.fetch(f"{origin}/robots.txt", max_chars=200_000)
+            parser = None
+            if response.ok:
+                parser = urllib.robotparser.RobotFileParser()
+                parser.parse(response.text.splitlines())
+            elif response.status_code in (401, 403):
+                # Acesso negado ao robots.txt: trata o site inteiro como proibido
+                parser = urllib.robotparser.RobotFileParser()
+                parser.disallow_all = True
+            self._parsers[origin] = parser
+            while len(self._parsers) > self.max_entries:
+                self._parsers.popitem(last=False)
+        parser = self._parsers[origin]
+        return parser is None or parser.can_fetch(ROBOTS_USER_AGENT, url)
+
+
+_robots = _RobotsCache()
+
+
+async def robots_allowed(fetcher: AsyncFetcher, url: str) -> bool:
+    """
+    Se o robots.txt do site permite baixar a URL (as regras ficam em
+    memória por origem).
+
+    Args:
+        fetcher: Fetcher a usar
+        url: URL absoluta
+
+    Returns:
+        bool: True se o download é permitido (ou não há robots.txt)
+    """
+    return await fetcher.arun(_robots.allowed(fetcher, url))
+
+
+def crawl_cache_key(url: str, max_pages: int = CRAWL_MAX_PAGES, token_budget: int = CRAWL_TOKEN_BUDGET) -> str:
+    return f"crawl:{max_pages}:{token_budget}:{canonicalize(url)}"
+
+
+def split_chunks(text: str, size: int = CHUNK_CHARS) -> List[str]:
+    """
+    Divide o texto em trechos de até ~size caracteres, nas fronteiras de
+    frase quando possível.
+
+    Args:
+        text: Texto de uma página
+        size: Tamanho aproximado dos trechos
+
+    Returns:
+        List[str]: Trechos
+    """
+    chunks, current = [], ""
+    for sentence in re.split(r"(?<=[.!?])\s+", text):
+        while len(sentence) > size:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:size])
+            sentence = sentence[size:]
+        if current and len(current) + len(sentence) + 1 > size:
+            chunks.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+    if current.strip():
+        chunks.append(current)
+    return [chunk.strip() for chunk in chunks if chunk.strip()]
+
+
+def chunk_score(chunk: str) -> float:
+    """
+    Estima quão informativo é um trecho: variedade de palavras, termos de
+    negócio e valores, descontando frases de texto repetitivo.
+
+    Args:
+        chunk: Trecho de texto
+
+    Returns:
+        float: Pontuação (maior é melhor)
+    """
+    lowered = chunk.lower()
+    words = re.findall(r"\w+", lowered)
+    if len(words) < 8:
+        return 0.0
+    variety = len(set(words)) / len(words)
+    keywords = sum(1 for keyword in CHUNK_KEYWORDS if keyword in lowered)
+    values = 0.5 if re.search(r"(r\$|us\$|\$|€|%)\s?\d|\d\s?%", lowered) else 0.0
+    boilerplate = sum(1 for phrase in BOILERPLATE if phrase in lowered)
+    return variety + 0.3 * min(keywords, 5) + values - boilerplate
+
+
+def select_chunks(pages: List[Page], token_budget: int) -> str:
+    """
+    Escolhe os trechos mais informativos das páginas dentro do orçamento
+    (4 caracteres por token). O começo da página inicial é sempre
+    preferido e trechos repetidos entre páginas (menus, rodapés) entram
+    uma única vez. Os trechos escolhidos voltam à ordem original, agrupados
+    por página. Se nenhum trecho couber ou pontuar (um único bloco enorme,
+    textos curtos demais), vale o começo do texto da página inicial.
+
+    Args:
+        pages: Páginas baixadas, a inicial primeiro
+        token_budget: Orçamento de tokens do conteúdo
+
+    Returns:
+        str: Conteúdo pronto para o prompt
+    """
+    budget = token_budget * 4
+    candidates, seen = [], set()
+    for page_index, page in enumerate(pages):
+        for chunk_index, chunk in enumerate(split_chunks(page.text)):
+            key = hashlib.sha1(" ".join(chunk.lower().split()).encode("utf-8")).digest()
+            if key in seen:
+                continue
+            seen.add(key)
+            score = chunk_score(chunk) + (1.0 if page_index == 0 and chunk_index == 0 else 0.0)
+            candidates.append((score, page_index, chunk_index, chunk))
+
+    chosen, used = [], 0
+    for score, page_index, chunk_index, chunk in sorted(candidates, key=lambda item: -item[0]):
+        if score <= 0 or used + len(chunk) > budget:
+            continue
+        chosen.append((page_index, chunk_index, chunk))
+        used += len(chunk) + 1
+    if not chosen:
+        return pages[0].text[:budget].strip() if pages else ""
+
+    sections = []
+    for page_index, page in enumerate(pages):
+        texts = [chunk for index, _, chunk in sorted(chosen) if index == page_index]
+        if texts:
+            path = urlsplit(page.url).path or "/"
+            sections.append(f"[{path}]\n" + "\n".join(texts))
+    return "\n\n".join(sections)
+
+
+def error_text(response: FetchResult) -> str:
+    if response.error is not None:
+        return f"Exception: {response.error}"
+    return f"Error: Unable to fetch website content (status {response.status_code})"
+
+
+# Baixa uma página e extrai o texto (e, se pedido, os links):
+# (fetcher, url, collect_links) -> (resposta com o texto, extração)
+PageFetcher = Callable[[AsyncFetcher, str, bool], Awaitable[Tuple[FetchResult, ParsedHTML]]]
+
+
+async def _fetch_page(
+    fetcher: AsyncFetcher, url: str, collect_links: bool = False
+) -> Tuple[FetchResult, ParsedHTML]:
+    extractor = TextExtractor(collect_links=collect_links)
+    response = await fetcher.fetch(url, extractor=extractor)
+    response.text = extractor.text() if response.ok else ""
+    return response, ParsedHTML.of(extractor, response.text)
+
+
+async def acrawl(
+    url: str,
+    max_pages: int = CRAWL_MAX_PAGES,
+    token_budget: int = CRAWL_TOKEN_BUDGET,
+    timeout: float = CRAWL_TIMEOUT,
+    fetcher: Optional[AsyncFetcher] = None,
+    fetch_page: PageFetcher = _fetch_page,
+) -> CrawlResult:
+    """
+    Baixa a página inicial e até max_pages - 1 páginas do mesmo site.
+
+    A página inicial foi pedida explicitamente e é sempre baixada; o
+    robots.txt vale para as demais. As páginas extras são baixadas em
+    paralelo e as que não terminarem até o prazo (ou depois que já há
+    texto suficiente) são canceladas.
+
+    Args:
+        url: URL informada pelo usuário
+        max_pages: Máximo de páginas, incluindo a inicial
+        token_budget: Orçamento de tokens do conteúdo selecionado
+        timeout: Prazo total do crawl, em segundos
+        fetcher: Fetcher a usar (padrão: o do processo)
+        fetch_page: Download e extração de cada página (padrão: extração
+            em streaming durante o download)
+
+    Returns:
+        CrawlResult: Conteúdo selecionado e detalhes do crawl
+    """
+    fetcher = fetcher or get_fetcher()
+    deadline = time.monotonic() + timeout
+
+    # O robots.txt é baixado junto com a página inicial
+    robots = asyncio.ensure_future(_robots.allowed(fetcher, url)) if max_pages > 1 else None
+    response, parsed = await fetch_page(fetcher, url, max_pages > 1)
+    if robots is not None:
+        await robots
+    return await acrawl_from(response, parsed, max_pages, token_budget, deadline, fetcher, fetch_page)
+
+
+async def acrawl_from(
+    response: FetchResult,
+    parsed: ParsedHTML,
+    max_pages: int = CRAWL_MAX_PAGES,
+    token_budget: int = CRAWL_TOKEN_BUDGET,
+    deadline: Optional[float] = None,
+    fetcher: Optional[AsyncFetcher] = None,
+    fetch_page: PageFetcher = _fetch_page,
+) -> CrawlResult:
+    """
+    Continua o crawl a partir da página inicial já baixada e extraída:
+    escolhe os links, baixa as páginas extras e seleciona os trechos.
+
+    Args:
+        response: Resposta da página inicial (com o texto extraído)
+        parsed: Extração da página inicial, com os links
+        max_pages: Máximo de páginas, incluindo a inicial
+        token_budget: Orçamento de tokens do conteúdo selecionado
+        deadline: Prazo das páginas extras, em time.monotonic() (padrão:
+            CRAWL_TIMEOUT a partir de agora)
+        fetcher: Fetcher a usar (padrão: o do processo)
+        fetch_page: Download e extração de cada página extra
+
+    Returns:
+        CrawlResult: Conteúdo selecionado e detalhes do crawl
+    """
+    if not response.ok:
+        return CrawlResult(content=error_text(response), error=True, parse_seconds=parsed.parse_seconds)
+    fetcher = fetcher or get_fetcher()
+    if deadline is None:
+        deadline = time.monotonic() + CRAWL_TIMEOUT
+
+    home_canonical = canonicalize(urljoin(response.url, parsed.canonical or response.url))
+    pages = [Page(response.url, response.text, home_canonical)]
+    result = CrawlResult(content="", pages=pages, parse_seconds=parsed.parse_seconds)
+    seen = {home_canonical, canonicalize(response.url)}
+
+    targets = []
+    for _, link in candidate_links(response.url, parsed.links):
+        if len(targets) >= max_pages - 1:
+            break
+        if link in seen:
+            continue
+        if not await _robots.allowed(fetcher, link):
+            result.skipped_robots += 1
+            continue
+        seen.add(link)
+        targets.append(link)
+
+    tasks = {asyncio.ensure_future(fetch_page(fetcher, link, False)) for link in targets}
+    collected = len(response.text)
+    try:
+        while tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or collected >= token_budget * 4 * ENOUGH_TEXT_FACTOR:
+                break
+            done, tasks = await asyncio.wait(tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                page_response, page_parsed = task.result()
+                result.parse_seconds += page_parsed.parse_seconds
+                if not page_response.ok or not page_response.text:
+                    continue
+                canonical = canonicalize(
+                    urljoin(page_response.url, page_parsed.canonical or page_response.url)
+                )
+                # Redirecionamentos e URLs canônicas declaradas podem apontar
+                # para páginas já baixadas (ou que ainda serão)
+                if canonical in seen and canonical != canonicalize(page_response.url):
+                    continue
+                if any(page.canonical == canonical for page in pages):
+                    continue
+                pages.append(Page(page_response.url, page_response.text, canonical))
+                collected += len(page_response.text)
+    finally:
+        for task in tasks:
+            task.cancel()
+        result.cancelled = len(tasks)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Mantém a ordem de relevância dos links (a inicial primeiro)
+    order = {link: index for index, link in enumerate(targets)}
+    pages[1:] = sorted(pages[1:], key=lambda page: order.get(canonicalize(page.url), len(order)))
+    result.content = select_chunks(pages, token_budget)
+    return result
+
+
+def crawl_site(
+    url: str,
+    max_pages: int = CRAWL_MAX_PAGES,
+    token_budget: int = CRAWL_TOKEN_BUDGET,
+    timeout: float = CRAWL_TIMEOUT,
+    fetcher: Optional[AsyncFetcher] = None,
+) -> str:
+    """
+    Conteúdo de um site para o descritor, com cache.
+
+    O conteúdo selecionado é guardado no cache de conteúdo sob uma chave
+    própria do crawl; falhas da página inicial ficam no cache negativo.
+
+    Args:
+        url: URL informada pelo usuário
+        max_pages: Máximo de páginas, incluindo a inicial
+        token_budget: Orçamento de tokens do conteúdo selecionado
+        timeout: Prazo total do crawl, em segundos
+        fetcher: Cliente HTTP (padrão: get_fetcher())
+
+    Returns:
+        str: Trechos selecionados ou a mensagem de erro ("Error..."/"Exception...")
+    """
+    cache = get_content_cache()
+    key = crawl_cache_key(url, max_pages, token_budget)
+    with span("fetch", "crawl") as crawl_span:
+        entry = cache.get(key)
+        crawl_span.cache_hit = entry is not None and entry.fresh
+        if crawl_span.cache_hit:
+            return entry.text
+
+        fetcher = fetcher or get_fetcher()
+        result = fetcher.run(acrawl(url, max_pages, token_budget, timeout, fetcher))
+    record(Span(kind="parse", name="parse", wall_ms=result.parse_seconds * 1000))
+    cache.set(key, result.content, is_error=result.error)
+    return result.content
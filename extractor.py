@@ -0,0 +1,305 @@
+"""
+Extração de texto em streaming para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém o extrator incremental de HTML usado por
+fetch_website_content e pelo crawler. Em vez de montar a árvore completa
+do documento, o extrator percorre os tokens à medida que o HTML chega,
+ignora o conteúdo de script/style/nav e para assim que atinge o orçamento
+de caracteres. Opcionalmente coleta os links (href e texto) e a URL
+canônica da página. Usa o parser do lxml quando ele está instalado e o
+html.parser da biblioteca padrão caso contrário.
+"""
+
+import importlib.util
+import os
+import time
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+from constants import CONTENT_CHAR_BUDGET
+
+# Elementos cujo conteúdo não é texto visível/útil
+SKIP_TAGS = frozenset({"script", "style", "nav", "noscript", "template", "svg", "iframe"})
+
+# Tamanho das fatias usadas ao alimentar o parser com um documento inteiro
+FEED_SIZE = 16 * 1024
+
+# Máximo de links coletados por página
+MAX_LINKS = 500
+
+# Quanto HTML continua sendo lido em busca de links depois que o orçamento
+# de texto foi atingido
+LINK_SCAN_CHARS = 32 * 1024
+
+
+class _TextCollector:
+    """
+    Recebe os eventos do parser (início/fim de tag e texto) e acumula o
+    texto visível até o orçamento de caracteres, a URL canônica e, se
+    pedido, os links.
+    """
+
+    def __init__(self, max_chars: int, collect_links: bool = False):
+        self.max_chars = max_chars
+        self.collect_links = collect_links
+        self.done = False
+        self.links: List[Tuple[str, str]] = []
+        self.canonical: Optional[str] = None
+        self._parts: List[str] = []
+        self._size = 0
+        self._buffer: List[str] = []
+        self._skip_depth = 0
+        self._anchor: Optional[Tuple[str, List[str]]] = None
+
+    def start(self, tag: str, attrs=None) -> None:
+        self._flush()
+        tag = tag.lower()
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        if attrs and (tag == "link" or (tag == "a" and self.collect_links)):
+            # lxml entrega um dicionário; o html.parser, pares (nome, valor)
+            attrs = dict(attrs)
+            if tag == "a" and attrs.get("href") and len(self.links) < MAX_LINKS:
+                self._close_anchor()
+                self._anchor = (attrs["href"], [])
+            elif tag == "link" and "canonical" in (attrs.get("rel") or "").lower().split():
+                self.canonical = attrs.get("href") or self.canonical
+
+    def end(self, tag: str) -> None:
+        self._flush()
+        tag = tag.lower()
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        if tag == "a":
+            self._close_anchor()
+
+    def data(self, data: str) -> None:
+        if self._anchor is not None:
+            # O texto do link conta mesmo dentro de nav
+            self._anchor[1].append(data)
+        if not self._skip_depth and not self.done:
+            self._buffer.append(data)
+
+    def _close_anchor(self) -> None:
+        if self._anchor is not None:
+            href, parts = self._anchor
+            self.links.append((href.strip(), " ".join("".join(parts).split())))
+            self._anchor = None
+
+    def close(self) -> str:
+        self._flush()
+        self._close_anchor()
+        return self.text()
+
+    def _flush(self) -> None:
+        """
+        Normaliza os espaços do texto acumulado entre duas tags. O texto
+        de um mesmo nó pode chegar em vários pedaços, por isso a junção só
+        acontece nas fronteiras de tag.
+        """
+        if not self._buffer:
+            return
+        piece = " ".join("".join(self._buffer).split())
+        self._buffer = []
+        if piece and not self.done:
+            self._parts.append(piece)
+            self._size += len(piece) + 1
+            if self._size >= self.max_chars:
+                self.done = True
+
+    def text(self) -> str:
+        return " ".join(self._parts)[: self.max_chars]
+
+
+class _StdlibParser(HTMLParser):
+    """
+    Adaptador do html.parser da biblioteca padrão para o _TextCollector.
+    """
+
+    def __init__(self, collector: _TextCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, attrs)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+class TextExtractor:
+    """
+    Extrator incremental de texto. Alimente com pedaços de HTML via feed()
+    até que done seja True (ou o documento acabe) e leia o resultado com
+    text(). A URL canônica declarada fica em canonical e, com
+    collect_links, os links ficam em links.
+    """
+
+    def __init__(
+        self,
+        max_chars: int = CONTENT_CHAR_BUDGET,
+        backend: Optional[str] = None,
+        collect_links: bool = False,
+    ):
+        """
+        Args:
+            max_chars: Orçamento de caracteres de texto a extrair
+            backend: "lxml" ou "html.parser" (padrão: lxml, se instalado)
+            collect_links: Coleta os links; nesse caso a leitura continua
+                por até LINK_SCAN_CHARS depois do orçamento de texto (menus
+                e rodapés costumam ficar depois dele)
+        """
+        self.backend = backend or default_backend()
+        self.collect_links = collect_links
+        self._collector = _TextCollector(max_chars, collect_links)
+        if self.backend == "lxml":
+            from lxml import etree
+
+            self._parser = etree.HTMLParser(target=self._collector, recover=True)
+        elif self.backend == "html.parser":
+            self._parser = _StdlibParser(self._collector)
+        else:
+            raise ValueError(f"Parser HTML desconhecido: {self.backend}")
+        self._closed = False
+        self._fed = 0
+        self._text_done_at: Optional[int] = None
+        # Tempo de CPU gasto no parser, para a instrumentação
+        self.parse_seconds = 0.0
+
+    @property
+    def done(self) -> bool:
+        if not self._collector.done:
+            return False
+        if not self.collect_links or len(self._collector.links) >= MAX_LINKS:
+            return True
+        if self._text_done_at is None:
+            self._text_done_at = self._fed
+        return self._fed - self._text_done_at >= LINK_SCAN_CHARS
+
+    @property
+    def links(self) -> List[Tuple[str, str]]:
+        """
+        Links encontrados, como pares (href, texto do link).
+        """
+        return self._collector.links
+
+    @property
+    def canonical(self) -> Optional[str]:
+        return self._collector.canonical
+
+    def feed(self, chunk: str) -> None:
+        """
+        Processa mais um pedaço do documento.
+
+        Args:
+            chunk: Trecho de HTML
+        """
+        if not self.done and chunk:
+            start = time.perf_counter()
+            self._fed += len(chunk)
+            self._parser.feed(chunk)
+            self.parse_seconds += time.perf_counter() - start
+
+    def text(self) -> str:
+        """
+        Finaliza o parser e retorna o texto extraído.
+
+        Returns:
+            str: Texto visível, limitado ao orçamento de caracteres
+        """
+        if not self._closed:
+            self._closed = True
+            start = time.perf_counter()
+            try:
+                self._parser.close()
+            except Exception:
+                # HTML truncado ou malformado: mantém o que já foi extraído
+                pass
+            self.parse_seconds += time.perf_counter() - start
+        return self._collector.close()
+
+
+def default_backend() -> str:
+    """
+    Escolhe o parser HTML: WEBSCRAP_HTML_PARSER, se definido, senão lxml
+    quando disponível e html.parser como alternativa.
+
+    Returns:
+        str: Nome do parser
+    """
+    configured = os.getenv("WEBSCRAP_HTML_PARSER")
+    if configured:
+        return configured
+    return "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+
+@dataclass
+class ParsedHTML:
+    """
+    Resultado da extração de uma página.
+
+    Attributes:
+        text: Texto visível, limitado ao orçamento de caracteres
+        links: Links encontrados, como pares (href, texto do link)
+        canonical: URL canônica declarada, se houver
+        parse_seconds: Tempo de CPU gasto no parser
+    """
+    text: str = ""
+    links: List[Tuple[str, str]] = field(default_factory=list)
+    canonical: Optional[str] = None
+    parse_seconds: float = 0.0
+
+    @classmethod
+    def of(cls, extractor: TextExtractor, text: str) -> "ParsedHTML":
+        return cls(text, extractor.links, extractor.canonical, extractor.parse_seconds)
+
+
+def parse_html(
+    html: str,
+    max_chars: int = CONTENT_CHAR_BUDGET,
+    collect_links: bool = False,
+    backend: Optional[str] = None,
+) -> ParsedHTML:
+    """
+    Extrai texto (e, se pedido, links) de um documento HTML já baixado,
+    parando no orçamento. Pode rodar em outro processo (argumentos e
+    resultado são serializáveis).
+
+    Args:
+        html: Documento HTML
+        max_chars: Orçamento de caracteres de texto a extrair
+        collect_links: Coleta os links e a leitura continua depois do orçamento
+        backend: Parser a usar (padrão: default_backend())
+
+    Returns:
+        ParsedHTML: Texto, links e URL canônica
+    """
+    extractor = TextExtractor(max_chars, backend, collect_links)
+    for start in range(0, len(html), FEED_SIZE):
+        extractor.feed(html[start:start + FEED_SIZE])
+        if extractor.done:
+            break
+    text = extractor.text()
+    return ParsedHTML.of(extractor, text)
+
+
+def extract_text(
+    html: str, max_chars: int = CONTENT_CHAR_BUDGET, backend: Optional[str] = None
+) -> str:
+    """
+    Extrai o texto visível de um documento HTML já baixado, parando no
+    orçamento de caracteres.
+
+    Args:
+        html: Documento HTML
+        max_chars: Orçamento de caracteres de texto a extrair
+        backend: Parser a usar (padrão: default_backend())
+
+    Returns:
+        str: Texto extraído
+    """
+    return parse_html(html, max_chars, backend=backend).text
@@ -0,0 +1,306 @@
+"""
+Camada de download de páginas para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém o cliente HTTP assíncrono compartilhado usado pelos
+nós do grafo. Um único pool de conexões (keep-alive, HTTP/2 quando o
+pacote h2 está instalado) é reaproveitado por todo o processo, com limite
+de requisições simultâneas por host e leitura em streaming que para assim
+que já há conteúdo suficiente.
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Dict, Mapping, Optional, TypeVar
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import httpx
+
+T = TypeVar("T")
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; WebScrapAgent/1.0)",
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+}
+
+
+@dataclass
+class FetchResult:
+    """
+    Resultado do download de uma página.
+
+    Attributes:
+        url: URL final, após redirecionamentos
+        status_code: Código HTTP da resposta (0 quando houve exceção)
+        text: HTML lido (possivelmente truncado em max_chars)
+        headers: Cabeçalhos da resposta
+        error: Mensagem de exceção, se houver
+        truncated: True se a leitura parou antes do fim do corpo
+    """
+    url: str
+    status_code: int = 0
+    text: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status_code == 200
+
+
+class AsyncFetcher:
+    """
+    Cliente HTTP assíncrono com pool de conexões compartilhado.
+
+    O cliente vive em um event loop próprio, executado em uma thread de
+    fundo. Assim o mesmo pool (conexões abertas, sessões TLS e resolução
+    DNS já feitas) é reaproveitado tanto por chamadas síncronas dos nós
+    quanto por corrotinas de qualquer outro event loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        per_host_limit: int = 6,
+        timeout: float = 10.0,
+        max_chars: int = 500_000,
+        http2: Optional[bool] = None,
+    ):
+        """
+        Args:
+            max_connections: Máximo de conexões abertas no pool
+            max_keepalive_connections: Conexões ociosas mantidas abertas
+            per_host_limit: Máximo de requisições simultâneas por host
+            timeout: Timeout de cada requisição, em segundos
+            max_chars: Máximo de caracteres de HTML lidos por página
+            http2: Habilita HTTP/2 (padrão: apenas se h2 estiver instalado)
+        """
+        if http2 is None:
+            http2 = importlib.util.find_spec("h2") is not None
+        self.per_host_limit = per_host_limit
+        self.max_chars = max_chars
+        self._client_kwargs = {
+            "http2": http2,
+            "timeout": timeout,
+            "follow_redirects": True,
+            "headers": DEFAULT_HEADERS,
+        }
+        self._limits = {
+            "max_connections": max_connections,
+            "max_keepalive_connections": max_keepalive_connections,
+        }
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Inicia (uma única vez) o event loop de fundo do cliente.
+
+        Returns:
+            asyncio.AbstractEventLoop: Loop onde o pool de conexões vive
+        """
+        if self._loop is None:
+            with self._start_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    thread = threading.Thread(
+                        target=loop.run_forever, name="fetcher-loop", daemon=True
+                    )
+                    thread.start()
+                    self._thread = thread
+                    self._loop = loop
+        return self._loop
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def _fetch(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]],
+        max_chars: int,
+        extractor: Optional[Any] = None,
+    ) -> FetchResult:
+        """
+        Executa o download dentro do loop de fundo.
+
+        Args:
+            url: URL a ser baixada
+            headers: Cabeçalhos extras da requisição
+            max_chars: Máximo de caracteres a ler do corpo
+            extractor: Consumidor incremental (feed/done); quando informado,
+                o HTML é entregue a ele em vez de ser guardado em text
+
+        Returns:
+            FetchResult: Resultado do download
+        """
+        if self._client is None:
+            # Importado no primeiro download: processos que não baixam nada
+            # (CLI de consulta, testes) não pagam a importação do httpx
+            import httpx
+
+            self._client = httpx.AsyncClient(**self._client_kwargs, limits=httpx.Limits(**self._limits))
+
+        try:
+            async with self._host_semaphore(url):
+                async with self._client.stream("GET", url, headers=headers) as response:
+                    result = FetchResult(
+                        url=str(response.url),
+                        status_code=response.status_code,
+                        headers=dict(response.headers),
+                    )
+                    if response.status_code != 200:
+                        return result
+
+                    # Lê em streaming e para assim que há conteúdo suficiente
+                    parts = []
+                    size = 0
+                    chunks = response.aiter_text()
+                    try:
+                        async for chunk in chunks:
+                            size += len(chunk)
+                            if extractor is not None:
+                                extractor.feed(chunk)
+                                if extractor.done:
+                                    result.truncated = True
+                                    break
+                            else:
+                                parts.append(chunk)
+                            if size >= max_chars:
+                                result.truncated = True
+                                break
+                    finally:
+                        await chunks.aclose()
+                    result.text = "".join(parts)[:max_chars]
+                    return result
+        except Exception as e:
+            return FetchResult(url=url, error=str(e))
+
+    async def fetch(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        max_chars: Optional[int] = None,
+        extractor: Optional[Any] = None,
+    ) -> FetchResult:
+        """
+        Baixa uma página a partir de qualquer event loop.
+
+        Args:
+            url: URL a ser baixada
+            headers: Cabeçalhos extras da requisição
+            max_chars: Máximo de caracteres a ler (padrão: self.max_chars)
+            extractor: Consumidor incremental do HTML (ver _fetch)
+
+        Returns:
+            FetchResult: Resultado do download
+        """
+        return await self.arun(self._fetch(url, headers, max_chars or self.max_chars, extractor))
+
+    async def arun(self, coro: Awaitable[T]) -> T:
+        """
+        Executa uma corrotina no loop do fetcher a partir de qualquer event
+        loop (versão assíncrona de run).
+
+        Args:
+            coro: Corrotina a executar
+
+        Returns:
+            T: Valor retornado pela corrotina
+        """
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def fetch_sync(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        max_chars: Optional[int] = None,
+        extractor: Optional[Any] = None,
+    ) -> FetchResult:
+        """
+        Versão bloqueante de fetch, para os nós síncronos do grafo.
+
+        Args:
+            url: URL a ser baixada
+            headers: Cabeçalhos extras da requisição
+            max_chars: Máximo de caracteres a ler (padrão: self.max_chars)
+            extractor: Consumidor incremental do HTML (ver _fetch)
+
+        Returns:
+            FetchResult: Resultado do download
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("fetch_sync não pode ser chamado no loop do fetcher")
+        loop = self._ensure_loop()
+        coro = self._fetch(url, headers, max_chars or self.max_chars, extractor)
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """
+        Executa uma corrotina no loop do fetcher e aguarda o resultado.
+        Permite que etapas com vários downloads concorrentes (como o
+        crawler) rodem inteiramente no loop onde o pool vive.
+
+        Args:
+            coro: Corrotina a executar
+
+        Returns:
+            T: Valor retornado pela corrotina
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("run não pode ser chamado no loop do fetcher")
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def close(self) -> None:
+        """
+        Fecha o pool de conexões e encerra o loop de fundo.
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result()
+            self._client = None
+        asyncio.run_coroutine_threadsafe(loop.shutdown_asyncgens(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+        self._thread = None
+        self._host_semaphores.clear()
+
+
+_default_fetcher: Optional[AsyncFetcher] = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> AsyncFetcher:
+    """
+    Retorna o fetcher compartilhado pelo processo.
+
+    Returns:
+        AsyncFetcher: Instância única, criada no primeiro uso
+    """
+    global _default_fetcher
+    if _default_fetcher is None:
+        with _default_fetcher_lock:
+            if _default_fetcher is None:
+                _default_fetcher = AsyncFetcher()
+                atexit.register(_default_fetcher.close)
+    return _default_fetcher
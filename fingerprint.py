@@ -0,0 +1,98 @@
+"""
+Impressões digitais de conteúdo para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém as funções que resumem o texto coletado de um site
+em duas impressões digitais: um hash exato do texto normalizado e um
+SimHash de 64 bits, que muda pouco quando o texto muda pouco. Elas
+permitem reconhecer um site sem mudanças (ou com mudanças triviais, como
+datas e contadores) e reaproveitar a avaliação anterior.
+"""
+
+import hashlib
+import re
+from typing import List
+
+# Tamanho dos grupos de palavras (shingles) usados no SimHash
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"\w+")
+_DIGITS = re.compile(r"\d+")
+
+
+def normalize_text(text: str) -> List[str]:
+    """
+    Normaliza o texto para comparação: minúsculas, sem pontuação e com
+    números trocados por 0 (anos, preços e contadores mudam sem que o
+    negócio mude).
+
+    Args:
+        text: Texto coletado do site
+
+    Returns:
+        List[str]: Palavras normalizadas
+    """
+    return _WORD.findall(_DIGITS.sub("0", text.lower()))
+
+
+def content_hash(text: str) -> str:
+    """
+    Hash exato do texto normalizado.
+
+    Args:
+        text: Texto coletado do site
+
+    Returns:
+        str: SHA-256 em hexadecimal
+    """
+    return hashlib.sha256(" ".join(normalize_text(text)).encode("utf-8")).hexdigest()
+
+
+def simhash(text: str) -> int:
+    """
+    SimHash de 64 bits sobre grupos de SHINGLE_SIZE palavras.
+
+    Args:
+        text: Texto coletado do site
+
+    Returns:
+        int: Impressão digital (textos parecidos diferem em poucos bits)
+    """
+    words = normalize_text(text)
+    if len(words) < SHINGLE_SIZE:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+    # Contadores "fatiados por bit": counters[i] guarda o bit i da contagem
+    # de uns de cada uma das 64 colunas, somados com propagação de vai-um
+    counters: List[int] = []
+    for shingle in shingles:
+        carry = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        level = 0
+        while carry:
+            if level == len(counters):
+                counters.append(0)
+            counters[level], carry = counters[level] ^ carry, counters[level] & carry
+            level += 1
+
+    # Cada bit do resultado é o voto da maioria na sua coluna
+    fingerprint = 0
+    for bit in range(64):
+        ones = sum((counter >> bit & 1) << level for level, counter in enumerate(counters))
+        if ones * 2 > len(shingles):
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    Número de bits diferentes entre duas impressões digitais.
+
+    Args:
+        a: Primeira impressão digital
+        b: Segunda impressão digital
+
+    Returns:
+        int: Distância de Hamming
+    """
+    return bin(a ^ b).count("1")
@@ -1,6 +1,16 @@
-import streamlit as st
+import io
 import time
-from backend import process_url 
+from datetime import datetime
+from typing import List
+import streamlit as st
+from backend import stream_url
+from comparison import CANCELLED, DONE, FAILED, FINISHED, QUEUED, RUNNING, STORED, Comparison
+from constants import COMPARISON_MAX_URLS, RESULT_MAX_AGE
+from crawler import canonicalize
+from jobs import get_job_queue
+from result_store import get_result_store
+from structured import partial_field
+from url_lists import read_url_stream, split_url_text
 from streamlit_extras.switch_page_button import switch_page
 import streamlit.components.v1 as components
 
@@ -59,6 +69,9 @@ def side_navbar():
     2. Clique em "Processar"
     3. Aguarde a análise completa
     4. Veja a avaliação detalhada
+
+    Para comparar concorrentes, escolha "Comparar URLs" e cole a lista
+    (ou envie um CSV): a tabela é preenchida à medida que cada site termina.
     """)
     
     st.sidebar.markdown("### ⚠️ Avisos:")
@@ -71,151 +84,572 @@ def side_navbar():
     st.sidebar.markdown("<div style='margin-top: 50px;'></div>", unsafe_allow_html=True)
     
     if st.sidebar.button("🗑️ Limpar histórico", use_container_width=True):
-        st.cache_data.clear()
+        get_result_store().clear()
+        st.session_state.pop("history_page", None)
         st.rerun()
 
-# Configurar a barra lateral
-side_navbar()
+# Avaliações por página do histórico
+HISTORY_PAGE_SIZE = 10
 
-# Título principal
-st.title("🔗 AI Agent - Avaliação de Negócios")
-st.markdown("### Analise startups e ideias de negócio com inteligência artificial")
-st.markdown("---")
+HISTORY_ORDER_LABELS = {
+    "recent": "Mais recentes",
+    "rating": "Maior nota",
+    "relevance": "Relevância",
+}
+
+# Mensagens de status exibidas enquanto cada nó do grafo executa
+NODE_STATUS = {
+    "step_fetch": "📡 Lendo as páginas do site...",
+    "step_descriptor": "📄 Descrevendo o negócio...",
+    "step_decision": "🤖 Avaliando se há informações suficientes...",
+    "step_reflect": "🤖 Avaliando e gerando insights...",
+    "step_think_more": "💭 Gerando insights...",
+    "step_insight": "💭 Gerando insights...",
+    "step_trends": "📈 Atualizando tendências de mercado...",
+    "step_trends_final": "📈 Atualizando tendências de mercado...",
+    "step_finalize": "📊 Finalizando avaliação...",
+    "step_persist": "💾 Guardando avaliação...",
+}
+
+
+def render_stream(events) -> dict:
+    """
+    Exibe o progresso real da análise a partir dos eventos de stream_url.
+    
+    A descrição, cada insight e o resumo final aparecem à medida que o
+    modelo os gera.
+    
+    Args:
+        events: Iterador de eventos produzido por stream_url
+        
+    Returns:
+        dict: Resultado final da análise
+    """
+    status_text = st.empty()
+    status_text.text("📡 Conectando com o site...")
+    
+    with st.container(border=True):
+        st.subheader("📝 Descrição do Negócio")
+        description_area = st.empty()
+    
+    with st.container(border=True):
+        st.subheader("💡 Insights")
+        insights_area = st.empty()
+        live_insight_area = st.empty()
+    
+    with st.container(border=True):
+        st.subheader("📈 Tendências de Mercado")
+        trends_area = st.empty()
+    
+    with st.container(border=True):
+        st.subheader("📊 Avaliação Final")
+        final_area = st.empty()
+    
+    buffers = {}
+    result = None
+    for event in events:
+        if event["type"] == "token":
+            node = event["node"]
+            text = buffers.get(event["message_id"], "") + event["delta"]
+            buffers[event["message_id"]] = text
+            status_text.text(NODE_STATUS.get(node, "🤖 Analisando com IA..."))
+            
+            if node == "step_descriptor":
+                description_area.markdown(text)
+            elif node == "step_finalize":
+                # A avaliação chega como JSON: mostra o resumo enquanto é gerado
+                final_area.markdown(partial_field(text, "resumo"))
+            elif node in ("step_trends", "step_trends_final"):
+                trends_area.markdown(text)
+            elif node == "step_reflect":
+                insight = partial_field(text, "insight")
+                if insight:
+                    live_insight_area.markdown(f"_{insight}_")
+            elif node != "step_decision":
+                live_insight_area.markdown(f"_{text}_")
+        
+        elif event["type"] == "node":
+            update = event["update"]
+            status_text.text(NODE_STATUS.get(event["node"], "🤖 Analisando com IA..."))
+            if update.get("descricao"):
+                description_area.markdown(update["descricao"])
+            if update.get("pensamentos"):
+                insights_area.markdown(
+                    "\n\n".join(
+                        f"**{i}.** {thought}" for i, thought in enumerate(update["pensamentos"], 1)
+                    )
+                )
+                live_insight_area.empty()
+            if update.get("tendencias_mercado"):
+                trends_area.markdown(update["tendencias_mercado"])
+        
+        elif event["type"] == "result":
+            result = event["result"]
+    
+    status_text.text("✅ Análise concluída!")
+    return result
+
+
+def render_result(result: dict):
+    """
+    Exibe o resultado completo de uma análise.
+    
+    Args:
+        result: Resultado retornado pelo backend
+    """
+    st.header("📊 Resultado da Análise")
+    
+    # Layout em duas colunas
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        # Descrição
+        with st.container(border=True):
+            st.subheader("📝 Descrição do Negócio")
+            st.write(result["descriptor"])
+        
+        # Insights
+        if result["thoughts"]:
+            with st.container(border=True):
+                st.subheader("💡 Insights Detalhados")
+                for i, thought in enumerate(result["thoughts"], 1):
+                    st.write(f"**{i}.** {thought}")
+        
+        # Tendências de mercado
+        if result["market_trends"]:
+            with st.container(border=True):
+                st.subheader("📈 Tendências de Mercado")
+                st.write(result["market_trends"])
+    
+    with col2:
+        # Avaliação final
+        with st.container(border=True):
+            st.subheader("⭐ Avaliação Final")
+            
+            # Métrica da nota
+            rating = result["rating"]
+            if rating >= 8:
+                st.metric("Nota", f"{rating}/10", delta="Excelente", delta_color="normal")
+            elif rating >= 6:
+                st.metric("Nota", f"{rating}/10", delta="Bom", delta_color="normal")
+            elif rating >= 4:
+                st.metric("Nota", f"{rating}/10", delta="Regular", delta_color="off")
+            else:
+                st.metric("Nota", f"{rating}/10", delta="Ruim", delta_color="inverse")
+            
+            # Resposta final
+            if result["final_answer"]:
+                st.markdown("**Resumo:**")
+                st.write(result["final_answer"])
+            
+            if result.get("reused"):
+                st.caption("♻️ Conteúdo sem mudanças desde a última análise; avaliação reaproveitada.")
 
-# Seção principal do formulário
-with st.form(key='url_form'):
-    st.subheader("📝 Insira uma URL para análise")
+def render_history():
+    """
+    Exibe o histórico de avaliações guardadas, com busca por texto,
+    filtros e paginação feitos no armazenamento (só a página atual é lida).
+    """
+    st.subheader("📚 Histórico de Análises")
     
-    # Campo de entrada de URL
-    url_input = st.text_input(
-        "URL da página",
-        placeholder="https://exemplo.com",
-        help="Cole a URL da página web da startup que você deseja analisar.",
-        label_visibility="collapsed"
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        query = st.text_input(
+            "Buscar",
+            placeholder="Buscar na descrição, nos insights e no resumo...",
+            label_visibility="collapsed",
+        )
+    with col2:
+        order = st.selectbox(
+            "Ordenar por",
+            list(HISTORY_ORDER_LABELS),
+            format_func=HISTORY_ORDER_LABELS.get,
+            label_visibility="collapsed",
+        )
+    with col3:
+        min_rating = st.slider("Nota mínima", 0, 10, 0)
+    
+    # Uma nova busca volta para a primeira página
+    filters = (query, order, min_rating)
+    if st.session_state.get("history_filters") != filters:
+        st.session_state["history_filters"] = filters
+        st.session_state["history_page"] = 0
+    page = st.session_state.get("history_page", 0)
+    
+    entries, total = get_result_store().search(
+        query, min_rating=min_rating, order=order, limit=HISTORY_PAGE_SIZE, offset=page * HISTORY_PAGE_SIZE
     )
+    if not total:
+        st.caption("Nenhuma análise encontrada.")
+        return
     
-    # Botão de submissão do formulário
-    col1, col2, col3 = st.columns([1, 1, 1])
+    for entry in entries:
+        result = entry.to_result()
+        when = datetime.fromtimestamp(entry.created_at).strftime("%d/%m/%Y %H:%M")
+        with st.expander(f"⭐ {result['rating']}/10 · {entry.url} · {when}"):
+            if entry.snippet:
+                st.markdown(f"…{entry.snippet}…")
+            render_result(result)
+    
+    pages = (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+    col1, col2, col3 = st.columns([1, 2, 1])
+    # A página muda antes da próxima execução do script (on_click)
+    with col1:
+        st.button(
+            "⬅️ Anteriores",
+            disabled=page == 0,
+            use_container_width=True,
+            on_click=st.session_state.__setitem__,
+            args=("history_page", page - 1),
+        )
     with col2:
-        submit_button = st.form_submit_button(
-            label='🚀 Processar Análise', 
+        st.caption(f"Página {page + 1} de {pages} · {total} análises")
+    with col3:
+        st.button(
+            "Próximas ➡️",
+            disabled=page + 1 >= pages,
             use_container_width=True,
-            type="primary"
+            on_click=st.session_state.__setitem__,
+            args=("history_page", page + 1),
+        )
+
+SINGLE_MODE = "🔗 Uma URL"
+COMPARISON_MODE = "📊 Comparar URLs"
+
+# Rótulos dos estados de cada URL da comparação
+COMPARISON_STATUS = {
+    QUEUED: "⏳ Na fila",
+    RUNNING: "🤖 Analisando",
+    DONE: "✅ Concluída",
+    STORED: "⚡ Do histórico",
+    FAILED: "❌ Erro",
+    CANCELLED: "🚫 Cancelada",
+}
+
+COMPARISON_ORDER_LABELS = {
+    "input": "Ordem de entrada",
+    "rating": "Maior nota",
+}
+
+
+def parse_url_list(text: str, upload=None) -> List[str]:
+    """
+    Lê as URLs coladas e as do arquivo enviado, sem repetições.
+    
+    Args:
+        text: URLs separadas por linha ou espaço (vírgula e ponto e vírgula
+            também separam, quando seguidos de outra URL)
+        upload: Arquivo enviado (CSV com coluna "url" ou uma URL por linha)
+    
+    Returns:
+        List[str]: URLs normalizadas (com esquema), na ordem original
+    """
+    urls = read_url_stream(io.StringIO("\n".join(split_url_text(text))))
+    if upload is not None:
+        input_format = "csv" if upload.name.lower().endswith(".csv") else "lines"
+        # utf-8-sig: planilhas exportadas costumam começar com BOM
+        urls += read_url_stream(io.StringIO(upload.getvalue().decode("utf-8-sig")), input_format)
+    return list(dict.fromkeys(urls))
+
+
+def render_comparison_form():
+    """
+    Exibe o formulário do modo de comparação e começa a avaliação das
+    URLs enviadas em segundo plano (a comparação fica em session_state).
+    """
+    with st.form(key="comparison_form"):
+        st.subheader("📝 Insira as URLs para comparar")
+    
+        urls_text = st.text_area(
+            "URLs",
+            placeholder="https://exemplo.com\nhttps://concorrente.com",
+            help="Uma URL por linha (ou separadas por vírgula).",
+            label_visibility="collapsed",
+        )
+    
+        upload = st.file_uploader(
+            "Ou envie um arquivo",
+            type=["csv", "txt"],
+            help="CSV com uma coluna \"url\" (ou com as URLs na primeira coluna), ou um texto com uma URL por linha.",
+        )
+    
+        force_refresh = st.checkbox(
+            "🔄 Forçar nova análise",
+            help="Ignora as avaliações guardadas no histórico e analisa todos os sites de novo.",
         )
+    
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col2:
+            submit_button = st.form_submit_button(
+                label="🚀 Comparar",
+                use_container_width=True,
+                type="primary"
+            )
+    
+    if not submit_button:
+        return
+    urls = parse_url_list(urls_text, upload)
+    if not urls:
+        st.warning("⚠️ Por favor, insira ao menos uma URL válida.")
+        return
+    if len(urls) > COMPARISON_MAX_URLS:
+        st.warning(f"⚠️ Serão comparadas só as primeiras {COMPARISON_MAX_URLS} de {len(urls)} URLs.")
+        urls = urls[:COMPARISON_MAX_URLS]
+    
+    # Uma nova comparação substitui a anterior, que deixa de rodar
+    previous = st.session_state.get("comparison")
+    if previous is not None:
+        previous.cancel_all()
+    st.session_state["comparison"] = Comparison(urls, force_refresh=force_refresh).start()
+
+
+def render_comparison(comparison: Comparison):
+    """
+    Exibe a tabela de comparação, o cancelamento das URLs pendentes e o
+    resultado completo de uma URL escolhida.
+    
+    Args:
+        comparison: Comparação em andamento ou concluída
+    """
+    st.subheader("📊 Comparação")
+    
+    rows = comparison.rows()
+    done = sum(row["status"] in FINISHED for row in rows)
+    st.progress(done / len(rows), text=f"{done} de {len(rows)} URLs concluídas")
+    
+    order = st.selectbox(
+        "Ordenar por",
+        list(COMPARISON_ORDER_LABELS),
+        format_func=COMPARISON_ORDER_LABELS.get,
+        key="comparison_order",
+    )
+    if order == "rating":
+        # Sem nota (ainda rodando, com erro ou cancelada) vai para o fim
+        rows = sorted(rows, key=lambda row: -1 if row["rating"] is None else row["rating"], reverse=True)
+    
+    st.dataframe(
+        [
+            {
+                "URL": row["url"],
+                "Status": COMPARISON_STATUS[row["status"]],
+                "Nota": row["rating"],
+                "Descrição": row["descriptor"] or row["error"] or "",
+                "Tendências": row["market_trends"],
+                "Tempo (s)": None if row["seconds"] is None else round(row["seconds"], 1),
+            }
+            for row in rows
+        ],
+        column_config={
+            "URL": st.column_config.LinkColumn("URL"),
+            "Nota": st.column_config.ProgressColumn("Nota", min_value=0, max_value=10, format="%d"),
+            "Descrição": st.column_config.TextColumn("Descrição", width="large"),
+            "Tendências": st.column_config.TextColumn("Tendências", width="large"),
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+    
+    # Container sempre presente: quando as URLs terminam e o cancelamento
+    # some, os elementos abaixo não mudam de posição (o expander segue aberto)
+    cancel_area = st.container()
+    pending = [row["index"] for row in rows if row["status"] not in FINISHED]
+    if pending:
+        with cancel_area:
+            col1, col2, col3 = st.columns([3, 1, 1])
+            with col1:
+                index = st.selectbox(
+                    "URL a cancelar",
+                    pending,
+                    index=_kept_selection("comparison_cancel", pending),
+                    format_func=lambda index: comparison.items[index].url,
+                    key="comparison_cancel",
+                    label_visibility="collapsed",
+                )
+            # O cancelamento acontece antes da próxima execução (on_click)
+            with col2:
+                st.button("🚫 Cancelar", use_container_width=True, on_click=comparison.cancel, args=(index,))
+            with col3:
+                st.button("🚫 Cancelar todas", use_container_width=True, on_click=comparison.cancel_all)
+    
+    evaluated = [row["index"] for row in rows if row["rating"] is not None]
+    if evaluated:
+        index = st.selectbox(
+            "Ver análise completa",
+            evaluated,
+            index=_kept_selection("comparison_detail", evaluated),
+            format_func=lambda index: comparison.items[index].url,
+            key="comparison_detail",
+        )
+        with st.expander("📄 Análise completa", expanded=False):
+            render_result(comparison.items[index].result)
+
+
+def _kept_selection(key: str, options: List[int]) -> int:
+    # As opções mudam a cada URL concluída, e com elas a identidade do
+    # widget: a escolha anterior é mantida enquanto ainda for uma opção
+    selected = st.session_state.get(key)
+    return options.index(selected) if selected in options else 0
+
+
+@st.fragment(run_every=1.0)
+def render_comparison_live(comparison: Comparison):
+    """
+    Atualiza a comparação a cada segundo, sem executar o resto do script.
+    
+    Args:
+        comparison: Comparação em andamento
+    """
+    render_comparison(comparison)
+    if comparison.finished:
+        # Execução completa: a tabela final deixa de ser atualizada
+        st.rerun()
+
+# Configurar a barra lateral
+side_navbar()
+
+# Título principal
+st.title("🔗 AI Agent - Avaliação de Negócios")
+st.markdown("### Analise startups e ideias de negócio com inteligência artificial")
+st.markdown("---")
 
-# Lógica de processamento do formulário
-if submit_button:
-    if not url_input:
-        st.warning("⚠️ Por favor, insira uma URL válida.")
-    else:
-        # Validação básica de URL
-        if not url_input.startswith(('http://', 'https://')):
-            url_input = 'https://' + url_input
+# Uma URL por vez ou várias URLs lado a lado
+mode = st.radio(
+    "Modo",
+    [SINGLE_MODE, COMPARISON_MODE],
+    horizontal=True,
+    label_visibility="collapsed",
+)
+
+if mode == COMPARISON_MODE:
+    render_comparison_form()
+    comparison = st.session_state.get("comparison")
+    if comparison is not None:
+        st.markdown("---")
+        if comparison.finished:
+            render_comparison(comparison)
+        else:
+            render_comparison_live(comparison)
+
+else:
+    # Seção principal do formulário
+    with st.form(key='url_form'):
+        st.subheader("📝 Insira uma URL para análise")
         
-        st.info(f"🔍 Analisando a URL: {url_input}")
+        # Campo de entrada de URL
+        url_input = st.text_input(
+            "URL da página",
+            placeholder="https://exemplo.com",
+            help="Cole a URL da página web da startup que você deseja analisar.",
+            label_visibility="collapsed"
+        )
         
-        # Container para mostrar o progresso
-        progress_container = st.container()
+        background = st.checkbox(
+            "⏳ Processar em segundo plano",
+            help="Envia a URL para a fila de avaliações. O resultado sobrevive a uma "
+                 "atualização da página; requer workers (`python -m jobs worker`).",
+        )
         
-        with progress_container:
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            # Simular progresso
-            for i in range(100):
-                progress_bar.progress(i + 1)
-                if i < 20:
-                    status_text.text("📡 Conectando com o site...")
-                elif i < 40:
-                    status_text.text("📄 Extraindo conteúdo...")
-                elif i < 60:
-                    status_text.text("🤖 Analisando com IA...")
-                elif i < 80:
-                    status_text.text("💭 Gerando insights...")
-                else:
-                    status_text.text("📊 Finalizando avaliação...")
-                time.sleep(0.05)
-            
-            status_text.text("✅ Análise concluída!")
+        force_refresh = st.checkbox(
+            "🔄 Forçar nova análise",
+            help="Ignora a avaliação guardada no histórico e analisa o site de novo.",
+        )
         
-        # Processar com o backend real
-        try:
-            with st.spinner("🔄 Processando análise completa..."):
-                result = process_url(url_input)
-            
-            # Limpar o container de progresso
-            progress_container.empty()
-            
-            st.success("🎉 Análise concluída com sucesso!")
-            st.markdown("---")
+        # Botão de submissão do formulário
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col2:
+            submit_button = st.form_submit_button(
+                label='🚀 Processar Análise', 
+                use_container_width=True,
+                type="primary"
+            )
+    
+    # Lógica de processamento do formulário
+    if submit_button:
+        if not url_input:
+            st.warning("⚠️ Por favor, insira uma URL válida.")
+        else:
+            # Validação básica de URL
+            if not url_input.startswith(('http://', 'https://')):
+                url_input = 'https://' + url_input
             
-            # Exibição dos resultados
-            st.header("📊 Resultado da Análise")
+            # Avaliação recente da mesma URL: exibida na hora, sem baixar o site
+            stored = None if force_refresh else get_result_store().latest(canonicalize(url_input))
+            if stored is not None and time.time() - stored.created_at > RESULT_MAX_AGE:
+                stored = None
             
-            # Layout em duas colunas
-            col1, col2 = st.columns([2, 1])
+            if background and stored is None:
+                # O id do job fica na URL da página e sobrevive a uma atualização
+                st.query_params["job"] = get_job_queue().submit(url_input, force_refresh=force_refresh)
+                st.rerun()
             
-            with col1:
-                # Descrição
-                with st.container(border=True):
-                    st.subheader("📝 Descrição do Negócio")
-                    st.write(result["descriptor"])
-                
-                # Insights
-                if result["thoughts"]:
-                    with st.container(border=True):
-                        st.subheader("💡 Insights Detalhados")
-                        for i, thought in enumerate(result["thoughts"], 1):
-                            st.write(f"**{i}.** {thought}")
+            if stored is not None:
+                when = datetime.fromtimestamp(stored.created_at).strftime("%d/%m/%Y %H:%M")
+                st.success(f"⚡ Análise de {when} recuperada do histórico.")
+                st.caption("Marque \"Forçar nova análise\" para avaliar o site de novo.")
+                st.markdown("---")
+                render_result(stored.to_result())
+            else:
+                st.info(f"🔍 Analisando a URL: {url_input}")
                 
-                # Tendências de mercado
-                if result["market_trends"]:
-                    with st.container(border=True):
-                        st.subheader("📈 Tendências de Mercado")
-                        st.write(result["market_trends"])
-            
-            with col2:
-                # Avaliação final
-                with st.container(border=True):
-                    st.subheader("⭐ Avaliação Final")
+                # Processar com o backend real, exibindo o progresso à medida que chega
+                try:
+                    live_container = st.empty()
+                    with live_container.container():
+                        result = render_stream(stream_url(url_input, force_refresh=force_refresh))
                     
-                    # Métrica da nota
-                    rating = result["rating"]
-                    if rating >= 8:
-                        st.metric("Nota", f"{rating}/10", delta="Excelente", delta_color="normal")
-                    elif rating >= 6:
-                        st.metric("Nota", f"{rating}/10", delta="Bom", delta_color="normal")
-                    elif rating >= 4:
-                        st.metric("Nota", f"{rating}/10", delta="Regular", delta_color="off")
-                    else:
-                        st.metric("Nota", f"{rating}/10", delta="Ruim", delta_color="inverse")
+                    # Substitui a visualização parcial pelo resultado completo
+                    live_container.empty()
                     
-                    # Resposta final
-                    if result["final_answer"]:
-                        st.markdown("**Resumo:**")
-                        st.write(result["final_answer"])
-            
-            # Seção de ações
+                    st.success("🎉 Análise concluída com sucesso!")
+                    st.markdown("---")
+                    
+                    render_result(result)
+                    
+                    # Seção de ações
+                    st.markdown("---")
+                    
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.markdown(" ")
+                    
+                    with col2:
+                        if st.button("🔄 Nova Análise", use_container_width=True):
+                            st.rerun()
+                    
+                    with col3:
+                        st.markdown(" ")
+                
+                except Exception as e:
+                    st.error("❌ Erro ao processar a análise.")
+                    st.exception(e)
+                    
+                    # Botão para tentar novamente
+                    if st.button("🔄 Tentar Novamente"):
+                        st.rerun()
+    
+    # Acompanhamento de uma avaliação em segundo plano
+    elif "job" in st.query_params:
+        queue = get_job_queue()
+        job = queue.get(st.query_params["job"])
+        if job is None:
+            st.warning("⚠️ Avaliação não encontrada na fila.")
+        elif job.status == "done":
+            st.success(f"🎉 Análise de {job.url} concluída!")
             st.markdown("---")
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.markdown(" ")
-            
-            with col2:
-                if st.button("🔄 Nova Análise", use_container_width=True):
-                    st.rerun()
-            
-            with col3:
-                st.markdown(" ")
-        
-        except Exception as e:
-            st.error("❌ Erro ao processar a análise.")
-            st.exception(e)
-            
-            # Botão para tentar novamente
-            if st.button("🔄 Tentar Novamente"):
-                st.rerun()
+            render_result(job.result)
+        elif job.status == "failed":
+            st.error(f"❌ Erro ao processar {job.url}: {job.error}")
+        else:
+            status = "na fila" if job.status == "queued" else "em andamento"
+            st.info(f"⏳ Análise de {job.url} {status} (tentativa {max(job.attempts, 1)}).")
+            if not queue.active_workers():
+                st.warning("⚠️ Nenhum worker ativo. Inicie com `python -m jobs worker`.")
+            time.sleep(2)
+            st.rerun()
+
+# Histórico de avaliações guardadas
+st.markdown("---")
+render_history()
 
 # Rodapé
 st.markdown("---")
@@ -0,0 +1,449 @@
+"""
+Instrumentação do AI Agent - Avaliação de Negócios
+
+Este arquivo contém a medição de tempo e de tokens de cada etapa da
+avaliação: nós do grafo, chamadas ao modelo, downloads e extração de
+texto. Cada execução acumula um RunTrace (anexado ao resultado de
+process_url) e todas as medições alimentam métricas agregadas do
+processo, exportáveis no formato texto do Prometheus ou em JSON lines.
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Limites (em segundos) dos buckets dos histogramas de duração
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class Span:
+    """
+    Medição de uma etapa.
+
+    Attributes:
+        kind: Tipo da etapa ("node", "llm", "fetch", "parse" ou "store")
+        name: Nome da etapa (nó do grafo, em geral)
+        wall_ms: Duração em milissegundos
+        node: Nó do grafo em que a etapa ocorreu
+        model: Modelo usado (chamadas ao LLM)
+        prompt_tokens: Tokens de entrada (chamadas ao LLM)
+        completion_tokens: Tokens de saída (chamadas ao LLM)
+        cache_hit: True se a etapa foi atendida por um cache
+        queue_ms: Espera no escalonador antes da chamada ao LLM
+        fallback: True se a chamada foi para um modelo de reserva
+        batch: Itens da requisição em lote da qual a chamada fez parte
+            (tokens e tempo são a parcela do item)
+        error: Mensagem de erro, se a etapa falhou
+    """
+    kind: str
+    name: str
+    wall_ms: float = 0.0
+    node: Optional[str] = None
+    model: Optional[str] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    cache_hit: Optional[bool] = None
+    queue_ms: Optional[float] = None
+    fallback: Optional[bool] = None
+    batch: Optional[int] = None
+    error: Optional[str] = None
+
+    def compact(self) -> Dict[str, Any]:
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+class RunTrace:
+    """
+    Medições de uma execução do grafo.
+    """
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def usage(self) -> Tuple[float, int]:
+        """
+        Consumo da execução até agora.
+
+        Returns:
+            Tuple[float, int]: Segundos desde o início e tokens do modelo
+                (entrada e saída)
+        """
+        with self._lock:
+            tokens = sum(
+                (span.prompt_tokens or 0) + (span.completion_tokens or 0)
+                for span in self.spans if span.kind == "llm"
+            )
+        return time.perf_counter() - self.started, tokens
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Resumo compacto da execução.
+
+        Returns:
+            Dict[str, Any]: Tempo total, agregados por nó, por tipo de
+                chamada externa e a lista de etapas
+        """
+        with self._lock:
+            spans = list(self.spans)
+
+        by_kind: Dict[str, Dict[str, Any]] = {}
+        for span in spans:
+            entry = by_kind.setdefault(span.kind, {"calls": 0, "ms": 0.0})
+            entry["calls"] += 1
+            entry["ms"] += span.wall_ms
+            if span.cache_hit:
+                entry["cache_hits"] = entry.get("cache_hits", 0) + 1
+            if span.prompt_tokens is not None:
+                entry["prompt_tokens"] = entry.get("prompt_tokens", 0) + span.prompt_tokens
+            if span.completion_tokens is not None:
+                entry["completion_tokens"] = entry.get("completion_tokens", 0) + span.completion_tokens
+
+        nodes: Dict[str, Dict[str, Any]] = {}
+        for span in spans:
+            if span.kind == "node":
+                entry = nodes.setdefault(span.name, {"calls": 0, "ms": 0.0})
+                entry["calls"] += 1
+                entry["ms"] += span.wall_ms
+
+        # Chamadas ao modelo por modelo, com o tempo de cada nó em cada um
+        models: Dict[str, Dict[str, Any]] = {}
+        for span in spans:
+            if span.kind != "llm":
+                continue
+            entry = models.setdefault(span.model or "", {"calls": 0, "ms": 0.0, "nodes": {}})
+            entry["calls"] += 1
+            entry["ms"] += span.wall_ms
+            entry["nodes"][span.name] = entry["nodes"].get(span.name, 0.0) + span.wall_ms
+            for key, value in (
+                ("prompt_tokens", span.prompt_tokens),
+                ("completion_tokens", span.completion_tokens),
+                ("errors", 1 if span.error else None),
+                ("fallbacks", 1 if span.fallback else None),
+                ("batched", 1 if span.batch else None),
+            ):
+                if value is not None:
+                    entry[key] = entry.get(key, 0) + value
+
+        for entry in list(by_kind.values()) + list(nodes.values()):
+            entry["ms"] = round(entry["ms"], 1)
+        for entry in models.values():
+            entry["ms"] = round(entry["ms"], 1)
+            entry["nodes"] = {name: round(ms, 1) for name, ms in entry["nodes"].items()}
+
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "nodes": nodes,
+            "calls": {kind: entry for kind, entry in by_kind.items() if kind != "node"},
+            "models": models,
+            "spans": [span.compact() for span in spans],
+        }
+
+
+class Metrics:
+    """
+    Métricas agregadas do processo: histogramas de duração e contadores
+    de tokens e acertos de cache, rotulados por tipo, nome e modelo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._tokens: Dict[Tuple[str, str, str], int] = {}
+        self._cache_hits: Dict[Tuple[str, str], int] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._fallbacks: Dict[Tuple[str, str], int] = {}
+        self._runs = 0
+
+    def observe(self, span: Span) -> None:
+        """
+        Registra uma etapa nas métricas agregadas.
+
+        Args:
+            span: Etapa medida
+        """
+        seconds = span.wall_ms / 1000
+        key = (span.kind, span.name, span.model or "")
+        with self._lock:
+            histogram = self._histograms.setdefault(
+                key, {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0}
+            )
+            for i, limit in enumerate(LATENCY_BUCKETS):
+                if seconds <= limit:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+            for token_type, value in (("prompt", span.prompt_tokens), ("completion", span.completion_tokens)):
+                if value:
+                    token_key = (span.name, span.model or "", token_type)
+                    self._tokens[token_key] = self._tokens.get(token_key, 0) + value
+            if span.cache_hit:
+                self._cache_hits[(span.kind, span.name)] = self._cache_hits.get((span.kind, span.name), 0) + 1
+            if span.error:
+                self._errors[(span.kind, span.name)] = self._errors.get((span.kind, span.name), 0) + 1
+            if span.fallback:
+                fallback_key = (span.name, span.model or "")
+                self._fallbacks[fallback_key] = self._fallbacks.get(fallback_key, 0) + 1
+
+    def count_run(self) -> None:
+        with self._lock:
+            self._runs += 1
+
+    def to_prometheus(self) -> str:
+        """
+        Exporta as métricas no formato texto do Prometheus.
+
+        Returns:
+            str: Métricas prontas para um endpoint /metrics
+        """
+        lines = [
+            "# HELP webscrap_runs_total Avaliações executadas",
+            "# TYPE webscrap_runs_total counter",
+        ]
+        with self._lock:
+            lines.append(f"webscrap_runs_total {self._runs}")
+
+            lines.append("# HELP webscrap_step_seconds Duração das etapas da avaliação")
+            lines.append("# TYPE webscrap_step_seconds histogram")
+            for (kind, name, model), histogram in sorted(self._histograms.items()):
+                labels = f'kind="{kind}",name="{name}",model="{model}"'
+                for limit, count in zip(LATENCY_BUCKETS, histogram["buckets"]):
+                    lines.append(f'webscrap_step_seconds_bucket{{{labels},le="{limit}"}} {count}')
+                lines.append(f'webscrap_step_seconds_bucket{{{labels},le="+Inf"}} {histogram["count"]}')
+                lines.append(f"webscrap_step_seconds_sum{{{labels}}} {histogram['sum']:.6f}")
+                lines.append(f"webscrap_step_seconds_count{{{labels}}} {histogram['count']}")
+
+            lines.append("# HELP webscrap_llm_tokens_total Tokens enviados e recebidos do modelo")
+            lines.append("# TYPE webscrap_llm_tokens_total counter")
+            for (name, model, token_type), value in sorted(self._tokens.items()):
+                lines.append(
+                    f'webscrap_llm_tokens_total{{name="{name}",model="{model}",type="{token_type}"}} {value}'
+                )
+
+            lines.append("# HELP webscrap_cache_hits_total Etapas atendidas por cache")
+            lines.append("# TYPE webscrap_cache_hits_total counter")
+            for (kind, name), value in sorted(self._cache_hits.items()):
+                lines.append(f'webscrap_cache_hits_total{{kind="{kind}",name="{name}"}} {value}')
+
+            lines.append("# HELP webscrap_step_errors_total Etapas que terminaram com erro")
+            lines.append("# TYPE webscrap_step_errors_total counter")
+            for (kind, name), value in sorted(self._errors.items()):
+                lines.append(f'webscrap_step_errors_total{{kind="{kind}",name="{name}"}} {value}')
+
+            lines.append("# HELP webscrap_llm_fallbacks_total Chamadas atendidas por um modelo de reserva")
+            lines.append("# TYPE webscrap_llm_fallbacks_total counter")
+            for (name, model), value in sorted(self._fallbacks.items()):
+                lines.append(f'webscrap_llm_fallbacks_total{{name="{name}",model="{model}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def to_json_lines(self) -> str:
+        """
+        Exporta as métricas como JSON lines (um objeto por série).
+
+        Returns:
+            str: Uma linha JSON por histograma/contador
+        """
+        records = []
+        with self._lock:
+            records.append({"metric": "runs_total", "value": self._runs})
+            for (kind, name, model), histogram in sorted(self._histograms.items()):
+                records.append({
+                    "metric": "step_seconds",
+                    "kind": kind,
+                    "name": name,
+                    "model": model,
+                    "count": histogram["count"],
+                    "sum": round(histogram["sum"], 6),
+                    "buckets": dict(zip(map(str, LATENCY_BUCKETS), histogram["buckets"])),
+                })
+            for (name, model, token_type), value in sorted(self._tokens.items()):
+                records.append({
+                    "metric": "llm_tokens_total",
+                    "name": name,
+                    "model": model,
+                    "type": token_type,
+                    "value": value,
+                })
+            for (kind, name), value in sorted(self._cache_hits.items()):
+                records.append({"metric": "cache_hits_total", "kind": kind, "name": name, "value": value})
+            for (kind, name), value in sorted(self._errors.items()):
+                records.append({"metric": "step_errors_total", "kind": kind, "name": name, "value": value})
+            for (name, model), value in sorted(self._fallbacks.items()):
+                records.append({"metric": "llm_fallbacks_total", "name": name, "model": model, "value": value})
+        return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+
+metrics = Metrics()
+
+_current_trace: ContextVar[Optional[RunTrace]] = ContextVar("run_trace", default=None)
+_current_node: ContextVar[Optional[str]] = ContextVar("run_node", default=None)
+
+
+@contextmanager
+def track_run() -> Iterator[RunTrace]:
+    """
+    Coleta as medições de uma execução do grafo.
+
+    Se WEBSCRAP_TRACE_JSONL estiver definido, o resumo de cada execução é
+    acrescentado a esse arquivo.
+
+    Yields:
+        RunTrace: Medições da execução, preenchidas no lugar
+    """
+    trace = RunTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        metrics.count_run()
+        path = os.getenv("WEBSCRAP_TRACE_JSONL")
+        if path:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(trace.summary(), ensure_ascii=False) + "\n")
+
+
+def current_trace() -> Optional[RunTrace]:
+    """
+    Medições da execução corrente (None fora de track_run).
+
+    Returns:
+        Optional[RunTrace]: Execução corrente
+    """
+    return _current_trace.get()
+
+
+def current_node() -> Optional[str]:
+    """
+    Nó do grafo em execução (None fora de um nó).
+
+    Returns:
+        Optional[str]: Nome do nó
+    """
+    return _current_node.get()
+
+
+@contextmanager
+def span(kind: str, name: Optional[str] = None, **attrs: Any) -> Iterator[Span]:
+    """
+    Mede uma etapa e a registra na execução corrente e nas métricas.
+
+    Atributos como tokens e acerto de cache podem ser preenchidos no
+    objeto devolvido antes do fim do bloco.
+
+    Args:
+        kind: Tipo da etapa ("node", "llm", "fetch", "parse" ou "store")
+        name: Nome da etapa (padrão: nó corrente)
+        **attrs: Atributos iniciais do Span
+
+    Yields:
+        Span: Medição em andamento
+    """
+    node = _current_node.get()
+    current = Span(kind=kind, name=name or node or kind, node=node, **attrs)
+    start = time.perf_counter()
+    try:
+        yield current
+    except Exception as e:
+        current.error = str(e)
+        raise
+    finally:
+        current.wall_ms = (time.perf_counter() - start) * 1000
+        record(current)
+
+
+def record(current: Span, aggregate: bool = True) -> None:
+    """
+    Registra uma etapa já medida (por exemplo, tempo acumulado de parse).
+
+    Args:
+        current: Etapa medida
+        aggregate: Se False, a etapa entra só na execução corrente, não nas
+            métricas do processo (a parcela de uma chamada compartilhada,
+            já contada uma vez nas métricas)
+    """
+    if current.node is None:
+        current.node = _current_node.get()
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(current)
+    if aggregate:
+        metrics.observe(current)
+
+
+@contextmanager
+def detached() -> Iterator[RunTrace]:
+    """
+    As etapas medidas no bloco vão para as métricas do processo e para um
+    trace à parte, fora da execução corrente: uma chamada feita em nome de
+    várias execuções (ver batching.py) é registrada em cada uma com a sua
+    parcela.
+
+    Yields:
+        RunTrace: Medições do bloco
+    """
+    token = _current_trace.set(RunTrace())
+    try:
+        yield _current_trace.get()
+    finally:
+        _current_trace.reset(token)
+
+
+def traced_node(fn: Callable) -> Callable:
+    """
+    Decorador que mede a duração de um nó do grafo. O nome usado é o do
+    nó no grafo (metadado langgraph_node), já que a mesma função pode
+    aparecer com nomes diferentes.
+
+    Args:
+        fn: Função do nó, com parâmetros (state) ou (state, config)
+
+    Returns:
+        Callable: Nó instrumentado
+    """
+    accepts_config = "config" in inspect.signature(fn).parameters
+
+    @functools.wraps(fn)
+    def wrapper(state, config=None):
+        metadata = (config or {}).get("metadata") or {}
+        name = metadata.get("langgraph_node", fn.__name__)
+        token = _current_node.set(name)
+        try:
+            with span("node", name):
+                return fn(state, config) if accepts_config else fn(state)
+        finally:
+            _current_node.reset(token)
+    return wrapper
+
+
+def export_prometheus() -> str:
+    """
+    Métricas agregadas do processo no formato texto do Prometheus.
+
+    Returns:
+        str: Texto de exposição
+    """
+    return metrics.to_prometheus()
+
+
+def export_json_lines() -> str:
+    """
+    Métricas agregadas do processo em JSON lines.
+
+    Returns:
+        str: Uma linha JSON por série
+    """
+    return metrics.to_json_lines()
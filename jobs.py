@@ -0,0 +1,593 @@
+"""
+Fila de avaliações para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém a fila durável de avaliações (SQLite) e os workers que
+a consomem em processos separados. Cada URL vira um job identificado pelo
+hash da URL canônica e da configuração do grafo, de modo que reenviar a
+mesma URL não duplica trabalho. O grafo de cada job guarda um checkpoint a cada nó concluído:
+se o worker cair no meio, o job volta para a fila depois do prazo de
+posse e outro worker o retoma a partir do último nó concluído.
+
+Uso:
+    python -m jobs worker [-n 2]
+    python -m jobs submit https://exemplo.com [--wait]
+    python -m jobs status [JOB_ID ...]
+    python -m jobs result JOB_ID
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from constants import CACHE_DIR, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, JOB_WORKERS, RESULT_MAX_AGE
+from crawler import canonicalize
+
+# Estados de um job
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_JOB_COLUMNS = (
+    "id, url, mode, force_refresh, status, attempts, run, result, error, "
+    "worker, created_at, updated_at"
+)
+
+
+@dataclass
+class Job:
+    """
+    Avaliação enfileirada.
+
+    Attributes:
+        id: Identificador (hash da URL canônica e da configuração)
+        url: URL a ser avaliada
+        mode: Configuração do grafo
+        force_refresh: Se True, não reaproveita avaliações anteriores
+        status: "queued", "running", "done" ou "failed"
+        attempts: Tentativas feitas na execução corrente
+        run: Número da execução (cada reenvio de um job terminado soma 1)
+        result: Resultado no formato de process_url, quando "done"
+        error: Último erro, se houver
+        worker: Worker que executou (ou executa) o job
+        created_at: Momento (epoch) do primeiro envio
+        updated_at: Momento (epoch) da última mudança de estado
+    """
+    id: str
+    url: str
+    mode: str
+    force_refresh: bool
+    status: str
+    attempts: int
+    run: int
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    worker: Optional[str]
+    created_at: float
+    updated_at: float
+
+    @property
+    def thread_id(self) -> str:
+        """Identificador dos checkpoints da execução corrente."""
+        return f"{self.id}:{self.run}"
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Job":
+        values = list(row)
+        values[3] = bool(values[3])
+        values[7] = json.loads(values[7]) if values[7] else None
+        return cls(*values)
+
+
+def job_id(url: str, mode: str = "default") -> str:
+    """
+    Identificador do job de uma URL.
+
+    Args:
+        url: URL a ser avaliada
+        mode: Configuração do grafo
+
+    Returns:
+        str: Hash da configuração e da URL canônica (16 caracteres
+            hexadecimais)
+    """
+    return hashlib.sha256(f"{mode} {canonicalize(url)}".encode("utf-8")).hexdigest()[:16]
+
+
+class JobQueue:
+    """
+    Fila durável em um arquivo SQLite (modo WAL), compartilhada por todos
+    os processos: a interface e a linha de comando enviam jobs e
+    consultam resultados, os workers os executam.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Caminho do arquivo SQLite
+        """
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    mode TEXT NOT NULL,
+                    force_refresh INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    run INTEGER NOT NULL DEFAULT 1,
+                    result TEXT,
+                    error TEXT,
+                    worker TEXT,
+                    lease_until REAL NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS workers (id TEXT PRIMARY KEY, last_seen REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(
+        self,
+        url: str,
+        mode: str = "default",
+        force_refresh: bool = False,
+        max_age: float = RESULT_MAX_AGE,
+    ) -> str:
+        """
+        Envia uma URL para avaliação.
+
+        O envio é idempotente: se a URL já está na fila ou em execução com
+        a mesma configuração, o job existente é devolvido; se já terminou
+        com sucesso há no máximo max_age segundos, o resultado guardado
+        vale (a menos que force_refresh peça uma nova execução). Jobs que
+        falharam ou com resultado antigo voltam para a fila.
+
+        Args:
+            url: URL a ser avaliada
+            mode: Configuração do grafo ("default", "parallel" ou "merged")
+            force_refresh: Se True, avalia de novo mesmo que o job já tenha
+                terminado ou que o conteúdo não tenha mudado
+            max_age: Idade máxima, em segundos, do resultado de um job
+                concluído
+
+        Returns:
+            str: Identificador do job
+        """
+        identifier = job_id(url, mode)
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO jobs (id, url, mode, force_refresh, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (identifier, url, mode, int(force_refresh), QUEUED, now, now),
+            )
+            # Nova execução de um job terminado: checkpoints e tentativas zerados
+            conn.execute(
+                "UPDATE jobs SET status = ?, url = ?, force_refresh = ?, attempts = 0, "
+                "run = run + 1, result = NULL, error = NULL, worker = NULL, updated_at = ? "
+                "WHERE id = ? AND (status = ? OR (status = ? AND (? OR updated_at < ?)))",
+                (QUEUED, url, int(force_refresh), now, identifier, FAILED, DONE,
+                 int(force_refresh), now - max_age),
+            )
+        return identifier
+
+    def get(self, identifier: str) -> Optional[Job]:
+        """
+        Consulta um job.
+
+        Args:
+            identifier: Identificador do job
+
+        Returns:
+            Optional[Job]: Job encontrado ou None
+        """
+        with self._connection() as conn:
+            row = conn.execute(f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (identifier,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[Job]:
+        """
+        Lista os jobs mais recentes.
+
+        Args:
+            status: Se informado, apenas jobs nesse estado
+            limit: Número máximo de jobs
+
+        Returns:
+            List[Job]: Jobs do mais recente para o mais antigo
+        """
+        query = f"SELECT {_JOB_COLUMNS} FROM jobs"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += " ORDER BY updated_at DESC LIMIT ?"
+        with self._connection() as conn:
+            rows = conn.execute(query, params + (limit,)).fetchall()
+        return [Job.from_row(row) for row in rows]
+
+    def wait(self, identifier: str, timeout: Optional[float] = None, poll_interval: float = 1.0) -> Optional[Job]:
+        """
+        Espera um job terminar.
+
+        Args:
+            identifier: Identificador do job
+            timeout: Prazo em segundos (None para esperar indefinidamente)
+            poll_interval: Intervalo entre consultas, em segundos
+
+        Returns:
+            Optional[Job]: Estado do job ao terminar (ou ao fim do prazo)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(identifier)
+            if job is None or job.finished:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            time.sleep(poll_interval)
+
+    def claim(self, worker: str, lease: float = JOB_LEASE_SECONDS, max_attempts: int = JOB_MAX_ATTEMPTS) -> Optional[Job]:
+        """
+        Toma posse do job mais antigo da fila. Jobs em execução cujo prazo
+        de posse venceu (worker que caiu) também são retomados.
+
+        Args:
+            worker: Identificador do worker
+            lease: Prazo de posse em segundos, renovado por heartbeat
+            max_attempts: Tentativas antes de o job ser dado como falho
+
+        Returns:
+            Optional[Job]: Job tomado ou None se a fila está vazia
+        """
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = COALESCE(error, 'Prazo de posse vencido'), "
+                "updated_at = ? WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (FAILED, now, RUNNING, now, max_attempts),
+            )
+            # Uma única instrução: dois workers nunca tomam o mesmo job
+            row = conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, lease_until = ?, "
+                "updated_at = ? WHERE id = (SELECT id FROM jobs WHERE status = ? "
+                "OR (status = ? AND lease_until < ?) ORDER BY created_at LIMIT 1) "
+                f"RETURNING {_JOB_COLUMNS}",
+                (RUNNING, worker, now + lease, now, QUEUED, RUNNING, now),
+            ).fetchone()
+        return Job.from_row(row) if row else None
+
+    def heartbeat(self, worker: str, identifier: Optional[str] = None, lease: float = JOB_LEASE_SECONDS) -> None:
+        """
+        Registra que o worker está vivo e renova a posse do seu job.
+
+        Args:
+            worker: Identificador do worker
+            identifier: Job em execução pelo worker, se houver
+            lease: Novo prazo de posse em segundos
+        """
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO workers (id, last_seen) VALUES (?, ?)", (worker, now))
+            if identifier:
+                conn.execute(
+                    "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = ?",
+                    (now + lease, identifier, worker, RUNNING),
+                )
+
+    def complete(self, job: Job, result: Dict[str, Any]) -> None:
+        """
+        Marca um job como concluído e guarda o resultado.
+
+        Args:
+            job: Job tomado pelo worker
+            result: Resultado no formato de process_url
+        """
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? "
+                "WHERE id = ? AND run = ? AND status = ?",
+                (DONE, json.dumps(result, ensure_ascii=False), result.get("error"),
+                 time.time(), job.id, job.run, RUNNING),
+            )
+
+    def fail(self, job: Job, error: str, max_attempts: int = JOB_MAX_ATTEMPTS) -> None:
+        """
+        Registra uma falha. O job volta para a fila (e é retomado do último
+        checkpoint) até esgotar as tentativas.
+
+        Args:
+            job: Job tomado pelo worker
+            error: Descrição do erro
+            max_attempts: Tentativas antes de o job ser dado como falho
+        """
+        status = FAILED if job.attempts >= max_attempts else QUEUED
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_until = 0, updated_at = ? "
+                "WHERE id = ? AND run = ? AND status = ?",
+                (status, error, time.time(), job.id, job.run, RUNNING),
+            )
+
+    def release(self, job: Job) -> None:
+        """
+        Devolve um job interrompido à fila sem contar a tentativa.
+
+        Args:
+            job: Job tomado pelo worker
+        """
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts - 1, lease_until = 0, updated_at = ? "
+                "WHERE id = ? AND run = ? AND status = ?",
+                (QUEUED, time.time(), job.id, job.run, RUNNING),
+            )
+
+    def active_workers(self, within: float = 2 * JOB_LEASE_SECONDS) -> int:
+        """
+        Número de workers com sinal de vida recente.
+
+        Args:
+            within: Janela em segundos
+
+        Returns:
+            int: Workers ativos
+        """
+        with self._connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM workers WHERE last_seen >= ?", (time.time() - within,)
+            ).fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Contagem de jobs por estado e de workers ativos.
+
+        Returns:
+            Dict[str, int]: Contadores
+        """
+        stats = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        with self._connection() as conn:
+            for status, count in conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+                stats[status] = count
+        stats["workers"] = self.active_workers()
+        return stats
+
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Retorna a fila de avaliações do processo (arquivo em CACHE_DIR).
+
+    Returns:
+        JobQueue: Fila configurada
+    """
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = JobQueue(os.path.join(CACHE_DIR, "jobs.sqlite"))
+    return _job_queue
+
+
+def set_job_queue(queue: JobQueue) -> None:
+    """
+    Substitui a fila de avaliações do processo.
+
+    Args:
+        queue: Nova instância
+    """
+    global _job_queue
+    with _job_queue_lock:
+        _job_queue = queue
+
+
+def _checkpointer(path: str):
+    """
+    Checkpointer SQLite compartilhado pelas threads do worker.
+
+    Args:
+        path: Caminho do arquivo SQLite dos checkpoints
+
+    Returns:
+        SqliteSaver: Checkpointer do LangGraph
+    """
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return SqliteSaver(conn)
+
+
+def work(
+    queue: Optional[JobQueue] = None,
+    worker: Optional[str] = None,
+    checkpoint_path: Optional[str] = None,
+    poll_interval: float = 1.0,
+    max_jobs: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+) -> int:
+    """
+    Laço de um worker: toma jobs da fila e executa cada um com checkpoints.
+
+    Args:
+        queue: Fila (padrão: get_job_queue())
+        worker: Identificador do worker (padrão: host:pid)
+        checkpoint_path: Arquivo dos checkpoints (padrão: CACHE_DIR/checkpoints.sqlite)
+        poll_interval: Espera entre consultas quando a fila está vazia
+        max_jobs: Se informado, termina depois desse número de jobs
+        stop: Evento que encerra o laço entre um job e outro
+
+    Returns:
+        int: Número de jobs executados
+    """
+    from backend import process_checkpointed
+
+    queue = queue or get_job_queue()
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    checkpointer = _checkpointer(checkpoint_path or os.path.join(CACHE_DIR, "checkpoints.sqlite"))
+    stop = stop or threading.Event()
+    done = 0
+
+    while not stop.is_set() and (max_jobs is None or done < max_jobs):
+        queue.heartbeat(worker)
+        job = queue.claim(worker)
+        if job is None:
+            stop.wait(poll_interval)
+            continue
+
+        # Renova a posse enquanto o grafo executa
+        running = threading.Event()
+
+        def _keepalive(identifier: str = job.id) -> None:
+            while not running.wait(JOB_LEASE_SECONDS / 3):
+                queue.heartbeat(worker, identifier)
+
+        keepalive = threading.Thread(target=_keepalive, daemon=True)
+        keepalive.start()
+        try:
+            result = process_checkpointed(
+                job.url, job.thread_id, checkpointer, mode=job.mode, force_refresh=job.force_refresh
+            )
+        except KeyboardInterrupt:
+            queue.release(job)
+            raise
+        except Exception as e:
+            queue.fail(job, f"Exception: {str(e)}")
+        else:
+            queue.complete(job, result)
+            checkpointer.delete_thread({"configurable": {"thread_id": job.thread_id}})
+        finally:
+            running.set()
+            keepalive.join()
+        done += 1
+    return done
+
+
+def _worker_main(poll_interval: float) -> None:
+    try:
+        work(poll_interval=poll_interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_workers(count: int = JOB_WORKERS, poll_interval: float = 1.0) -> None:
+    """
+    Sobe count processos worker e espera por eles (Ctrl+C encerra todos;
+    os jobs interrompidos voltam para a fila).
+
+    Args:
+        count: Número de processos
+        poll_interval: Espera entre consultas quando a fila está vazia
+    """
+    # "spawn": cada worker começa sem as threads (event loop, pools) do pai
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_worker_main, args=(poll_interval,), name=f"webscrap-worker-{i}")
+        for i in range(count)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Repassa a interrupção (os workers devolvem seus jobs à fila) e
+        # encerra à força quem não terminar a tempo
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGINT)
+        for process in processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+
+
+def _print_job(job: Job) -> None:
+    rating = f" nota {job.result['rating']}" if job.result and "rating" in job.result else ""
+    error = f" ({job.error})" if job.error else ""
+    print(f"{job.id}  {job.status:<8} {job.url}{rating}{error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker_parser = commands.add_parser("worker", help="Executa workers")
+    worker_parser.add_argument("-n", "--workers", type=int, default=JOB_WORKERS, help="Número de processos")
+    worker_parser.add_argument("--poll-interval", type=float, default=1.0)
+
+    submit_parser = commands.add_parser("submit", help="Envia URLs para avaliação")
+    submit_parser.add_argument("urls", nargs="+")
+    submit_parser.add_argument("--mode", default="default", help="Configuração do grafo")
+    submit_parser.add_argument("--force-refresh", action="store_true", help="Avalia de novo")
+    submit_parser.add_argument("--wait", action="store_true", help="Espera os jobs terminarem")
+
+    status_parser = commands.add_parser("status", help="Estado dos jobs")
+    status_parser.add_argument("ids", nargs="*")
+
+    result_parser = commands.add_parser("result", help="Resultado de um job (JSON)")
+    result_parser.add_argument("id")
+
+    args = parser.parse_args()
+    queue = get_job_queue()
+
+    if args.command == "worker":
+        run_workers(args.workers, args.poll_interval)
+    elif args.command == "submit":
+        ids = [queue.submit(url, args.mode, args.force_refresh) for url in args.urls]
+        for identifier in ids:
+            job = queue.wait(identifier) if args.wait else queue.get(identifier)
+            _print_job(job)
+    elif args.command == "status":
+        jobs = [queue.get(identifier) for identifier in args.ids] if args.ids else queue.list()
+        for job in jobs:
+            if job is not None:
+                _print_job(job)
+        print(json.dumps(queue.stats()), file=sys.stderr)
+    elif args.command == "result":
+        job = queue.get(args.id)
+        if job is None or job.status != DONE:
+            print(f"job {args.id}: {job.status if job else 'não encontrado'}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(job.result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Cache de respostas do modelo para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém o cache em disco das respostas do LLM, plugado no
+modelo compartilhado através da interface BaseCache do LangChain. A chave
+combina o modelo e seus parâmetros (incluindo a temperatura) com o hash
+do prompt, de modo que reavaliar um site sem mudanças não repete nenhuma
+chamada paga ao provedor.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+from constants import CACHE_DIR, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL
+
+# Contadores da execução corrente e flag para ignorar o cache
+_run_stats: ContextVar[Tuple[Dict[str, int], ...]] = ContextVar("llm_cache_run_stats", default=())
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def track_llm_cache() -> Iterator[Dict[str, int]]:
+    """
+    Conta os acertos e erros do cache durante um bloco de execução. Os
+    blocos podem ser aninhados (por execução e por chamada, por exemplo).
+
+    Yields:
+        Dict[str, int]: Contadores "hits" e "misses", atualizados no lugar
+    """
+    stats = {"hits": 0, "misses": 0}
+    token = _run_stats.set(_run_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _run_stats.reset(token)
+
+
+@contextmanager
+def bypass_llm_cache(enabled: bool = True) -> Iterator[None]:
+    """
+    Ignora o cache nas consultas feitas dentro do bloco. As respostas novas
+    continuam sendo gravadas.
+
+    Args:
+        enabled: Se False, o bloco não altera o comportamento do cache
+    """
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def cache_bypassed() -> bool:
+    """
+    Se as consultas ao cache estão sendo ignoradas (bypass_llm_cache).
+
+    Returns:
+        bool: True dentro de um bloco bypass_llm_cache ativo
+    """
+    return _bypass.get()
+
+
+def _count(name: str) -> None:
+    for stats in _run_stats.get():
+        stats[name] += 1
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    Cache de respostas do LLM em SQLite, com validade (TTL) e limite de
+    entradas com remoção LRU.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = LLM_CACHE_TTL,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Args:
+            path: Caminho do arquivo SQLite
+            ttl: Validade de cada resposta, em segundos
+            max_entries: Número máximo de respostas guardadas
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    generations TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        """
+        Chave da resposta: o llm_string descreve o modelo e seus parâmetros
+        (modelo, temperatura, etc.) e o prompt entra apenas pelo seu hash.
+
+        Args:
+            prompt: Prompt serializado pelo LangChain
+            llm_string: Identificação do modelo e de seus parâmetros
+
+        Returns:
+            str: Chave hexadecimal
+        """
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{llm_string}\x00{prompt_hash}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        if _bypass.get():
+            _count("misses")
+            return None
+
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT generations FROM responses WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                _count("misses")
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+
+        _count("hits")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            return loads(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (self._key(prompt, llm_string), dumps(list(return_val)), now + self.ttl, now),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """
+        Remove respostas expiradas e, se necessário, as menos usadas.
+
+        Args:
+            conn: Conexão com a transação corrente
+        """
+        conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+_response_cache: Optional[BaseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[BaseCache]:
+    """
+    Retorna o cache de respostas do processo.
+
+    O cache fica em CACHE_DIR; defina WEBSCRAP_LLM_CACHE=off para desligá-lo.
+
+    Returns:
+        Optional[BaseCache]: Cache configurado, ou None se desligado
+    """
+    global _response_cache
+    if os.getenv("WEBSCRAP_LLM_CACHE", "on").lower() == "off":
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = SQLiteLLMCache(os.path.join(CACHE_DIR, "llm.sqlite"))
+    return _response_cache
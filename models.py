@@ -0,0 +1,210 @@
+"""
+Roteamento de modelos do AI Agent - Avaliação de Negócios
+
+Este arquivo contém o roteamento das chamadas ao modelo por nó do grafo:
+os nós leves (descrição, decisão, insights e tendências) vão para um
+modelo pequeno e rápido e a avaliação final fica com o modelo principal.
+Cada nó tem uma lista de modelos em ordem de preferência; se uma chamada
+falha (erro do provedor depois das novas tentativas do escalonador ou
+tempo esgotado), a próxima da lista é usada.
+
+Os clientes são criados no primeiro uso de cada modelo, como em get_llm.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from constants import LLM_FAST_MODEL, LLM_MODEL, LLM_ROUTES, LLM_TIMEOUT
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+# Nós atendidos pelo modelo rápido no roteamento padrão
+FAST_NODES = (
+    "step_descriptor",
+    "step_decision",
+    "step_think_more",
+    "step_insight",
+    "step_trends",
+    "step_trends_final",
+    "step_reflect",
+)
+
+# Rota dos nós sem rota própria
+DEFAULT_ROUTE = "*"
+
+
+def groq_model(name: str) -> "BaseChatModel":
+    """
+    Cria o cliente do Groq para um modelo.
+
+    As respostas passam pelo cache em disco, as novas tentativas ficam a
+    cargo do escalonador e o tempo máximo de cada chamada é LLM_TIMEOUT.
+
+    Args:
+        name: Nome do modelo no provedor
+
+    Returns:
+        BaseChatModel: Modelo de chat
+    """
+    from langchain_groq import ChatGroq
+    from llm_cache import get_response_cache
+
+    return ChatGroq(
+        model=name,
+        temperature=0.7,
+        cache=get_response_cache(),
+        max_retries=0,
+        timeout=LLM_TIMEOUT,
+    )
+
+
+def parse_routes(text: str) -> Dict[str, List[str]]:
+    """
+    Lê rotas no formato "nó=modelo,reserva;nó=modelo".
+
+    Args:
+        text: Rotas (por exemplo, de WEBSCRAP_LLM_ROUTES)
+
+    Returns:
+        Dict[str, List[str]]: Modelos em ordem de preferência por nó
+    """
+    routes = {}
+    for item in text.split(";"):
+        if "=" not in item:
+            continue
+        node, models = item.split("=", 1)
+        names = [name.strip() for name in models.split(",") if name.strip()]
+        if names:
+            routes[node.strip()] = names
+    return routes
+
+
+def default_routes() -> Dict[str, List[str]]:
+    """
+    Roteamento padrão: nós leves no modelo rápido (com o principal de
+    reserva), demais nós (a avaliação final) no principal, mais as rotas
+    de WEBSCRAP_LLM_ROUTES.
+
+    Returns:
+        Dict[str, List[str]]: Modelos em ordem de preferência por nó
+    """
+    fast = [LLM_FAST_MODEL, LLM_MODEL] if LLM_FAST_MODEL != LLM_MODEL else [LLM_MODEL]
+    routes = {node: fast for node in FAST_NODES}
+    routes[DEFAULT_ROUTE] = [LLM_MODEL]
+    routes.update(parse_routes(LLM_ROUTES))
+    return routes
+
+
+class ModelRouter:
+    """
+    Escolhe os modelos de cada nó e guarda os clientes já criados.
+
+    Uso:
+        router = ModelRouter({"step_descriptor": ["rapido", "principal"], "*": ["principal"]})
+        for name, model in router.candidates("step_descriptor"):
+            ...
+    """
+
+    def __init__(
+        self,
+        routes: Mapping[str, Sequence[str]],
+        models: Optional[Mapping[str, "BaseChatModel"]] = None,
+        factory: Callable[[str], "BaseChatModel"] = groq_model,
+    ):
+        """
+        Args:
+            routes: Modelos em ordem de preferência por nó ("*" = demais nós)
+            models: Clientes já criados, por nome (por exemplo, modelos falsos)
+            factory: Cria o cliente de um modelo sem cliente
+        """
+        if DEFAULT_ROUTE not in routes:
+            raise ValueError(f"O roteamento precisa da rota {DEFAULT_ROUTE!r}")
+        self.routes = {node: list(names) for node, names in routes.items()}
+        self.factory = factory
+        self._models: Dict[str, "BaseChatModel"] = dict(models or {})
+        self._lock = threading.Lock()
+
+    @classmethod
+    def single(cls, model: "BaseChatModel", name: Optional[str] = None) -> "ModelRouter":
+        """
+        Roteamento com um único modelo para todos os nós.
+
+        Args:
+            model: Modelo
+            name: Nome usado nas medições e na cota do escalonador (padrão:
+                o nome do modelo no provedor ou, sem ele, o da classe)
+
+        Returns:
+            ModelRouter: Roteamento sem reservas
+        """
+        name = name or getattr(model, "model_name", None) or type(model).__name__
+        return cls({DEFAULT_ROUTE: [name]}, models={name: model})
+
+    def route(self, node: Optional[str]) -> List[str]:
+        return self.routes.get(node or DEFAULT_ROUTE) or self.routes[DEFAULT_ROUTE]
+
+    def model(self, name: str) -> "BaseChatModel":
+        """
+        Cliente de um modelo, criado no primeiro uso.
+
+        Args:
+            name: Nome do modelo
+
+        Returns:
+            BaseChatModel: Modelo de chat
+        """
+        model = self._models.get(name)
+        if model is None:
+            with self._lock:
+                model = self._models.get(name)
+                if model is None:
+                    model = self._models[name] = self.factory(name)
+        return model
+
+    def primary(self) -> "BaseChatModel":
+        return self.model(self.routes[DEFAULT_ROUTE][0])
+
+    def candidates(self, node: Optional[str]) -> List[Tuple[str, "BaseChatModel"]]:
+        """
+        Modelos de um nó, em ordem de preferência.
+
+        Args:
+            node: Nome do nó no grafo
+
+        Returns:
+            List[Tuple[str, BaseChatModel]]: Pares (nome, modelo)
+        """
+        return [(name, self.model(name)) for name in self.route(node)]
+
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> ModelRouter:
+    """
+    Retorna o roteamento compartilhado do processo (default_routes()).
+
+    Returns:
+        ModelRouter: Instância única, criada no primeiro uso
+    """
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ModelRouter(default_routes())
+    return _router
+
+
+def set_router(router: ModelRouter) -> None:
+    """
+    Substitui o roteamento do processo. Para uma única execução, use
+    config["configurable"]["router"].
+
+    Args:
+        router: Novo roteamento
+    """
+    global _router
+    with _router_lock:
+        _router = router
@@ -5,98 +5,558 @@ Este arquivo contém todas as funções de processamento que representam
 os nós do grafo LangGraph.
 """
 
-import requests
-from bs4 import BeautifulSoup
-import re
-from typing import List, Dict, Any
-from functools import lru_cache
-from langchain_groq import ChatGroq
-from constants import State
+import time
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Sequence, Tuple, Type, TypeVar, Union
+from constants import (
+    CRAWL_MAX_PAGES,
+    LLM_COMPLETION_TOKENS_ESTIMATE,
+    PROMPT_INSIGHT_TOKEN_BUDGET,
+    State,
+)
+from batching import DECISION, DESCRIPTOR, PromptBatcher, resolve_batcher
+from content_cache import get_content_cache
+from crawler import canonicalize, crawl_site
+from extractor import TextExtractor
+from fetcher import AsyncFetcher, get_fetcher
+from fingerprint import content_hash, simhash
+from instrumentation import Span, record, span, traced_node
+from models import ModelRouter, get_router, set_router
+from policies import LIMIT, MODEL, POLICY, StopPolicy, record_decision, resolve_policy
+from prompt_context import PromptContext, clip_tokens, content_messages, count_tokens, fold_insights
+from result_store import get_result_store
+from scheduler import get_scheduler
+from semantic_cache import get_semantic_cache
+from structured import Decision, FinalAssessment, Reflection, parse_structured, response_format
 from dotenv import load_dotenv
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.messages import AIMessage, BaseMessage
+    from langchain_core.runnables import RunnableConfig
+else:
+    # O LangGraph só olha o nome do parâmetro config; o tipo real (um
+    # TypedDict) fica para a checagem estática, para não pesar na importação
+    RunnableConfig = Dict[str, Any]
 
 load_dotenv()
 
-# Inicializar o modelo de IA
-llm = ChatGroq(model="openai/gpt-oss-120b", temperature=0.7)
+# Campos do estado guardados com cada avaliação e restaurados ao reaproveitá-la
+RESULT_FIELDS = ("descricao", "pensamentos", "tendencias_mercado", "avaliacao", "resposta_final")
+
+Model = TypeVar("Model", bound=BaseModel)
+
+def get_llm() -> "BaseChatModel":
+    """
+    Retorna o modelo principal do processo (o da avaliação final).
+    
+    O cliente é criado pelo roteamento de modelos (models.get_router()) no
+    primeiro uso: a importação do langchain_groq e a GROQ_API_KEY só são
+    necessárias na primeira chamada ao modelo, de modo que importar nodes
+    ou backend (testes, linha de comando, workers) é rápido.
+    
+    Returns:
+        BaseChatModel: Modelo de chat
+    """
+    return get_router().primary()
+
+
+def set_llm(model: "BaseChatModel") -> None:
+    """
+    Usa um único modelo em todos os nós do processo (por exemplo, o
+    FakeChatModel em testes e benchmarks), sem roteamento. Para trocar o
+    modelo de uma única execução, use config["configurable"]["llm"].
+    
+    Args:
+        model: Novo modelo
+    """
+    set_router(ModelRouter.single(model))
+
+
+def _invoke_llm(
+    prompt: Union[str, Sequence["BaseMessage"]],
+    state: State,
+    config: Optional[RunnableConfig],
+    response_format: Optional[Dict[str, Any]] = None,
+    semantic: Optional[Tuple[str, str]] = None,
+    remember: bool = True,
+) -> "AIMessage":
+    """
+    Chama o modelo do nó corrente, com os modelos de reserva da rota.
+    
+    Os modelos vêm de config["configurable"]["llm"] (um único modelo) ou
+    do roteamento (config["configurable"]["router"], padrão:
+    models.get_router()). Se a chamada a um modelo falha, a próxima da
+    rota é tentada; a última falha é propagada.
+    
+    Args:
+        prompt: Prompt a ser enviado (texto ou mensagens)
+        state: Estado atual do processamento (a URL é a chave de rodízio)
+        config: Configuração da execução repassada pelo LangGraph
+        response_format: Formato de resposta pedido ao provedor (ver
+            structured.response_format)
+        semantic: Tipo da chamada e parte variável do prompt, para
+            consultar e alimentar o cache semântico (None: sem ele)
+        remember: Se False, a resposta nova não é guardada no cache
+            semântico (quem chama a guarda depois de validá-la)
+        
+    Returns:
+        AIMessage: Resposta do modelo (response_metadata["semantic_cache"]
+            é True se ela veio do cache semântico)
+    """
+    if semantic is not None:
+        similar = _semantic_lookup(*semantic, config)
+        if similar is not None:
+            from langchain_core.messages import AIMessage
+            
+            return AIMessage(content=similar, response_metadata={"semantic_cache": True})
+    
+    configurable = (config or {}).get("configurable") or {}
+    if configurable.get("llm") is not None:
+        candidates = [(None, configurable["llm"])]
+    else:
+        node = ((config or {}).get("metadata") or {}).get("langgraph_node")
+        candidates = (configurable.get("router") or get_router()).candidates(node)
+    
+    for attempt, (name, llm) in enumerate(candidates):
+        try:
+            message = _call_model(name, llm, prompt, state, config, response_format, fallback=attempt > 0)
+            break
+        except Exception:
+            if attempt == len(candidates) - 1:
+                raise
+    
+    if semantic is not None and remember:
+        _semantic_add(*semantic, config, message.content)
+    return message
+
+
+def _semantic_namespace(kind: str, config: Optional[RunnableConfig]) -> Tuple[str, Tuple[Any, ...]]:
+    # Respostas de modelos diferentes não se misturam
+    configurable = (config or {}).get("configurable") or {}
+    if configurable.get("llm") is not None:
+        return kind, (id(configurable["llm"]),)
+    node = ((config or {}).get("metadata") or {}).get("langgraph_node")
+    return kind, tuple((configurable.get("router") or get_router()).route(node))
+
+
+def _semantic_lookup(kind: str, text: str, config: Optional[RunnableConfig]) -> Optional[str]:
+    """
+    Resposta de uma chamada do mesmo tipo com prompt quase igual (ver
+    semantic_cache.py), se o cache semântico estiver ligado.
+    
+    Args:
+        kind: Tipo da chamada (inclui a rodada, nos insights e tendências)
+        text: Parte variável do prompt
+        config: Configuração da execução repassada pelo LangGraph
+        
+    Returns:
+        Optional[str]: Resposta guardada, ou None
+    """
+    cache = get_semantic_cache()
+    if cache is None:
+        return None
+    from llm_cache import cache_bypassed
+    
+    # use_llm_cache=False também ignora o cache semântico
+    if cache_bypassed():
+        return None
+    with span("store", "semantic_cache") as cache_span:
+        response = cache.lookup(_semantic_namespace(kind, config), text)
+        cache_span.cache_hit = response is not None
+    return response
+
 
+def _semantic_add(kind: str, text: str, config: Optional[RunnableConfig], response: str) -> None:
+    cache = get_semantic_cache()
+    if cache is not None:
+        cache.add(_semantic_namespace(kind, config), text, response)
 
-@lru_cache(maxsize=100)
-def fetch_website_content(url: str) -> str:
+
+def _call_model(
+    name: Optional[str],
+    llm: "BaseChatModel",
+    prompt: Union[str, Sequence["BaseMessage"]],
+    state: State,
+    config: Optional[RunnableConfig],
+    response_format: Optional[Dict[str, Any]],
+    fallback: bool = False,
+) -> "AIMessage":
+    """
+    Chama um modelo através do escalonador.
+    
+    A chamada entra na fila da URL avaliada, respeita os orçamentos de
+    requisições e tokens por minuto do modelo e é repetida em caso de
+    429/5xx. Respostas vindas do cache devolvem a cota reservada.
+    
+    Args:
+        name: Nome do modelo na rota (None: o informado pelo provedor)
+        llm: Modelo
+        prompt: Prompt a ser enviado (texto ou mensagens)
+        state: Estado atual do processamento
+        config: Configuração da execução repassada pelo LangGraph
+        response_format: Formato de resposta pedido ao provedor
+        fallback: True se é um modelo de reserva da rota
+        
+    Returns:
+        AIMessage: Resposta do modelo
+    """
+    from llm_cache import track_llm_cache
+    
+    if response_format is not None:
+        llm = llm.bind(response_format=response_format)
+    scheduler = get_scheduler(name)
+    estimated = count_tokens(prompt) + LLM_COMPLETION_TOKENS_ESTIMATE
+    
+    with span("llm", model=name, fallback=fallback or None) as llm_span:
+        queued_at = time.perf_counter()
+        
+        def call():
+            llm_span.queue_ms = (time.perf_counter() - queued_at) * 1000
+            with track_llm_cache() as cache_stats:
+                message = llm.invoke(prompt, config=config)
+            return message, cache_stats["hits"] > 0
+        
+        message, cached = scheduler.run(call, key=state["url"], tokens=estimated)
+        usage = getattr(message, "usage_metadata", None) or {}
+        llm_span.cache_hit = cached
+        llm_span.model = name or message.response_metadata.get("model_name")
+        llm_span.prompt_tokens = usage.get("input_tokens")
+        llm_span.completion_tokens = usage.get("output_tokens")
+    
+    scheduler.settle(estimated, usage.get("total_tokens"), cached=cached)
+    return message
+
+
+def _invoke_structured(
+    prompt: Sequence["BaseMessage"],
+    model: Type[Model],
+    state: State,
+    config: Optional[RunnableConfig],
+    semantic: Optional[Tuple[str, str]] = None,
+) -> Tuple[Optional[Model], str]:
+    """
+    Chama o modelo pedindo uma resposta no esquema de `model` e a valida.
+    
+    Args:
+        prompt: Mensagens do prompt (com as instruções do formato JSON)
+        model: Modelo da resposta esperada
+        state: Estado atual do processamento
+        config: Configuração da execução repassada pelo LangGraph
+        semantic: Tipo da chamada e parte variável do prompt, para o cache
+            semântico (ver _invoke_llm); só respostas válidas são guardadas
+        
+    Returns:
+        Tuple[Optional[Model], str]: Resposta validada (None se estiver fora
+            do esquema) e o texto recebido
+    """
+    message = _invoke_llm(prompt, state, config, response_format(model), semantic, remember=False)
+    text = message.content.strip()
+    try:
+        parsed = parse_structured(text, model)
+    except ValueError:
+        return None, text
+    # Só respostas válidas entram no cache semântico
+    if semantic is not None and not message.response_metadata.get("semantic_cache"):
+        _semantic_add(*semantic, config, message.content)
+    return parsed, text
+
+
+def _batcher(config: Optional[RunnableConfig]) -> Optional[PromptBatcher]:
+    configurable = (config or {}).get("configurable") or {}
+    return resolve_batcher(configurable.get("batcher"))
+
+
+def _submit_batch(
+    batcher: PromptBatcher, kind: str, text: str, state: State, config: Optional[RunnableConfig]
+) -> Any:
+    """
+    Põe a chamada do nó em um lote com as de outras execuções simultâneas.
+    
+    Só entram no mesmo lote chamadas do mesmo nó e com o mesmo modelo (ou
+    roteamento) na configuração.
+    
+    Args:
+        batcher: Agrupador
+        kind: Tipo da chamada (batching.DESCRIPTOR ou DECISION)
+        text: Contexto do item no prompt do lote
+        state: Estado atual do processamento
+        config: Configuração da execução repassada pelo LangGraph
+        
+    Returns:
+        Any: Resposta do item, ou None para fazer a chamada individual
+    """
+    configurable = (config or {}).get("configurable") or {}
+    node = ((config or {}).get("metadata") or {}).get("langgraph_node")
+    group = (node, id(configurable.get("llm") or configurable.get("router")))
+    
+    # A requisição do lote atende várias execuções: não leva os callbacks
+    # (streaming) nem os metadados da execução que abriu o lote, só o nó e
+    # os modelos, e tem fila própria no escalonador
+    batch_config: RunnableConfig = {
+        "configurable": {key: configurable[key] for key in ("llm", "router") if key in configurable},
+        "metadata": {"langgraph_node": node},
+    }
+    batch_state = {"url": f"batch:{kind}"}
+    
+    def invoke(prompt: Sequence["BaseMessage"], model: Type[BaseModel]) -> "AIMessage":
+        from langchain_core.runnables.config import var_child_runnable_config
+        
+        # Sem isso, o modelo herda a configuração do nó em execução
+        token = var_child_runnable_config.set(None)
+        try:
+            return _invoke_llm(prompt, batch_state, batch_config, response_format(model))
+        finally:
+            var_child_runnable_config.reset(token)
+    
+    return batcher.submit(kind, text, invoke, group=group)
+
+
+def fetch_website_content(url: str, fetcher: Optional[AsyncFetcher] = None) -> str:
     """
     Extrai o conteúdo textual de uma URL.
     
+    O HTML é processado em streaming pelo TextExtractor, que ignora
+    script/style/nav e interrompe o download ao atingir o orçamento de
+    caracteres. O resultado passa pelo cache de conteúdo em disco:
+    entradas válidas evitam o download, entradas expiradas são
+    revalidadas com If-None-Match/If-Modified-Since e falhas ficam no
+    cache negativo.
+    
     Args:
         url: URL do site a ser analisado
+        fetcher: Cliente HTTP (padrão: get_fetcher())
         
     Returns:
         str: Conteúdo textual extraído do site
     """
-    try:
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
-            text = soup.get_text(separator=" ", strip=True)
-            return text
-        return f"Error: Unable to fetch website content (status {response.status_code})"
-    except Exception as e:
-        return f"Exception: {str(e)}"
+    with span("fetch", "fetch") as fetch_span:
+        text, fetch_span.cache_hit = _fetch_website_content(url, fetcher)
+    return text
+
+
+def _fetch_website_content(url: str, fetcher: Optional[AsyncFetcher] = None) -> Tuple[str, bool]:
+    """
+    Implementação de fetch_website_content.
+    
+    Args:
+        url: URL do site a ser analisado
+        fetcher: Cliente HTTP (padrão: get_fetcher())
+        
+    Returns:
+        Tuple[str, bool]: Conteúdo textual e se ele veio do cache sem
+            download completo (entrada válida ou revalidada com 304)
+    """
+    cache = get_content_cache()
+    entry = cache.get(url)
+    if entry is not None and entry.fresh:
+        return entry.text, True
+    
+    # Revalidação condicional de uma página já conhecida
+    headers = {}
+    if entry is not None and not entry.is_error:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+    
+    extractor = TextExtractor()
+    response = (fetcher or get_fetcher()).fetch_sync(url, headers=headers, extractor=extractor)
+    if response.error is not None:
+        text = f"Exception: {response.error}"
+        cache.set(url, text, is_error=True)
+        return text, False
+    if response.status_code == 304 and headers:
+        cache.refresh(url)
+        return entry.text, True
+    if response.status_code == 200:
+        text = extractor.text()
+        record(Span(kind="parse", name="parse", wall_ms=extractor.parse_seconds * 1000))
+        cache.set(
+            url,
+            text,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+        return text, False
+    
+    text = f"Error: Unable to fetch website content (status {response.status_code})"
+    cache.set(url, text, is_error=True)
+    return text, False
+
+
+@traced_node
+def step_fetch(state: State, config: Optional[RunnableConfig] = None) -> dict:
+    """
+    Nó que coleta o conteúdo do site: a página informada e, com o crawl
+    habilitado, as páginas mais relevantes do mesmo domínio. Se o estado
+    inicial já traz o conteúdo (coletado pelo pipeline), não há download.
+    
+    Em seguida calcula as impressões digitais do conteúdo e, se houver uma
+    avaliação recente da mesma URL sobre um conteúdo igual ou quase igual,
+    restaura essa avaliação (o grafo termina sem chamar o modelo).
+    
+    Opções em config["configurable"]:
+        - crawl_pages: número de páginas (padrão: CRAWL_MAX_PAGES; com 1,
+          apenas a página informada é lida)
+        - force_refresh: True para avaliar de novo mesmo sem mudanças
+        - fetcher: cliente HTTP desta execução (padrão: get_fetcher())
+    
+    Args:
+        state: Estado atual do processamento
+        config: Configuração da execução repassada pelo LangGraph
+        
+    Returns:
+        dict: Estado atualizado com o conteúdo, as impressões digitais e,
+            se reaproveitada, a avaliação anterior
+    """
+    configurable = (config or {}).get("configurable") or {}
+    pages = int(configurable.get("crawl_pages", CRAWL_MAX_PAGES))
+    fetcher = configurable.get("fetcher")
+    if state.get("conteudo"):
+        content = state["conteudo"]
+    elif pages <= 1:
+        content = fetch_website_content(state["url"], fetcher)
+        if not (content.startswith("Error") or content.startswith("Exception")):
+            content = content[:1000]
+    else:
+        content = crawl_site(state["url"], max_pages=pages, fetcher=fetcher)
+    if content.startswith("Error") or content.startswith("Exception"):
+        return {"conteudo": content}
+    
+    update = {"conteudo": content, "impressao": content_hash(content), "simhash": simhash(content)}
+    if not configurable.get("force_refresh", False):
+        with span("store", "result_store") as store_span:
+            stored = get_result_store().match(
+                canonicalize(state["url"]), update["impressao"], update["simhash"]
+            )
+            store_span.cache_hit = stored is not None
+        if stored is not None:
+            update.update({field: stored.result[field] for field in RESULT_FIELDS})
+            update["reutilizado"] = True
+    return update
 
 
-def step_descriptor(state: State) -> dict:
+@traced_node
+def step_descriptor(state: State, config: Optional[RunnableConfig] = None) -> dict:
     """
     Nó que gera uma descrição concisa do site analisado.
     
+    Com o cache semântico ligado (semantic_cache.py), um site com conteúdo
+    quase igual ao de outro já descrito recebe a mesma descrição. Com o
+    agrupamento de prompts ligado (batching.py), a chamada vai em um lote
+    com as descrições de outras URLs avaliadas ao mesmo tempo.
+    
     Args:
         state: Estado atual do processamento
+        config: Configuração da execução repassada pelo LangGraph
         
     Returns:
         dict: Estado atualizado com a descrição
     """
-    content = fetch_website_content(state["url"])
+    content = state["conteudo"]
     if content.startswith("Error") or content.startswith("Exception"):
         return {"descricao": content}
     
-    snippet = content[:1000]
-    prompt = (
-        f"Forneça um descritor conciso de uma linha resumindo o conteúdo do site.\n\n"
-        f"Trecho do conteúdo:\n{snippet}"
+    descriptor = _semantic_lookup("descriptor", content, config)
+    if descriptor is not None:
+        return {**state, "descricao": descriptor}
+    
+    batcher = _batcher(config)
+    if batcher is not None:
+        descriptor = _submit_batch(batcher, DESCRIPTOR, f"Trecho do conteúdo:\n{content}", state, config)
+    if descriptor is None:
+        prompt = content_messages(
+            content, "Forneça um descritor conciso de uma linha resumindo o conteúdo do site."
+        )
+        descriptor = _invoke_llm(prompt, state, config).content
+    descriptor = descriptor.strip()
+    _semantic_add("descriptor", content, config, descriptor)
+    return {**state, "descricao": descriptor}
+
+
+def _stop_policy(config: Optional[RunnableConfig]) -> StopPolicy:
+    configurable = (config or {}).get("configurable") or {}
+    return resolve_policy(configurable.get("stop_policy"))
+
+
+def _insight_prompt(state: State) -> List["BaseMessage"]:
+    return PromptContext(state).messages(
+        "Qual é um insight ou fator adicional que deve ser considerado para avaliar esta ideia de negócio? "
+        "Responda em uma frase concisa."
+    )
+
+
+def _insight_key(state: State) -> Tuple[str, str]:
+    # A rodada entra no tipo: um insight nunca é reaproveitado em outra rodada
+    return f"insight:{state['interacoes']}", PromptContext(state).context()
+
+
+def _trends_prompt(state: State, insight: str) -> List["BaseMessage"]:
+    # Sem o bloco de insights: basta o novo, e o prefixo continua comum
+    return PromptContext(state).messages(
+        f"Novo insight: '{clip_tokens(insight, PROMPT_INSIGHT_TOKEN_BUDGET)}'. "
+        "Forneça um resumo atualizado e breve das tendências de mercado relevantes em uma frase.",
+        insights=False,
     )
-    response_msg = llm.invoke(prompt)
-    descriptor = response_msg.content
-    return {**state, "descricao": descriptor.strip()}
 
 
-def step_decision(state: State) -> dict:
+def _trends_key(state: State, insight: str, position: int) -> Tuple[str, str]:
+    return f"trends:{position}", f"{PromptContext(state).context(insights=False)}\n{insight}"
+
+
+@traced_node
+def step_decision(state: State, config: Optional[RunnableConfig] = None) -> dict:
     """
     Nó que decide se há informações suficientes para uma avaliação confiável.
     
+    A política de parada (config["configurable"]["stop_policy"], padrão:
+    policies.get_stop_policy()) responde primeiro; o modelo só é chamado
+    quando ela não tem opinião, em um lote com as decisões de outras URLs
+    se o agrupamento de prompts estiver ligado (batching.py).
+    
     Args:
         state: Estado atual do processamento
+        config: Configuração da execução repassada pelo LangGraph
         
     Returns:
         dict: Estado atualizado com a decisão
     """
-    if state["interacoes"] >= 3:
+    policy = _stop_policy(config)
+    if policy.exhausted(state):
+        record_decision(policy, state, True, LIMIT)
         return {"enough": True}
+    verdict = policy.decide(state)
+    if verdict is not None:
+        record_decision(policy, state, verdict, POLICY)
+        return {"enough": verdict}
     
-    prompt = (
-        f"Com base na seguinte descrição do site:\n'{state['descricao']}'\n"
-        f"e os insights adicionais até agora: {', '.join(state['pensamentos']) if state['pensamentos'] else 'Nenhum'}\n"
+    batcher = _batcher(config)
+    if batcher is not None:
+        enough = _submit_batch(batcher, DECISION, PromptContext(state).context(), state, config)
+        if enough is not None:
+            record_decision(policy, state, enough, MODEL)
+            return {"enough": enough}
+    
+    prompt = PromptContext(state).messages(
         "Você tem informações suficientes para avaliar esta ideia de negócio de forma confiável? "
-        "Responda com True ou False."
+        'Responda apenas com um JSON no formato {"suficiente": true ou false}.'
     )
-    decision_msg = llm.invoke(prompt)
-    decision_text = decision_msg.content
-    enough = "True" in decision_text.lower()
-    return {**state, "enough": enough}
+    decision, _ = _invoke_structured(prompt, Decision, state, config)
+    # Resposta fora do esquema: continua buscando informação (até o limite)
+    enough = decision is not None and decision.suficiente
+    record_decision(policy, state, enough, MODEL)
+    return {"enough": enough}
 
 
-def step_think_more(state: State) -> dict:
+@traced_node
+def step_think_more(state: State, config: Optional[RunnableConfig] = None) -> dict:
     """
     Nó que gera insights adicionais quando necessário.
     
     Args:
         state: Estado atual do processamento
+        config: Configuração da execução repassada pelo LangGraph
         
     Returns:
         dict: Estado atualizado com novos insights
@@ -104,77 +564,195 @@ def step_think_more(state: State) -> dict:
     new_iter = state["interacoes"] + 1
     
     # Gerar novo insight
-    prompt_insight = (
-        f"Descrição do site: '{state['descricao']}'.\n"
-        f"Insights existentes: {', '.join(state['pensamentos']) if state['pensamentos'] else 'Nenhum'}.\n"
-        "Qual é um insight ou fator adicional que deve ser considerado para avaliar esta ideia de negócio? "
-        "Responda em uma frase concisa."
-    )
-    insight_msg = llm.invoke(prompt_insight)
+    insight_msg = _invoke_llm(_insight_prompt(state), state, config, semantic=_insight_key(state))
     new_thought = insight_msg.content.strip()
     updated_thoughts = state["pensamentos"] + [new_thought]
     
     # Gerar tendências de mercado atualizadas
-    prompt_trends = (
-        f"Com base na descrição do site '{state['descricao']}' e no novo insight '{new_thought}', "
-        "forneça um resumo atualizado e breve das tendências de mercado relevantes em uma frase."
-    )
-    trends_msg = llm.invoke(prompt_trends)
+    trends_key = _trends_key(state, new_thought, len(updated_thoughts))
+    trends_msg = _invoke_llm(_trends_prompt(state, new_thought), state, config, semantic=trends_key)
     new_trends = trends_msg.content.strip()
     
     return {
         **state,
         "interacoes": new_iter,
         "pensamentos": updated_thoughts,
-        "tendencias_mercado": new_trends
+        **fold_insights(state, updated_thoughts),
+        "tendencias_mercado": new_trends,
+        "tendencias_ref": len(updated_thoughts),
     }
 
 
-def step_finalize(state: State) -> dict:
+@traced_node
+def step_insight(state: State, config: Optional[RunnableConfig] = None) -> dict:
+    """
+    Nó que gera, de forma especulativa, o próximo insight em paralelo com
+    a decisão. Se a decisão concluir que já há informação suficiente, o
+    insight é descartado por step_merge.
+    
+    Args:
+        state: Estado atual do processamento
+        config: Configuração da execução repassada pelo LangGraph
+        
+    Returns:
+        dict: Atualização com o insight pendente
+    """
+    # Se a política já sabe que a decisão é parar, não especula
+    policy = _stop_policy(config)
+    if policy.exhausted(state) or policy.decide(state) is True:
+        return {"insight_pendente": ""}
+    
+    insight_msg = _invoke_llm(_insight_prompt(state), state, config, semantic=_insight_key(state))
+    return {"insight_pendente": insight_msg.content.strip()}
+
+
+@traced_node
+def step_trends(state: State, config: Optional[RunnableConfig] = None) -> dict:
+    """
+    Nó que atualiza as tendências de mercado a partir do último insight
+    aceito. Roda em paralelo com a rodada seguinte de decisão/insight e
+    não faz nada se as tendências já estão atualizadas.
+    
+    Args:
+        state: Estado atual do processamento
+        config: Configuração da execução repassada pelo LangGraph
+        
+    Returns:
+        dict: Atualização com as novas tendências (ou vazia)
+    """
+    if state["tendencias_ref"] >= len(state["pensamentos"]):
+        return {}
+    
+    prompt = _trends_prompt(state, state["pensamentos"][-1])
+    trends_key = _trends_key(state, state["pensamentos"][-1], len(state["pensamentos"]))
+    trends_msg = _invoke_llm(prompt, state, config, semantic=trends_key)
+    return {
+        "tendencias_mercado": trends_msg.content.strip(),
+        "tendencias_ref": len(state["pensamentos"]),
+    }
+
+
+@traced_node
+def step_reflect(state: State, config: Optional[RunnableConfig] = None) -> dict:
+    """
+    Nó que combina decisão e novo insight em uma única chamada ao modelo,
+    com resposta estruturada em JSON. Se a política de parada decidir
+    parar, a chamada não é feita; se decidir continuar, a decisão do
+    modelo é ignorada e só o insight é usado.
+    
+    Args:
+        state: Estado atual do processamento
+        config: Configuração da execução repassada pelo LangGraph
+        
+    Returns:
+        dict: Atualização com a decisão e o insight pendente
+    """
+    policy = _stop_policy(config)
+    if policy.exhausted(state):
+        record_decision(policy, state, True, LIMIT)
+        return {"enough": True, "insight_pendente": ""}
+    verdict = policy.decide(state)
+    if verdict is True:
+        record_decision(policy, state, True, POLICY)
+        return {"enough": True, "insight_pendente": ""}
+    
+    prompt = PromptContext(state).messages(
+        "Decida se você tem informações suficientes para avaliar esta ideia de negócio de forma confiável. "
+        "Se não tiver, proponha um insight ou fator adicional que deve ser considerado, em uma frase concisa. "
+        'Responda apenas com um JSON no formato {"suficiente": true ou false, "insight": "..."}.'
+    )
+    reflection, text = _invoke_structured(prompt, Reflection, state, config)
+    if reflection is not None:
+        enough, insight = reflection.suficiente, reflection.insight.strip()
+    else:
+        # Resposta fora do esquema: trata o texto como um novo insight
+        enough, insight = False, text
+    if verdict is False:
+        enough = False
+    
+    stop = enough or not insight
+    record_decision(policy, state, stop, MODEL)
+    if stop:
+        return {"enough": True, "insight_pendente": ""}
+    return {"enough": False, "insight_pendente": insight}
+
+
+@traced_node
+def step_merge(state: State) -> dict:
+    """
+    Nó de junção das rodadas paralelas: incorpora o insight pendente aos
+    pensamentos quando a decisão pede mais informação.
+    
+    Args:
+        state: Estado atual do processamento
+        
+    Returns:
+        dict: Atualização com os pensamentos e o contador de iterações
+    """
+    if state["enough"] or not state["insight_pendente"]:
+        return {"enough": True, "insight_pendente": ""}
+    
+    updated_thoughts = state["pensamentos"] + [state["insight_pendente"]]
+    return {
+        "pensamentos": updated_thoughts,
+        **fold_insights(state, updated_thoughts),
+        "interacoes": state["interacoes"] + 1,
+        "insight_pendente": "",
+    }
+
+
+@traced_node
+def step_finalize(state: State, config: Optional[RunnableConfig] = None) -> dict:
     """
     Nó final que gera a avaliação completa do negócio.
     
     Args:
         state: Estado atual do processamento
+        config: Configuração da execução repassada pelo LangGraph
         
     Returns:
         dict: Estado atualizado com a avaliação final
     """
-    prompt = (
-        f"Usando a descrição do site:\n'{state['descricao']}'\n"
-        f"e os seguintes insights adicionais: {', '.join(state['pensamentos']) if state['pensamentos'] else 'Nenhum'}\n"
-        f"com resumo das tendências de mercado: '{state['tendencias_mercado']}'\n"
+    prompt = PromptContext(state).messages(
         "Forneça uma avaliação final do negócio em 3-5 linhas e classifique a ideia de negócio em uma escala de 1 (ruim) a 10 (excelente). "
-        "IMPORTANTE: Formate sua resposta EXATAMENTE assim: 'Resumo Final: [sua análise aqui]; Avaliação: [número de 1 a 10]'"
+        'Responda apenas com um JSON no formato {"resumo": "sua análise aqui", "avaliacao": número de 1 a 10}.',
+        trends=True,
     )
-
-    final_msg = llm.invoke(prompt)
-    final = final_msg.content.strip()
-    
-    # Procurar por diferentes formatos de avaliação
-    patterns = [
-        r'Avaliação:\s*(\d+)',
-        r'Rating:\s*(\d+)',
-        r'Nota:\s*(\d+)',
-        r'Score:\s*(\d+)',
-        r'(\d+)/10',
-        r'(\d+)\s*de\s*10',
-        r'(\d+)\s*out\s*of\s*10'
-    ]
-    
-    rating = 0
-    for pattern in patterns:
-        match = re.search(pattern, final, re.IGNORECASE)
-        if match:
-            rating = int(match.group(1))
-            break
-    
-    # Se não encontrou nenhum padrão, procurar por qualquer número entre 1-10
-    if rating == 0:
-        numbers = re.findall(r'\b([1-9]|10)\b', final)
-        if numbers:
-            rating = int(numbers[-1])  # Pega o último número encontrado
+    semantic = ("final", PromptContext(state).context(trends=True))
+    assessment, text = _invoke_structured(prompt, FinalAssessment, state, config, semantic)
+    if assessment is None:
+        from llm_cache import bypass_llm_cache
+        
+        # Resposta fora do esquema (talvez vinda de um cache): pede de novo uma vez
+        with bypass_llm_cache():
+            assessment, text = _invoke_structured(prompt, FinalAssessment, state, config, semantic)
+    if assessment is None:
+        # Mostra o texto recebido, sem nota; step_persist não guarda a avaliação
+        return {**state, "resposta_final": text, "avaliacao": 0}
     
     return {**state,
-        "resposta_final": final,
-        "avaliacao": rating}
+        "resposta_final": assessment.resumo.strip(),
+        "avaliacao": assessment.avaliacao}
+
+
+@traced_node
+def step_persist(state: State) -> dict:
+    """
+    Nó que guarda a avaliação concluída, com as impressões digitais do
+    conteúdo, para ser reaproveitada enquanto o site não mudar. Avaliações
+    sem nota válida (resposta final fora do esquema) não são guardadas.
+    
+    Args:
+        state: Estado atual do processamento
+        
+    Returns:
+        dict: Nenhuma alteração no estado
+    """
+    if state.get("impressao") and state.get("resposta_final") and 1 <= state.get("avaliacao", 0) <= 10:
+        get_result_store().save(
+            canonicalize(state["url"]),
+            state["impressao"],
+            state["simhash"],
+            {field: state[field] for field in RESULT_FIELDS},
+        )
+    return {}
@@ -0,0 +1,468 @@
+"""
+Pipeline de avaliação em lote do AI Agent - Avaliação de Negócios
+
+Este arquivo contém uma alternativa a process_many para lotes grandes. Em
+process_many cada URL percorre o grafo inteiro e a extração do texto
+acontece durante o download, no loop do fetcher: com muitas URLs, o
+parser disputa a mesma thread com os downloads e os grafos. Aqui cada URL
+passa por etapas separadas, cada uma com a sua concorrência:
+
+    fetch   download da página inicial (E/S, no loop do fetcher)
+    parse   extração do texto e dos links, em um pool de processos
+    crawl   páginas extras do site (download e extração no mesmo pool)
+    llm     grafo de avaliação, a partir do conteúdo já coletado
+
+As etapas são ligadas por filas limitadas: quando uma etapa mais lenta
+(em geral a do modelo) não dá vazão, as filas enchem e as anteriores
+param de buscar trabalho novo, em vez de acumular páginas na memória.
+Cada etapa mede itens, ocupação dos workers, tempo esperando trabalho e
+tempo bloqueada pela fila seguinte (ver Pipeline.stats).
+
+Uso:
+    pipeline = Pipeline(llm_concurrency=16)
+    results = pipeline.run(urls)
+    pipeline.stats()["llm"]["occupancy"]
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend import aprocess_url, error_result
+from constants import (
+    CONTENT_CHAR_BUDGET,
+    CRAWL_MAX_PAGES,
+    CRAWL_TIMEOUT,
+    CRAWL_TOKEN_BUDGET,
+    PIPELINE_CRAWL_CONCURRENCY,
+    PIPELINE_FETCH_CONCURRENCY,
+    PIPELINE_LLM_CONCURRENCY,
+    PIPELINE_PARSE_WORKERS,
+    PIPELINE_QUEUE_SIZE,
+)
+from content_cache import get_content_cache
+from crawler import acrawl_from, crawl_cache_key, error_text, robots_allowed
+from extractor import ParsedHTML, parse_html
+from fetcher import AsyncFetcher, FetchResult, get_fetcher
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+# Etapas, na ordem em que cada URL passa por elas
+STAGES = ("fetch", "parse", "crawl", "llm")
+
+# Marca de fim de entrada de uma etapa (uma por worker)
+_STOP = object()
+
+
+@dataclass
+class _Item:
+    """
+    URL em trânsito pelo pipeline.
+
+    Attributes:
+        index: Posição da URL na entrada
+        url: URL a ser avaliada
+        response: Download da página inicial (HTML bruto até a extração)
+        parsed: Extração da página inicial
+        content: Conteúdo pronto para o grafo (ou a mensagem de erro)
+        timings: Tempo em cada etapa e na fila antes dela, em ms
+        enqueued: Momento em que o item entrou na fila atual
+    """
+    index: int
+    url: str
+    response: Optional[FetchResult] = None
+    parsed: Optional[ParsedHTML] = None
+    content: str = ""
+    timings: Dict[str, float] = field(default_factory=dict)
+    enqueued: float = 0.0
+
+
+class StageStats:
+    """
+    Medições de uma etapa do pipeline.
+
+    A ocupação é a fração do tempo da etapa em que os workers estavam
+    trabalhando: perto de 1, a etapa é o gargalo; baixa com muito tempo
+    "starved", as anteriores não dão vazão; com tempo "blocked", a
+    seguinte é que não dá.
+    """
+
+    def __init__(self, name: str, workers: int):
+        """
+        Args:
+            name: Nome da etapa
+            workers: Número de workers da etapa
+        """
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.starved_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.queue_max = 0
+        self.queue_total = 0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def sample_queue(self, depth: int) -> None:
+        self.queue_max = max(self.queue_max, depth)
+        self.queue_total += depth
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Resumo das medições.
+
+        Returns:
+            Dict[str, float]: Workers, itens, erros, ocupação, tempos
+                trabalhando/esperando trabalho/bloqueada (s, somados entre os
+                workers) e profundidade máxima e média da fila de entrada,
+                medida a cada item que entra nela
+        """
+        end = self.finished or time.perf_counter()
+        elapsed = end - self.started if self.started is not None else 0.0
+        capacity = self.workers * elapsed
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "errors": self.errors,
+            "occupancy": self.busy_seconds / capacity if capacity else 0.0,
+            "busy_s": self.busy_seconds,
+            "starved_s": self.starved_seconds,
+            "blocked_s": self.blocked_seconds,
+            "queue_max": self.queue_max,
+            "queue_avg": self.queue_total / self.items if self.items else 0.0,
+        }
+
+
+class Pipeline:
+    """
+    Avaliação de várias URLs em etapas separadas, ligadas por filas
+    limitadas.
+
+    O resultado de cada URL tem o mesmo formato de process_url, com os
+    tempos de cada etapa em result["trace"]["pipeline"]. O conteúdo
+    coletado passa pelo mesmo cache de process_url, sob as mesmas chaves.
+    """
+
+    def __init__(
+        self,
+        fetch_concurrency: int = PIPELINE_FETCH_CONCURRENCY,
+        parse_workers: int = PIPELINE_PARSE_WORKERS,
+        crawl_concurrency: int = PIPELINE_CRAWL_CONCURRENCY,
+        llm_concurrency: int = PIPELINE_LLM_CONCURRENCY,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        crawl_pages: int = CRAWL_MAX_PAGES,
+        use_llm_cache: bool = True,
+        mode: str = "default",
+        force_refresh: bool = False,
+        llm: Optional["BaseChatModel"] = None,
+        fetcher: Optional[AsyncFetcher] = None,
+    ):
+        """
+        Args:
+            fetch_concurrency: Downloads de páginas iniciais simultâneos
+            parse_workers: Processos de extração de texto
+            crawl_concurrency: Sites com páginas extras em download simultâneo
+            llm_concurrency: Grafos executando ao mesmo tempo
+            queue_size: Capacidade de cada fila entre etapas
+            crawl_pages: Páginas por site, incluindo a inicial (com 1, só a
+                página informada é lida)
+            use_llm_cache: Se False, ignora respostas do modelo já guardadas
+            mode: Configuração do grafo ("default", "parallel" ou "merged")
+            force_refresh: Se True, avalia de novo mesmo que o conteúdo não
+                tenha mudado desde a última avaliação
+            llm: Modelo único desta execução (padrão: roteamento por nó de
+                models.get_router())
+            fetcher: Cliente HTTP (padrão: fetcher.get_fetcher())
+        """
+        self.concurrency = {
+            "fetch": fetch_concurrency,
+            "parse": parse_workers,
+            "crawl": crawl_concurrency,
+            "llm": llm_concurrency,
+        }
+        for name, workers in self.concurrency.items():
+            if workers < 1:
+                raise ValueError(f"A concorrência da etapa {name} deve ser maior ou igual a 1")
+        if queue_size < 1:
+            raise ValueError("queue_size deve ser maior ou igual a 1")
+        self.queue_size = queue_size
+        self.crawl_pages = crawl_pages
+        self.use_llm_cache = use_llm_cache
+        self.mode = mode
+        self.force_refresh = force_refresh
+        self.llm = llm
+        self.fetcher = fetcher or get_fetcher()
+        self._stats: Dict[str, StageStats] = {}
+        self._pool: Optional[Executor] = None
+        self._results: List[Optional[dict]] = []
+        self._on_result: Optional[Callable[[int, str, dict], None]] = None
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Medições por etapa da última execução (ver StageStats.summary).
+
+        Returns:
+            Dict[str, Dict[str, float]]: Resumo por etapa, na ordem do pipeline
+        """
+        return {name: stage.summary() for name, stage in self._stats.items()}
+
+    def run(
+        self, urls: Iterable[str], on_result: Optional[Callable[[int, str, dict], None]] = None
+    ) -> List[dict]:
+        """
+        Versão síncrona de arun. Não deve ser chamada de dentro de um event
+        loop em execução.
+
+        Os nós do grafo são síncronos e rodam no executor padrão do event
+        loop, por isso o executor é dimensionado para llm_concurrency.
+
+        Args:
+            urls: URLs a serem analisadas
+            on_result: Callback opcional chamado com (índice, url, resultado)
+                à medida que cada URL termina
+
+        Returns:
+            List[dict]: Resultados na mesma ordem das URLs fornecidas
+        """
+        async def _run() -> List[dict]:
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=self.concurrency["llm"]))
+            return await self.arun(urls, on_result)
+
+        return asyncio.run(_run())
+
+    async def arun(
+        self, urls: Iterable[str], on_result: Optional[Callable[[int, str, dict], None]] = None
+    ) -> List[dict]:
+        """
+        Processa as URLs e retorna os resultados na ordem de entrada.
+
+        Falhas são isoladas por URL: uma exceção em qualquer etapa vira um
+        resultado de erro (com a chave "error") e não interrompe as demais.
+
+        Args:
+            urls: URLs a serem analisadas
+            on_result: Callback opcional chamado com (índice, url, resultado)
+                à medida que cada URL termina
+
+        Returns:
+            List[dict]: Resultados na mesma ordem das URLs fornecidas
+        """
+        urls = list(urls)
+        self._results = [None] * len(urls)
+        self._on_result = on_result
+        self._stats = {name: StageStats(name, self.concurrency[name]) for name in STAGES}
+        handlers = {
+            "fetch": self._fetch,
+            "parse": self._parse,
+            "crawl": self._crawl,
+            "llm": self._evaluate,
+        }
+        # Fila de entrada de cada etapa
+        queues = [asyncio.Queue(self.queue_size) for _ in STAGES]
+
+        async def feed() -> None:
+            for index, url in enumerate(urls):
+                await queues[0].put(_Item(index, url, enqueued=time.perf_counter()))
+                self._stats[STAGES[0]].sample_queue(queues[0].qsize())
+            for _ in range(self.concurrency[STAGES[0]]):
+                await queues[0].put(_STOP)
+
+        async def run_stage(position: int) -> None:
+            stage = self._stats[STAGES[position]]
+            last = position + 1 == len(STAGES)
+            outbox = None if last else queues[position + 1]
+            downstream = None if last else self._stats[STAGES[position + 1]]
+            stage.started = time.perf_counter()
+            await asyncio.gather(*(
+                self._worker(stage, handlers[stage.name], queues[position], outbox, downstream)
+                for _ in range(stage.workers)
+            ))
+            stage.finished = time.perf_counter()
+            if outbox is not None:
+                for _ in range(self.concurrency[STAGES[position + 1]]):
+                    await outbox.put(_STOP)
+
+        # Processos iniciados com spawn: fork depois de criar as threads do
+        # fetcher e do executor não é seguro
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.concurrency["parse"], mp_context=multiprocessing.get_context("spawn")
+        )
+        # Inicia os processos enquanto as primeiras páginas são baixadas
+        for _ in range(self.concurrency["parse"]):
+            self._pool.submit(parse_html, "")
+        try:
+            await asyncio.gather(feed(), *(run_stage(position) for position in range(len(STAGES))))
+        finally:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        return self._results
+
+    async def _worker(
+        self,
+        stage: StageStats,
+        handler: Callable[[_Item], Awaitable[None]],
+        inbox: "asyncio.Queue[Any]",
+        outbox: "Optional[asyncio.Queue[Any]]",
+        downstream: Optional[StageStats] = None,
+    ) -> None:
+        """
+        Worker de uma etapa: consome a fila de entrada até o marco de fim,
+        passando cada item adiante depois de processado.
+
+        Args:
+            stage: Medições da etapa
+            handler: Processamento de um item
+            inbox: Fila de entrada da etapa
+            outbox: Fila de entrada da etapa seguinte (None na última)
+            downstream: Medições da etapa seguinte (profundidade da fila)
+        """
+        while True:
+            waiting = time.perf_counter()
+            item = await inbox.get()
+            started = time.perf_counter()
+            stage.starved_seconds += started - waiting
+            if item is _STOP:
+                return
+            item.timings[f"{stage.name}_wait_ms"] = (started - item.enqueued) * 1000
+
+            try:
+                await handler(item)
+            except Exception as e:
+                # As etapas seguintes só repassam o item; o grafo registra o erro
+                stage.errors += 1
+                item.content = f"Exception: {str(e)}"
+            finished = time.perf_counter()
+            stage.busy_seconds += finished - started
+            stage.items += 1
+            item.timings[f"{stage.name}_ms"] = (finished - started) * 1000
+
+            if outbox is not None:
+                item.enqueued = finished
+                await outbox.put(item)
+                stage.blocked_seconds += time.perf_counter() - finished
+                downstream.sample_queue(outbox.qsize())
+
+    async def _parse_html(self, html: str, collect_links: bool) -> ParsedHTML:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, parse_html, html, CONTENT_CHAR_BUDGET, collect_links)
+
+    async def _fetch_page(
+        self, fetcher: AsyncFetcher, url: str, collect_links: bool = False
+    ) -> Tuple[FetchResult, ParsedHTML]:
+        """
+        Download de uma página extra do crawl, com a extração no pool de
+        processos (ver crawler.PageFetcher).
+        """
+        response = await fetcher.fetch(url)
+        parsed = ParsedHTML()
+        if response.ok:
+            parsed = await self._parse_html(response.text, collect_links)
+        response.text = parsed.text
+        return response, parsed
+
+    def _cache_key(self, url: str) -> str:
+        return crawl_cache_key(url, self.crawl_pages) if self.crawl_pages > 1 else url
+
+    async def _fetch(self, item: _Item) -> None:
+        """
+        Etapa fetch: conteúdo do cache ou HTML bruto da página inicial.
+
+        Com o crawl, o robots.txt do site é baixado junto. Sem o crawl,
+        uma página já conhecida é revalidada com If-None-Match/If-Modified-Since.
+        """
+        entry = get_content_cache().get(self._cache_key(item.url))
+        if entry is not None and entry.fresh:
+            item.content = entry.text if self.crawl_pages > 1 or entry.is_error else entry.text[:1000]
+            return
+
+        headers = {}
+        if self.crawl_pages <= 1 and entry is not None and not entry.is_error:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        if self.crawl_pages > 1:
+            item.response, _ = await asyncio.gather(
+                self.fetcher.fetch(item.url), robots_allowed(self.fetcher, item.url)
+            )
+        else:
+            item.response = await self.fetcher.fetch(item.url, headers=headers)
+        if item.response.status_code == 304 and headers:
+            get_content_cache().refresh(item.url)
+            item.content = entry.text[:1000]
+
+    async def _parse(self, item: _Item) -> None:
+        """
+        Etapa parse: texto (e, com o crawl, links) da página inicial.
+        """
+        if item.content or not item.response.ok:
+            return
+        item.parsed = await self._parse_html(item.response.text, self.crawl_pages > 1)
+        item.response.text = item.parsed.text
+
+    async def _crawl(self, item: _Item) -> None:
+        """
+        Etapa crawl: páginas extras do site e seleção dos trechos (ou, sem
+        o crawl, só o corte do texto da página inicial). O conteúdo vai
+        para o cache.
+        """
+        if item.content:
+            return
+        cache = get_content_cache()
+        response = item.response
+        if self.crawl_pages <= 1:
+            if response.ok:
+                cache.set(
+                    item.url,
+                    response.text,
+                    etag=response.headers.get("etag"),
+                    last_modified=response.headers.get("last-modified"),
+                )
+                item.content = response.text[:1000]
+            else:
+                item.content = error_text(response)
+                cache.set(item.url, item.content, is_error=True)
+            return
+
+        deadline = time.monotonic() + CRAWL_TIMEOUT
+        result = await self.fetcher.arun(acrawl_from(
+            response,
+            item.parsed or ParsedHTML(),
+            self.crawl_pages,
+            CRAWL_TOKEN_BUDGET,
+            deadline,
+            self.fetcher,
+            self._fetch_page,
+        ))
+        cache.set(self._cache_key(item.url), result.content, is_error=result.error)
+        item.content = result.content
+
+    async def _evaluate(self, item: _Item) -> None:
+        """
+        Etapa llm: grafo de avaliação sobre o conteúdo coletado.
+        """
+        started = time.perf_counter()
+        try:
+            result = await aprocess_url(
+                item.url,
+                self.use_llm_cache,
+                self.mode,
+                self.force_refresh,
+                self.llm,
+                self.fetcher,
+                content=item.content,
+            )
+        except Exception as e:
+            result = error_result(f"Exception: {str(e)}")
+        item.timings["llm_ms"] = (time.perf_counter() - started) * 1000
+        result.setdefault("trace", {})["pipeline"] = item.timings
+        self._results[item.index] = result
+        if self._on_result is not None:
+            self._on_result(item.index, item.url, result)
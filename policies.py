@@ -0,0 +1,318 @@
+"""
+Políticas de parada do AI Agent - Avaliação de Negócios
+
+Este arquivo contém as políticas que decidem, a cada rodada, se o laço
+de insights deve parar. Uma política pode responder localmente (sem
+chamar o modelo) ou devolver a decisão ao modelo; políticas podem ser
+encadeadas, cada uma consultando a seguinte quando não tem opinião:
+
+    "llm"                  o modelo decide (padrão)
+    "novelty"              para quando o último insight traz pouco de novo
+    "budget"               para quando a URL gastou o orçamento de tokens/tempo
+    "budget+novelty+llm"   orçamento, depois novidade, depois o modelo
+
+Todas respeitam o limite de iterações. As estatísticas por política
+(decisões locais, chamadas economizadas, iterações) ficam em policy_stats().
+"""
+
+import threading
+from typing import Dict, List, Optional, Set, Union
+
+from constants import (
+    MAX_ITERACOES,
+    STOP_NOVELTY_THRESHOLD,
+    STOP_POLICY,
+    STOP_TIME_BUDGET,
+    STOP_TOKEN_BUDGET,
+    State,
+)
+from fingerprint import normalize_text
+from instrumentation import current_trace
+
+# Palavras com até este tamanho não contam na novidade (artigos, preposições)
+_SHORT_WORD = 3
+
+
+class StopPolicy:
+    """
+    Política de parada base: sem opinião própria.
+
+    decide() devolve True (parar), False (continuar) ou None (perguntar ao
+    modelo). Sem opinião, a política consulta a seguinte da cadeia; no fim
+    da cadeia, continua.
+    """
+
+    name = "base"
+
+    def __init__(self, max_iterations: int = MAX_ITERACOES, fallback: Optional["StopPolicy"] = None):
+        """
+        Args:
+            max_iterations: Limite de rodadas de insights
+            fallback: Política consultada quando esta não tem opinião
+        """
+        self.max_iterations = max_iterations
+        self.fallback = fallback
+
+    @property
+    def spec(self) -> str:
+        return self.name + (f"+{self.fallback.spec}" if self.fallback else "")
+
+    def exhausted(self, state: State) -> bool:
+        """
+        Se o limite de iterações foi atingido.
+
+        Args:
+            state: Estado atual do processamento
+
+        Returns:
+            bool: True se o laço deve parar de qualquer forma
+        """
+        return state["interacoes"] >= self.max_iterations
+
+    def decide(self, state: State) -> Optional[bool]:
+        """
+        Decide se o laço para.
+
+        Args:
+            state: Estado atual do processamento
+
+        Returns:
+            Optional[bool]: True para parar, False para continuar, None para
+                perguntar ao modelo
+        """
+        verdict = self.check(state)
+        if verdict is not None:
+            return verdict
+        if self.fallback is not None:
+            return self.fallback.decide(state)
+        return False
+
+    def check(self, state: State) -> Optional[bool]:
+        """
+        Opinião desta política (None = sem opinião). Subclasses sobrescrevem.
+
+        Args:
+            state: Estado atual do processamento
+
+        Returns:
+            Optional[bool]: True para parar, False para continuar ou None
+        """
+        return None
+
+
+class LLMPolicy(StopPolicy):
+    """
+    O modelo decide, com uma chamada por rodada.
+    """
+
+    name = "llm"
+
+    def decide(self, state: State) -> Optional[bool]:
+        return None
+
+
+class NoveltyPolicy(StopPolicy):
+    """
+    Para quando o último insight traz poucas palavras que ainda não
+    apareceram nos anteriores (o laço começou a se repetir).
+    """
+
+    name = "novelty"
+
+    def __init__(self, threshold: float = STOP_NOVELTY_THRESHOLD, **kwargs):
+        """
+        Args:
+            threshold: Fração mínima de palavras novas para continuar
+            **kwargs: Argumentos de StopPolicy
+        """
+        super().__init__(**kwargs)
+        self.threshold = threshold
+
+    def check(self, state: State) -> Optional[bool]:
+        thoughts = state["pensamentos"]
+        if len(thoughts) < 2:
+            return None
+        if novelty(thoughts[-1], thoughts[:-1]) < self.threshold:
+            return True
+        return None
+
+
+class BudgetPolicy(StopPolicy):
+    """
+    Para quando a URL já gastou o orçamento de tokens do modelo ou de
+    tempo (a chamada de finalização fica fora do orçamento).
+    """
+
+    name = "budget"
+
+    def __init__(self, max_tokens: int = STOP_TOKEN_BUDGET, max_seconds: float = STOP_TIME_BUDGET, **kwargs):
+        """
+        Args:
+            max_tokens: Tokens de entrada e saída do modelo por URL
+            max_seconds: Tempo por URL, em segundos
+            **kwargs: Argumentos de StopPolicy
+        """
+        super().__init__(**kwargs)
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+
+    def check(self, state: State) -> Optional[bool]:
+        trace = current_trace()
+        if trace is None:
+            return None
+        seconds, tokens = trace.usage()
+        if tokens >= self.max_tokens or seconds >= self.max_seconds:
+            return True
+        return None
+
+
+POLICIES = {policy.name: policy for policy in (LLMPolicy, NoveltyPolicy, BudgetPolicy)}
+
+
+def _content_words(text: str) -> Set[str]:
+    return {word for word in normalize_text(text) if len(word) > _SHORT_WORD}
+
+
+def novelty(insight: str, previous: List[str]) -> float:
+    """
+    Fração das palavras do insight que não aparecem nos anteriores.
+
+    Args:
+        insight: Insight mais recente
+        previous: Insights anteriores
+
+    Returns:
+        float: Entre 0 (nada novo) e 1 (tudo novo)
+    """
+    words = _content_words(insight)
+    if not words:
+        return 0.0
+    seen: Set[str] = set()
+    for thought in previous:
+        seen |= _content_words(thought)
+    return len(words - seen) / len(words)
+
+
+def make_policy(spec: str, max_iterations: int = MAX_ITERACOES) -> StopPolicy:
+    """
+    Cria uma política (ou cadeia de políticas) a partir do nome.
+
+    Args:
+        spec: Nomes separados por "+", na ordem de consulta
+        max_iterations: Limite de rodadas de insights
+
+    Returns:
+        StopPolicy: Primeira política da cadeia
+
+    Raises:
+        ValueError: Nome de política desconhecido
+    """
+    policy: Optional[StopPolicy] = None
+    for name in reversed(spec.split("+")):
+        name = name.strip()
+        if name not in POLICIES:
+            raise ValueError(f"Política de parada desconhecida: {name!r} (opções: {', '.join(POLICIES)})")
+        policy = POLICIES[name](max_iterations=max_iterations, fallback=policy)
+    return policy
+
+
+_policy: Optional[StopPolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_stop_policy() -> StopPolicy:
+    """
+    Retorna a política do processo (WEBSCRAP_STOP_POLICY, padrão "llm").
+
+    Returns:
+        StopPolicy: Política compartilhada
+    """
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                _policy = make_policy(STOP_POLICY)
+    return _policy
+
+
+def set_stop_policy(policy: Union[StopPolicy, str]) -> None:
+    """
+    Substitui a política do processo. Para uma única execução, use
+    config["configurable"]["stop_policy"].
+
+    Args:
+        policy: Política ou nome (ver make_policy)
+    """
+    global _policy
+    with _policy_lock:
+        _policy = make_policy(policy) if isinstance(policy, str) else policy
+
+
+def resolve_policy(option: Union[StopPolicy, str, None]) -> StopPolicy:
+    """
+    Política de uma execução: a informada na configuração ou a do processo.
+
+    Args:
+        option: Valor de config["configurable"]["stop_policy"]
+
+    Returns:
+        StopPolicy: Política a usar
+    """
+    if option is None:
+        return get_stop_policy()
+    return make_policy(option) if isinstance(option, str) else option
+
+
+# Origem de cada decisão registrada em policy_stats
+MODEL, POLICY, LIMIT = "model", "policy", "limit"
+
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def record_decision(policy: StopPolicy, state: State, stop: bool, source: str) -> None:
+    """
+    Registra uma decisão nas estatísticas da política.
+
+    Args:
+        policy: Política usada
+        state: Estado no momento da decisão
+        stop: Se o laço parou
+        source: MODEL (o modelo decidiu), POLICY (decisão local, uma chamada
+            economizada) ou LIMIT (limite de iterações)
+    """
+    with _stats_lock:
+        entry = _stats.setdefault(
+            policy.spec, {"runs": 0, "iterations": 0, MODEL: 0, POLICY: 0, LIMIT: 0}
+        )
+        entry[source] += 1
+        if stop:
+            entry["runs"] += 1
+            entry["iterations"] += state["interacoes"]
+
+
+def policy_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Estatísticas do processo por política.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Por política: URLs concluídas ("runs"),
+            média de iterações, decisões do modelo, chamadas economizadas
+            (decisões locais) e paradas pelo limite de iterações
+    """
+    with _stats_lock:
+        return {
+            spec: {
+                "runs": entry["runs"],
+                "avg_iterations": entry["iterations"] / entry["runs"] if entry["runs"] else 0.0,
+                "model_decisions": entry[MODEL],
+                "calls_saved": entry[POLICY],
+                "limit_stops": entry[LIMIT],
+            }
+            for spec, entry in _stats.items()
+        }
+
+
+def reset_policy_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,237 @@
+"""
+Contexto dos prompts para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém a montagem dos prompts a partir do estado do grafo,
+com tamanho limitado: os insights mais recentes entram na íntegra dentro
+de um orçamento de tokens e os mais antigos são dobrados em um resumo
+compacto, mantido no próprio estado a cada novo insight. Assim o prompt
+não cresce com o número de iterações.
+
+Os prompts seguem sempre a mesma ordem, do mais estável para o mais
+variável (instruções do sistema, descrição do site, resumo, insights
+recentes e, por último, a tarefa), para que o cache de prefixos do
+provedor aproveite as partes repetidas entre as chamadas de uma URL.
+"""
+
+import re
+from typing import TYPE_CHECKING, List, Sequence, Union
+
+from constants import (
+    PROMPT_FIELD_TOKEN_BUDGET,
+    PROMPT_INSIGHT_TOKEN_BUDGET,
+    PROMPT_SUMMARY_ITEM_TOKENS,
+    PROMPT_SUMMARY_TOKEN_BUDGET,
+    State,
+)
+
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+# Prefixo comum a todas as chamadas (de todas as URLs)
+SYSTEM_PROMPT = (
+    "Você é um analista que avalia startups e ideias de negócio a partir do "
+    "conteúdo do site da empresa. Responda em português, de forma objetiva."
+)
+
+# Cabeçalhos dos itens e da tarefa nos prompts em lote (ver batching.py)
+BATCH_ITEM_HEADER = "### Item"
+BATCH_TASK_HEADER = "### Tarefa"
+
+# Separador dos itens do resumo de insights
+SUMMARY_SEPARATOR = " | "
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def count_tokens(text: Union[str, Sequence["BaseMessage"]]) -> int:
+    """
+    Estimativa de tokens (4 caracteres por token, como no escalonador).
+
+    Args:
+        text: Texto ou lista de mensagens
+
+    Returns:
+        int: Número aproximado de tokens
+    """
+    if not isinstance(text, str):
+        text = "".join(str(message.content) for message in text)
+    return (len(text) + 3) // 4
+
+
+def clip_tokens(text: str, budget: int) -> str:
+    """
+    Corta o texto no limite de tokens, sem partir palavras.
+
+    Args:
+        text: Texto original
+        budget: Orçamento de tokens
+
+    Returns:
+        str: Texto dentro do orçamento (com "…" se foi cortado)
+    """
+    text = text.strip()
+    limit = budget * 4
+    if len(text) <= limit:
+        return text
+    clipped = text[:limit - 1]
+    if " " in clipped:
+        clipped = clipped.rsplit(" ", 1)[0]
+    return clipped.rstrip(" ,;:") + "…"
+
+
+def _summary_item(insight: str) -> str:
+    """
+    Forma compacta de um insight: a primeira frase, dentro do limite por item.
+
+    Args:
+        insight: Insight completo
+
+    Returns:
+        str: Item do resumo
+    """
+    first_sentence = _SENTENCE_END.split(insight.strip(), 1)[0]
+    return clip_tokens(first_sentence.replace(SUMMARY_SEPARATOR.strip(), "/"), PROMPT_SUMMARY_ITEM_TOKENS)
+
+
+def fold_insights(
+    state: State,
+    pensamentos: List[str],
+    budget: int = PROMPT_INSIGHT_TOKEN_BUDGET,
+    summary_budget: int = PROMPT_SUMMARY_TOKEN_BUDGET,
+) -> dict:
+    """
+    Atualiza o resumo de insights depois que a lista de pensamentos cresce.
+
+    Enquanto os insights ainda não resumidos passam do orçamento, o mais
+    antigo deles vira um item compacto do resumo. Se o resumo passar do
+    seu próprio orçamento, os itens mais antigos saem primeiro. O custo é
+    proporcional ao novo insight, não ao histórico.
+
+    Args:
+        state: Estado atual do processamento (resumo e quantos já resumidos)
+        pensamentos: Lista de pensamentos atualizada
+        budget: Tokens dos insights recentes mantidos na íntegra
+        summary_budget: Tokens do resumo
+
+    Returns:
+        dict: Atualização com "resumo_pensamentos" e "pensamentos_resumidos"
+    """
+    folded = state.get("pensamentos_resumidos", 0)
+    items = [item for item in state.get("resumo_pensamentos", "").split(SUMMARY_SEPARATOR) if item]
+    recent_tokens = sum(count_tokens(thought) for thought in pensamentos[folded:])
+
+    # O insight mais recente fica sempre na íntegra (cortado só na visão)
+    while len(pensamentos) - folded > 1 and recent_tokens > budget:
+        recent_tokens -= count_tokens(pensamentos[folded])
+        items.append(_summary_item(pensamentos[folded]))
+        folded += 1
+    while len(items) > 1 and count_tokens(SUMMARY_SEPARATOR.join(items)) > summary_budget:
+        items.pop(0)
+
+    return {"resumo_pensamentos": SUMMARY_SEPARATOR.join(items), "pensamentos_resumidos": folded}
+
+
+class PromptContext:
+    """
+    Visão limitada do estado usada para montar os prompts dos nós.
+
+    Uso:
+        messages = PromptContext(state).messages("Qual é um insight adicional?")
+    """
+
+    def __init__(self, state: State):
+        """
+        Args:
+            state: Estado atual do processamento
+        """
+        self.state = state
+
+    def description(self) -> str:
+        return clip_tokens(self.state.get("descricao", ""), PROMPT_FIELD_TOKEN_BUDGET)
+
+    def insights(self) -> str:
+        """
+        Resumo dos insights antigos seguido dos recentes, na íntegra.
+
+        Returns:
+            str: Bloco de insights do prompt
+        """
+        recent = self.state.get("pensamentos", [])[self.state.get("pensamentos_resumidos", 0):]
+        lines = []
+        if self.state.get("resumo_pensamentos"):
+            lines.append(f"Resumo dos insights anteriores: {self.state['resumo_pensamentos']}")
+        if recent:
+            lines.append("Insights:")
+            lines.extend(f"- {clip_tokens(thought, PROMPT_INSIGHT_TOKEN_BUDGET)}" for thought in recent)
+        return "\n".join(lines) if lines else "Insights: nenhum"
+
+    def trends(self) -> str:
+        return clip_tokens(self.state.get("tendencias_mercado", ""), PROMPT_FIELD_TOKEN_BUDGET)
+
+    def context(self, insights: bool = True, trends: bool = False) -> str:
+        """
+        Contexto do site (descrição, insights e tendências), sem a tarefa.
+
+        Args:
+            insights: Se True, inclui o bloco de insights
+            trends: Se True, inclui o resumo das tendências de mercado
+
+        Returns:
+            str: Blocos do contexto, um por linha
+        """
+        blocks = [f"Descrição do site: {self.description()}"]
+        if insights:
+            blocks.append(self.insights())
+        if trends:
+            blocks.append(f"Tendências de mercado: {self.trends()}")
+        return "\n".join(blocks)
+
+    def messages(self, task: str, insights: bool = True, trends: bool = False) -> List["BaseMessage"]:
+        """
+        Monta o prompt de uma tarefa sobre o site já descrito.
+
+        Args:
+            task: Instrução específica da chamada (sempre no fim)
+            insights: Se True, inclui o bloco de insights
+            trends: Se True, inclui o resumo das tendências de mercado
+
+        Returns:
+            List[BaseMessage]: Mensagens de sistema e do usuário
+        """
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        return [SystemMessage(SYSTEM_PROMPT), HumanMessage(self.context(insights, trends) + "\n\n" + task)]
+
+
+def content_messages(content: str, task: str) -> List["BaseMessage"]:
+    """
+    Monta o prompt de uma tarefa sobre o conteúdo coletado do site.
+
+    Args:
+        content: Conteúdo selecionado pelo crawler
+        task: Instrução da chamada (depois do conteúdo)
+
+    Returns:
+        List[BaseMessage]: Mensagens de sistema e do usuário
+    """
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    return [SystemMessage(SYSTEM_PROMPT), HumanMessage(f"Trecho do conteúdo:\n{content}\n\n{task}")]
+
+
+def batch_messages(items: Sequence[str], task: str) -> List["BaseMessage"]:
+    """
+    Monta um único prompt com vários itens independentes (de URLs
+    diferentes), numerados a partir de 1, seguidos da tarefa comum.
+
+    Args:
+        items: Contexto de cada item (conteúdo ou PromptContext.context())
+        task: Instrução da chamada, aplicada a cada item
+
+    Returns:
+        List[BaseMessage]: Mensagens de sistema e do usuário
+    """
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    blocks = [f"{BATCH_ITEM_HEADER} {number}\n{item}" for number, item in enumerate(items, 1)]
+    return [SystemMessage(SYSTEM_PROMPT), HumanMessage("\n\n".join(blocks) + f"\n\n{BATCH_TASK_HEADER}\n{task}")]
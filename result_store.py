@@ -0,0 +1,484 @@
+"""
+Armazenamento de avaliações para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém o registro local das avaliações já feitas, junto com
+as impressões digitais do conteúdo avaliado. Quando um site é avaliado
+de novo e o conteúdo não mudou (mesmo hash) ou mudou muito pouco
+(SimHash a poucos bits de distância), o grafo reaproveita a avaliação
+guardada em vez de repetir todas as chamadas ao modelo.
+
+As avaliações também formam o histórico da interface: a tabela tem
+índices por URL, domínio, nota e data e um índice de texto completo
+(FTS5) sobre a descrição, os insights e o resumo, de modo que a busca e
+a paginação rodam no SQLite sem carregar o histórico na memória.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from constants import CACHE_DIR, RESULT_MAX_AGE, RESULT_NEAR_DUPLICATE_BITS
+from crawler import site_domain
+from fingerprint import hamming_distance
+
+# Campos do estado cobertos pela busca textual
+SEARCH_FIELDS = ("descricao", "pensamentos", "resposta_final")
+
+# Ordenações do histórico ("relevance" só vale com busca textual)
+HISTORY_ORDERS = {
+    "recent": "e.created_at DESC",
+    "rating": "e.rating DESC, e.created_at DESC",
+    "relevance": "bm25(evaluations_fts), e.created_at DESC",
+}
+
+
+@dataclass
+class StoredResult:
+    """
+    Avaliação guardada.
+
+    Attributes:
+        url: URL canônica avaliada
+        content_hash: Hash exato do conteúdo avaliado
+        simhash: SimHash do conteúdo avaliado
+        result: Campos do estado final (descrição, insights, nota, etc.)
+        created_at: Momento (epoch) da avaliação
+        distance: Distância de Hamming até o conteúdo consultado
+        id: Identificador da avaliação no histórico
+        snippet: Trecho que casou com a busca, com os termos em negrito
+    """
+    url: str
+    content_hash: str
+    simhash: int
+    result: Dict[str, Any]
+    created_at: float
+    distance: int = 0
+    id: int = 0
+    snippet: str = ""
+
+    def to_result(self) -> Dict[str, Any]:
+        """
+        Avaliação no formato de process_url.
+
+        Returns:
+            dict: Resultado guardado
+        """
+        return {
+            "descriptor": self.result.get("descricao", ""),
+            "thoughts": self.result.get("pensamentos", []),
+            "market_trends": self.result.get("tendencias_mercado", ""),
+            "rating": self.result.get("avaliacao", 0),
+            "final_answer": self.result.get("resposta_final", ""),
+            "reused": False,
+        }
+
+
+class ResultStore:
+    """
+    Interface do armazenamento de avaliações. A implementação padrão não
+    guarda nada, o que permite desligá-lo sem alterar os nós.
+    """
+
+    def __init__(self):
+        self._stats = {"exact_matches": 0, "near_matches": 0, "misses": 0, "saved": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def latest(self, url: str) -> Optional[StoredResult]:
+        """
+        Avaliação mais recente de uma URL.
+
+        Args:
+            url: URL canônica
+
+        Returns:
+            Optional[StoredResult]: Avaliação encontrada ou None
+        """
+        return None
+
+    def match(
+        self,
+        url: str,
+        content_hash: str,
+        simhash: int,
+        max_distance: int = RESULT_NEAR_DUPLICATE_BITS,
+        max_age: float = RESULT_MAX_AGE,
+    ) -> Optional[StoredResult]:
+        """
+        Procura uma avaliação recente da URL feita sobre o mesmo conteúdo
+        ou sobre um conteúdo quase igual.
+
+        Args:
+            url: URL canônica
+            content_hash: Hash exato do conteúdo atual
+            simhash: SimHash do conteúdo atual
+            max_distance: Bits de diferença aceitos no SimHash
+            max_age: Idade máxima da avaliação, em segundos
+
+        Returns:
+            Optional[StoredResult]: Avaliação reaproveitável ou None
+        """
+        stored = self.latest(url)
+        if stored is None or time.time() - stored.created_at > max_age:
+            self._count("misses")
+            return None
+        if stored.content_hash == content_hash:
+            self._count("exact_matches")
+            return stored
+        stored.distance = hamming_distance(stored.simhash, simhash)
+        if stored.distance <= max_distance:
+            self._count("near_matches")
+            return stored
+        self._count("misses")
+        return None
+
+    def save(self, url: str, content_hash: str, simhash: int, result: Dict[str, Any]) -> None:
+        """
+        Guarda uma avaliação.
+
+        Args:
+            url: URL canônica
+            content_hash: Hash exato do conteúdo avaliado
+            simhash: SimHash do conteúdo avaliado
+            result: Campos do estado final
+        """
+        self._count("saved")
+
+    def search(
+        self,
+        query: str = "",
+        domain: Optional[str] = None,
+        min_rating: int = 0,
+        order: str = "recent",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[List[StoredResult], int]:
+        """
+        Página do histórico de avaliações.
+
+        Args:
+            query: Palavras buscadas na descrição, nos insights e no resumo
+                (todas precisam aparecer; a última vale como prefixo)
+            domain: Apenas avaliações deste domínio
+            min_rating: Nota mínima
+            order: "recent", "rating" ou "relevance" (ver HISTORY_ORDERS)
+            limit: Avaliações por página
+            offset: Avaliações puladas (página * limit)
+
+        Returns:
+            Tuple[List[StoredResult], int]: Avaliações da página e o total
+                que atende aos filtros
+        """
+        return [], 0
+
+    def clear(self) -> None:
+        """
+        Remove todas as avaliações.
+        """
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Estatísticas de uso neste processo.
+
+        Returns:
+            Dict[str, int]: Contadores de reaproveitamento
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+
+class SQLiteResultStore(ResultStore):
+    """
+    Avaliações em um arquivo SQLite (modo WAL), seguro para uso por várias
+    threads e processos. Cada avaliação vira uma linha, de modo que o
+    histórico de uma URL é preservado.
+
+    Arquivos criados por versões anteriores ganham as colunas e os índices
+    do histórico na primeira abertura. Se o SQLite não tiver o FTS5, a
+    busca textual cai para LIKE sobre o JSON (percorre a tabela).
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Caminho do arquivo SQLite
+        """
+        super().__init__()
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS evaluations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    simhash TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    domain TEXT,
+                    rating INTEGER
+                )
+                """
+            )
+            self._migrate(conn)
+            for name, columns in (
+                ("evaluations_url", "url, created_at"),
+                ("evaluations_domain", "domain, created_at"),
+                ("evaluations_rating", "rating, created_at"),
+                ("evaluations_created", "created_at"),
+            ):
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON evaluations ({columns})")
+            self._fts = self._create_search_index(conn)
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """
+        Acrescenta domínio e nota às tabelas criadas sem eles e preenche
+        as linhas existentes.
+        """
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(evaluations)")}
+        for column, kind in (("domain", "TEXT"), ("rating", "INTEGER")):
+            if column not in columns:
+                try:
+                    conn.execute(f"ALTER TABLE evaluations ADD COLUMN {column} {kind}")
+                except sqlite3.OperationalError:
+                    # Outro processo acrescentou a coluna ao mesmo tempo
+                    pass
+        rows = conn.execute("SELECT id, url, result FROM evaluations WHERE domain IS NULL").fetchall()
+        conn.executemany(
+            "UPDATE evaluations SET domain = ?, rating = ? WHERE id = ?",
+            [(site_domain(url), json.loads(result).get("avaliacao", 0), row_id) for row_id, url, result in rows],
+        )
+
+    def _create_search_index(self, conn: sqlite3.Connection) -> bool:
+        """
+        Cria o índice de texto completo (e o preenche, se a tabela já tem
+        avaliações).
+
+        Returns:
+            bool: False se o SQLite não tem o FTS5
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'evaluations_fts'"
+        ).fetchone() is not None
+        if exists:
+            return True
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE evaluations_fts USING fts5("
+                f"{', '.join(SEARCH_FIELDS)}, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        except sqlite3.OperationalError as e:
+            if "already exists" in str(e):
+                return True
+            return False
+        rows = conn.execute("SELECT id, result FROM evaluations").fetchall()
+        conn.executemany(
+            "INSERT INTO evaluations_fts (rowid, descricao, pensamentos, resposta_final) VALUES (?, ?, ?, ?)",
+            [(row_id, *_search_text(json.loads(result))) for row_id, result in rows],
+        )
+        return True
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def latest(self, url: str) -> Optional[StoredResult]:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT content_hash, simhash, result, created_at FROM evaluations "
+                "WHERE url = ? ORDER BY created_at DESC LIMIT 1",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        # O SimHash tem 64 bits sem sinal e é guardado em hexadecimal
+        return StoredResult(url, row[0], int(row[1], 16), json.loads(row[2]), row[3])
+
+    def save(self, url: str, content_hash: str, simhash: int, result: Dict[str, Any]) -> None:
+        super().save(url, content_hash, simhash, result)
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO evaluations (url, domain, rating, content_hash, simhash, result, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    site_domain(url),
+                    result.get("avaliacao", 0),
+                    content_hash,
+                    f"{simhash:016x}",
+                    json.dumps(result, ensure_ascii=False),
+                    time.time(),
+                ),
+            )
+            if self._fts:
+                conn.execute(
+                    "INSERT INTO evaluations_fts (rowid, descricao, pensamentos, resposta_final) "
+                    "VALUES (?, ?, ?, ?)",
+                    (cursor.lastrowid, *_search_text(result)),
+                )
+
+    def search(
+        self,
+        query: str = "",
+        domain: Optional[str] = None,
+        min_rating: int = 0,
+        order: str = "recent",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[List[StoredResult], int]:
+        if order not in HISTORY_ORDERS:
+            raise ValueError(f"Ordenação desconhecida: {order!r} (opções: {', '.join(HISTORY_ORDERS)})")
+        source, where, params = "evaluations e", [], []
+        terms = _match_query(query) if self._fts else ""
+        if terms:
+            source += " JOIN evaluations_fts ON evaluations_fts.rowid = e.id"
+            where.append("evaluations_fts MATCH ?")
+            params.append(terms)
+        else:
+            # Os mesmos campos do índice (não as chaves do JSON); % e _
+            # digitados são procurados literalmente
+            text = " || ' ' || ".join(f"coalesce(json_extract(e.result, '$.{field}'), '')" for field in SEARCH_FIELDS)
+            for word in query.split():
+                where.append(f"({text}) LIKE ? ESCAPE '\\'")
+                params.append(f"%{_escape_like(word)}%")
+            if order == "relevance":
+                order = "recent"
+        if domain:
+            where.append("e.domain = ?")
+            params.append(site_domain(domain if "//" in domain else f"http://{domain}"))
+        if min_rating:
+            where.append("e.rating >= ?")
+            params.append(min_rating)
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        # Só a busca textual: a contagem não precisa da tabela principal
+        count_sql = (
+            "SELECT COUNT(*) FROM evaluations_fts WHERE evaluations_fts MATCH ?"
+            if terms and len(where) == 1 else f"SELECT COUNT(*) FROM {source}{clause}"
+        )
+
+        with self._connection() as conn:
+            total = conn.execute(count_sql, params).fetchone()[0]
+            # A ordenação usa só os ids; as linhas (com o JSON) são lidas
+            # depois, apenas as da página
+            ids = [row[0] for row in conn.execute(
+                f"SELECT e.id FROM {source}{clause} ORDER BY {HISTORY_ORDERS[order]} LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            )]
+            if not ids:
+                return [], total
+            marks = ", ".join("?" * len(ids))
+            rows = {row[0]: row for row in conn.execute(
+                "SELECT id, url, content_hash, simhash, result, created_at FROM evaluations "
+                f"WHERE id IN ({marks})",
+                ids,
+            )}
+            snippets = {}
+            if terms:
+                # snippet() na consulta principal rodaria para todas as
+                # linhas encontradas, antes do LIMIT
+                snippets = dict(conn.execute(
+                    "SELECT rowid, snippet(evaluations_fts, -1, '**', '**', '…', 16) FROM evaluations_fts "
+                    f"WHERE evaluations_fts MATCH ? AND rowid IN ({marks})",
+                    [terms, *ids],
+                ).fetchall())
+        entries = []
+        for row_id in ids:
+            _, url, content_hash, simhash, result, created_at = rows[row_id]
+            entries.append(StoredResult(
+                url, content_hash, int(simhash, 16), json.loads(result), created_at,
+                id=row_id, snippet=snippets.get(row_id, ""),
+            ))
+        return entries, total
+
+    def clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM evaluations")
+            if self._fts:
+                conn.execute("DELETE FROM evaluations_fts")
+
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats()
+        with self._connection() as conn:
+            stats["entries"] = conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+        return stats
+
+
+def _search_text(result: Dict[str, Any]) -> Sequence[str]:
+    # Textos de SEARCH_FIELDS, na ordem das colunas do índice
+    thoughts = result.get("pensamentos") or []
+    return (result.get("descricao", ""), "\n".join(thoughts), result.get("resposta_final", ""))
+
+
+def _escape_like(word: str) -> str:
+    return word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _match_query(query: str) -> str:
+    """
+    Converte o texto digitado em uma consulta FTS5: cada palavra entre
+    aspas (sem operadores) e a última como prefixo, para a busca funcionar
+    enquanto se digita.
+
+    Args:
+        query: Texto da busca
+
+    Returns:
+        str: Expressão para MATCH ("" sem palavras)
+    """
+    words = [word.replace('"', '""') for word in query.split()]
+    if not words:
+        return ""
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+
+_result_store: Optional[ResultStore] = None
+_result_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    """
+    Retorna o armazenamento de avaliações do processo.
+
+    O arquivo fica em CACHE_DIR; defina WEBSCRAP_RESULT_STORE=off para
+    desligá-lo (todas as avaliações passam a rodar o grafo inteiro).
+
+    Returns:
+        ResultStore: Armazenamento configurado
+    """
+    global _result_store
+    if _result_store is None:
+        with _result_store_lock:
+            if _result_store is None:
+                if os.getenv("WEBSCRAP_RESULT_STORE", "on").lower() == "off":
+                    _result_store = ResultStore()
+                else:
+                    _result_store = SQLiteResultStore(os.path.join(CACHE_DIR, "results.sqlite"))
+    return _result_store
+
+
+def set_result_store(store: ResultStore) -> None:
+    """
+    Substitui o armazenamento de avaliações do processo.
+
+    Args:
+        store: Nova instância
+    """
+    global _result_store
+    with _result_store_lock:
+        _result_store = store
@@ -5,6 +5,7 @@ Este arquivo contém as funções que determinam o fluxo de controle
 entre os nós do grafo LangGraph.
 """
 
+from typing import List, Union
 from constants import State
 
 
@@ -28,24 +29,90 @@ def decision_router(state: State) -> str:
     return "step_think_more"
 
 
+def fetch_router(state: State) -> str:
+    """
+    Função de roteamento após a coleta do conteúdo.
+    
+    Args:
+        state: Estado atual do processamento
+        
+    Returns:
+        str: Próximo passo
+            - "error": O site não pôde ser lido (fim do grafo, ver error_router)
+            - "reuse": A avaliação anterior foi reaproveitada (fim do grafo)
+            - "step_descriptor": O conteúdo precisa ser avaliado
+    """
+    if error_router(state) == "error":
+        return "error"
+    if state.get("reutilizado", False):
+        return "reuse"
+    return "step_descriptor"
+
+
+def _round_router(state: State, round_nodes: List[str]) -> Union[str, List[str]]:
+    """
+    Roteamento após step_merge nos modos paralelos.
+    
+    Args:
+        state: Estado atual do processamento
+        round_nodes: Nós executados em paralelo em cada rodada
+        
+    Returns:
+        Union[str, List[str]]: Nós da próxima rodada, ou o caminho de finalização
+    """
+    if not state.get("enough", False):
+        return round_nodes
+    if state.get("tendencias_ref", 0) < len(state.get("pensamentos", [])):
+        return "step_trends_final"
+    return "step_finalize"
+
+
+def parallel_round_router(state: State) -> Union[str, List[str]]:
+    """
+    Roteamento do modo "parallel": decisão, próximo insight e tendências
+    do insight anterior rodam ao mesmo tempo.
+    
+    Args:
+        state: Estado atual do processamento
+        
+    Returns:
+        Union[str, List[str]]: Nós da próxima rodada ou de finalização
+    """
+    return _round_router(state, ["step_decision", "step_insight", "step_trends"])
+
+
+def merged_round_router(state: State) -> Union[str, List[str]]:
+    """
+    Roteamento do modo "merged": decisão e insight em uma única chamada,
+    em paralelo com as tendências do insight anterior.
+    
+    Args:
+        state: Estado atual do processamento
+        
+    Returns:
+        Union[str, List[str]]: Nós da próxima rodada ou de finalização
+    """
+    return _round_router(state, ["step_reflect", "step_trends"])
+
+
 def error_router(state: State) -> str:
     """
     Função de roteamento para tratamento de erros.
     
-    Determina o próximo passo quando ocorre um erro no processamento.
+    Um site que não pôde ser lido (conteúdo "Error..."/"Exception...")
+    não passa pelo modelo: o grafo termina e o resultado traz o erro.
     
     Args:
         state: Estado atual do processamento
         
     Returns:
-        str: Nome do próximo nó a ser executado
+        str: Próximo passo
+            - "error": O conteúdo é uma mensagem de erro
+            - "ok": O conteúdo pode ser avaliado
     """
-    # Se há erro na descrição, finalizar com erro
-    if state.get("descricao", "").startswith(("Error", "Exception")):
-        return "step_finalize"
-    
-    # Caso contrário, continuar com decisão
-    return "step_decision"
+    if state.get("conteudo", "").startswith(("Error", "Exception")):
+        return "error"
+    return "ok"
 
 
 def validate_state(state: State) -> bool:
@@ -0,0 +1,334 @@
+"""
+Escalonador de chamadas ao modelo para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém o escalonador que fica na frente do LLM (um por modelo).
+Ele aplica orçamentos de requisições e de tokens por minuto, limita as
+chamadas simultâneas, atende as URLs em rodízio (para que uma avaliação
+não monopolize a cota) e repete chamadas que falham com 429/5xx usando
+backoff exponencial com jitter.
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+from constants import (
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+)
+
+T = TypeVar("T")
+
+
+def status_code_of(exc: BaseException) -> Optional[int]:
+    """
+    Obtém o código HTTP associado a uma exceção do cliente do provedor.
+
+    Args:
+        exc: Exceção levantada pela chamada
+
+    Returns:
+        Optional[int]: Código HTTP, se houver
+    """
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """
+    Lê o cabeçalho Retry-After (ou o atributo retry_after) de uma exceção.
+
+    Args:
+        exc: Exceção levantada pela chamada
+
+    Returns:
+        Optional[float]: Espera sugerida pelo provedor, em segundos
+    """
+    value = getattr(exc, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    """
+    Balde de fichas reabastecido continuamente; a capacidade define o
+    maior pico permitido (burst_seconds de consumo à taxa nominal).
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = 60.0):
+        self.rate = per_minute / 60.0
+        self.capacity = self.rate * burst_seconds
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def give(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class LLMScheduler:
+    """
+    Escalonador thread-safe de chamadas ao modelo.
+
+    Cada chamada entra na fila da sua chave (normalmente a URL avaliada);
+    as filas são atendidas em rodízio e cada liberação respeita os
+    orçamentos de requisições/tokens por minuto e o limite de chamadas
+    simultâneas.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = LLM_TOKENS_PER_MINUTE,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_retries: int = LLM_MAX_RETRIES,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        burst_seconds: float = 60.0,
+    ):
+        """
+        Args:
+            requests_per_minute: Orçamento de requisições por minuto
+            tokens_per_minute: Orçamento de tokens por minuto
+            max_concurrency: Máximo de chamadas simultâneas ao provedor
+            max_retries: Tentativas extras em respostas 429/5xx
+            base_delay: Espera base do backoff exponencial, em segundos
+            max_delay: Espera máxima entre tentativas, em segundos
+            burst_seconds: Janela do maior pico permitido (o provedor mede
+                as cotas por minuto, então o padrão é 60s)
+        """
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._requests = _Bucket(requests_per_minute, burst_seconds)
+        self._tokens = _Bucket(tokens_per_minute, burst_seconds)
+        self._cond = threading.Condition()
+        self._queues: "OrderedDict[str, Deque[object]]" = OrderedDict()
+        self._in_flight = 0
+        self._stats = {
+            "requests": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "failures": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def _head_ticket(self) -> Optional[object]:
+        for queue in self._queues.values():
+            return queue[0]
+        return None
+
+    def _acquire(self, key: str, tokens: float) -> None:
+        """
+        Bloqueia até que a chamada possa ser liberada.
+
+        Args:
+            key: Chave de justiça (URL avaliada)
+            tokens: Tokens estimados da chamada
+        """
+        ticket = object()
+        start = time.monotonic()
+        with self._cond:
+            self._queues.setdefault(key, deque()).append(ticket)
+            while True:
+                timeout = None
+                if self._head_ticket() is ticket and self._in_flight < self.max_concurrency:
+                    now = time.monotonic()
+                    timeout = max(
+                        self._requests.wait_time(1, now), self._tokens.wait_time(tokens, now)
+                    )
+                    if timeout == 0:
+                        break
+                self._cond.wait(timeout)
+
+            # Libera a chamada e move a chave para o fim do rodízio
+            queue = self._queues.pop(key)
+            queue.popleft()
+            if queue:
+                self._queues[key] = queue
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            self._in_flight += 1
+
+            waited = time.monotonic() - start
+            self._stats["requests"] += 1
+            self._stats["wait_seconds_total"] += waited
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+            self._cond.notify_all()
+
+    def _release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        """
+        Espera antes da próxima tentativa: Retry-After, se informado, ou
+        backoff exponencial com jitter completo.
+
+        Args:
+            attempt: Número da tentativa que falhou (a partir de 0)
+            exc: Exceção da tentativa
+
+        Returns:
+            float: Espera em segundos
+        """
+        suggested = _retry_after(exc)
+        if suggested is not None:
+            # Jitter pequeno para não sincronizar todas as tentativas
+            return min(suggested + random.uniform(0, self.base_delay), self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def run(self, fn: Callable[[], T], key: str = "", tokens: float = 1) -> T:
+        """
+        Executa uma chamada ao modelo respeitando os orçamentos e repetindo
+        em caso de 429/5xx.
+
+        Args:
+            fn: Função sem argumentos que faz a chamada
+            key: Chave de justiça (normalmente a URL avaliada)
+            tokens: Tokens estimados (prompt + resposta)
+
+        Returns:
+            T: Valor retornado por fn
+        """
+        attempt = 0
+        while True:
+            self._acquire(key, tokens)
+            try:
+                return fn()
+            except Exception as exc:
+                status = status_code_of(exc)
+                retryable = status is not None and (status == 429 or status >= 500)
+                if not retryable or attempt >= self.max_retries:
+                    with self._cond:
+                        self._stats["failures"] += 1
+                    raise
+                with self._cond:
+                    self._stats["retries"] += 1
+                    if status == 429:
+                        self._stats["rate_limited"] += 1
+                delay = self._backoff(attempt, exc)
+                attempt += 1
+            finally:
+                self._release()
+            time.sleep(delay)
+
+    def settle(self, estimated_tokens: float, actual_tokens: Optional[float], cached: bool = False) -> None:
+        """
+        Ajusta os orçamentos depois da chamada: respostas vindas do cache
+        não consomem cota e o uso real de tokens substitui a estimativa.
+
+        Args:
+            estimated_tokens: Tokens reservados em run()
+            actual_tokens: Tokens informados pelo provedor, se houver
+            cached: True se a resposta veio do cache
+        """
+        with self._cond:
+            if cached:
+                self._requests.give(1)
+                self._tokens.give(estimated_tokens)
+            elif actual_tokens is not None:
+                difference = estimated_tokens - actual_tokens
+                if difference >= 0:
+                    self._tokens.give(difference)
+                else:
+                    self._tokens.take(-difference)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Estado atual e contadores do escalonador.
+
+        Returns:
+            Dict[str, Any]: Profundidade da fila, chamadas em andamento,
+                tentativas, limitações e tempos de espera
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats["queue_depth"] = sum(len(queue) for queue in self._queues.values())
+            stats["in_flight"] = self._in_flight
+        requests = stats["requests"]
+        stats["wait_seconds_avg"] = stats["wait_seconds_total"] / requests if requests else 0.0
+        return stats
+
+
+_scheduler: Optional[LLMScheduler] = None
+# Cotas registradas com set_scheduler(..., model=...) e as criadas por padrão
+_model_schedulers: Dict[str, LLMScheduler] = {}
+_default_schedulers: Dict[str, LLMScheduler] = {}
+# set_scheduler sem modelo: o escalonador vale para todos os modelos sem cota registrada
+_shared = False
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler(model: Optional[str] = None) -> LLMScheduler:
+    """
+    Retorna o escalonador de um modelo.
+
+    O provedor mede as cotas por modelo, por isso cada modelo tem, por
+    padrão, o seu escalonador (com os orçamentos de WEBSCRAP_LLM_RPM e
+    WEBSCRAP_LLM_TPM). Um escalonador registrado com set_scheduler sem
+    modelo passa a valer para todos os modelos sem cota registrada.
+
+    Args:
+        model: Modelo da chamada (None: escalonador compartilhado)
+
+    Returns:
+        LLMScheduler: Escalonador do modelo, criado no primeiro uso
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if model is not None and model in _model_schedulers:
+            return _model_schedulers[model]
+        if model is None or _shared:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+            return _scheduler
+        if model not in _default_schedulers:
+            _default_schedulers[model] = LLMScheduler()
+        return _default_schedulers[model]
+
+
+def set_scheduler(scheduler: LLMScheduler, model: Optional[str] = None) -> None:
+    """
+    Substitui o escalonador do processo (por exemplo, com outros limites).
+
+    Args:
+        scheduler: Nova instância
+        model: Se informado, o escalonador vale só para esse modelo; senão,
+            vale para todos os modelos sem cota registrada
+    """
+    global _scheduler, _shared
+    with _scheduler_lock:
+        if model is not None:
+            _model_schedulers[model] = scheduler
+        else:
+            _scheduler, _shared = scheduler, True
@@ -0,0 +1,275 @@
+"""
+Cache semântico de respostas do modelo para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém um cache em memória que reaproveita respostas do
+modelo entre prompts quase iguais, como os de sites feitos sobre um mesmo
+modelo (franquias, SaaS white-label, espelhos com poucas diferenças),
+que o cache exato (llm_cache.py) não reconhece.
+
+A parte variável do prompt (conteúdo do site, descrição, insights) vira
+um vetor por um vetorizador de hashing local: palavras e pares de
+palavras normalizados (fingerprint.normalize_text), sem modelo treinado
+nem rede. Os vetores ficam em um índice LSH de hiperplanos aleatórios,
+que encontra os candidatos parecidos sem comparar com todas as entradas;
+o mais parecido é usado se a similaridade de cosseno passar do limiar.
+Tipos de chamada e modelos diferentes ficam em espaços separados. A
+memória do índice é limitada, com remoção LRU.
+
+Usa o numpy (requirements.txt); sem ele, o cache fica desligado.
+"""
+
+import importlib.util
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from constants import SEMANTIC_CACHE, SEMANTIC_CACHE_MAX_BYTES, SEMANTIC_CACHE_THRESHOLD
+from fingerprint import normalize_text
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Dimensão dos vetores (potência de 2) e formato do índice: tabelas de
+# LSH e bits por tabela. Com 16 tabelas de 8 bits, um par com cosseno
+# 0,9 cai no mesmo balde em pelo menos uma tabela em ~99% dos casos
+EMBED_DIM = 2048
+LSH_TABLES = 16
+LSH_BITS = 8
+
+# Custo fixo estimado de uma entrada (objetos Python e listas dos baldes)
+_ENTRY_OVERHEAD = 400
+
+
+def embed(text: str, dim: int = EMBED_DIM) -> Optional["np.ndarray"]:
+    """
+    Vetor normalizado do texto: palavras e pares de palavras, com sinal e
+    posição dados pelo CRC32 de cada termo e frequência amortecida (log).
+
+    Args:
+        text: Parte variável do prompt
+        dim: Dimensão do vetor (potência de 2)
+
+    Returns:
+        Optional[np.ndarray]: Vetor float32 de norma 1, ou None sem palavras
+    """
+    import numpy as np
+
+    words = normalize_text(text)
+    if not words:
+        return None
+    terms = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+    hashes = np.fromiter((zlib.crc32(term.encode("utf-8")) for term in terms), dtype=np.uint32, count=len(terms))
+    # Posição nos bits baixos, sinal no bit mais alto
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+    counts = np.bincount(hashes & (dim - 1), weights=signs, minlength=dim)
+    vector = (np.sign(counts) * np.log1p(np.abs(counts))).astype(np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else None
+
+
+@dataclass
+class _Entry:
+    namespace: Hashable
+    vector: "np.ndarray"
+    codes: List[int]
+    response: str
+    size: int
+
+
+class SemanticCache:
+    """
+    Respostas do modelo indexadas pela similaridade dos prompts.
+
+    Uso:
+        cache = SemanticCache(threshold=0.9)
+        response = cache.lookup(("descriptor", modelos), conteudo)
+        if response is None:
+            response = ...  # chamada ao modelo
+            cache.add(("descriptor", modelos), conteudo, response)
+    """
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_bytes: int = SEMANTIC_CACHE_MAX_BYTES,
+        dim: int = EMBED_DIM,
+        tables: int = LSH_TABLES,
+        bits: int = LSH_BITS,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            threshold: Similaridade de cosseno mínima para reaproveitar
+            max_bytes: Memória máxima estimada das entradas
+            dim: Dimensão dos vetores (potência de 2)
+            tables: Tabelas do índice LSH (mais tabelas: mais candidatos)
+            bits: Bits por tabela (mais bits: baldes mais seletivos)
+            seed: Semente dos hiperplanos
+        """
+        import numpy as np
+
+        if dim & (dim - 1):
+            raise ValueError(f"A dimensão precisa ser potência de 2: {dim}")
+        self.threshold = threshold
+        self.max_bytes = max_bytes
+        self.dim = dim
+        self.tables = tables
+        self.bits = bits
+        self._planes = np.random.default_rng(seed).standard_normal((tables * bits, dim)).astype(np.float32)
+        self._powers = 1 << np.arange(bits, dtype=np.int64)
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: Dict[Tuple[Hashable, int, int], Set[int]] = {}
+        self._next_id = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "hits": 0, "evictions": 0}
+
+    def _codes(self, vector: "np.ndarray") -> List[int]:
+        """
+        Balde do vetor em cada tabela: o lado de cada hiperplano é um bit.
+
+        Args:
+            vector: Vetor normalizado
+
+        Returns:
+            List[int]: Código de cada tabela
+        """
+        sides = (self._planes @ vector > 0).reshape(self.tables, self.bits)
+        return (sides @ self._powers).tolist()
+
+    def lookup(self, namespace: Hashable, text: str) -> Optional[str]:
+        """
+        Resposta guardada para o texto mais parecido do mesmo espaço.
+
+        Args:
+            namespace: Tipo da chamada e modelos (só entradas do mesmo
+                espaço são comparadas)
+            text: Parte variável do prompt
+
+        Returns:
+            Optional[str]: Resposta guardada, ou None se nenhuma entrada
+                passar do limiar
+        """
+        import numpy as np
+
+        vector = embed(text, self.dim)
+        codes = self._codes(vector) if vector is not None else []
+        with self._lock:
+            self._stats["lookups"] += 1
+            candidates: Set[int] = set()
+            for table, code in enumerate(codes):
+                candidates.update(self._buckets.get((namespace, table, code), ()))
+            if not candidates:
+                return None
+            ids = list(candidates)
+            scores = np.stack([self._entries[entry_id].vector for entry_id in ids]) @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            self._entries.move_to_end(ids[best])
+            self._stats["hits"] += 1
+            return self._entries[ids[best]].response
+
+    def add(self, namespace: Hashable, text: str, response: str) -> None:
+        """
+        Guarda uma resposta, removendo as menos usadas se passar da memória máxima.
+
+        Args:
+            namespace: Tipo da chamada e modelos
+            text: Parte variável do prompt
+            response: Resposta do modelo
+        """
+        vector = embed(text, self.dim)
+        if vector is None or not response:
+            return
+        codes = self._codes(vector)
+        entry = _Entry(namespace, vector, codes, response, vector.nbytes + sys.getsizeof(response) + _ENTRY_OVERHEAD)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = entry
+            self._bytes += entry.size
+            for table, code in enumerate(codes):
+                self._buckets.setdefault((namespace, table, code), set()).add(entry_id)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._evict()
+
+    def _evict(self) -> None:
+        """
+        Remove a entrada usada há mais tempo (chamado com o lock).
+        """
+        entry_id, entry = self._entries.popitem(last=False)
+        self._bytes -= entry.size
+        self._stats["evictions"] += 1
+        for table, code in enumerate(entry.codes):
+            key = (entry.namespace, table, code)
+            bucket = self._buckets[key]
+            bucket.discard(entry_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._bytes = 0
+            self._stats = {"lookups": 0, "hits": 0, "evictions": 0}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Uso do cache.
+
+        Returns:
+            Dict[str, Any]: Consultas, acertos, taxa de acerto, entradas,
+                memória estimada (e máxima) e remoções
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        stats["max_bytes"] = self.max_bytes
+        stats["hit_rate"] = stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0
+        return stats
+
+
+_cache: Optional[SemanticCache] = None
+_cache_enabled = SEMANTIC_CACHE.lower() == "on"
+_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """
+    Retorna o cache semântico do processo.
+
+    Defina WEBSCRAP_SEMANTIC_CACHE=on para ligá-lo (ou use
+    set_semantic_cache); sem o numpy, ele fica desligado.
+
+    Returns:
+        Optional[SemanticCache]: Instância única, ou None se desligado
+    """
+    global _cache, _cache_enabled
+    if not _cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if importlib.util.find_spec("numpy") is None:
+                    _cache_enabled = False
+                    return None
+                _cache = SemanticCache()
+    return _cache
+
+
+def set_semantic_cache(cache: Optional[SemanticCache]) -> None:
+    """
+    Substitui o cache semântico do processo (None desliga).
+
+    Args:
+        cache: Novo cache
+    """
+    global _cache, _cache_enabled
+    with _cache_lock:
+        _cache, _cache_enabled = cache, cache is not None
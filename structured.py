@@ -0,0 +1,173 @@
+"""
+Saída estruturada do modelo para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém os modelos das respostas que o grafo precisa
+interpretar (decisão, reflexão, avaliação final e os lotes de descrição
+e de decisão), o formato de resposta pedido ao provedor para restringir
+a saída ao esquema e a leitura validada da resposta. Também extrai
+campos de texto de um JSON ainda incompleto, para mostrar a resposta
+enquanto ela é gerada.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel, Field
+
+from constants import LLM_STRUCTURED_OUTPUT
+
+Model = TypeVar("Model", bound=BaseModel)
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class Decision(BaseModel):
+    """
+    Resposta de step_decision.
+    """
+
+    suficiente: bool = Field(description="Se há informações suficientes para uma avaliação confiável")
+
+
+class Reflection(BaseModel):
+    """
+    Resposta de step_reflect: a decisão e, se faltar informação, um novo insight.
+    """
+
+    suficiente: bool = Field(description="Se há informações suficientes para uma avaliação confiável")
+    insight: str = Field(default="", description="Insight ou fator adicional, em uma frase")
+
+
+class FinalAssessment(BaseModel):
+    """
+    Resposta de step_finalize.
+    """
+
+    resumo: str = Field(description="Avaliação final do negócio em 3-5 linhas")
+    avaliacao: int = Field(ge=1, le=10, description="Nota de 1 (ruim) a 10 (excelente)")
+
+
+class DescriptorItem(BaseModel):
+    """
+    Descrição de um item de um lote de step_descriptor.
+    """
+
+    id: int = Field(description="Número do item no prompt")
+    descricao: str = Field(description="Descritor conciso de uma linha do site")
+
+
+class DescriptorBatch(BaseModel):
+    """
+    Resposta de um lote de step_descriptor (ver batching.py).
+    """
+
+    itens: List[DescriptorItem]
+
+
+class DecisionItem(BaseModel):
+    """
+    Decisão de um item de um lote de step_decision.
+    """
+
+    id: int = Field(description="Número do item no prompt")
+    suficiente: bool = Field(description="Se há informações suficientes para uma avaliação confiável")
+
+
+class DecisionBatch(BaseModel):
+    """
+    Resposta de um lote de step_decision (ver batching.py).
+    """
+
+    itens: List[DecisionItem]
+
+
+def response_format(model: Type[BaseModel], mode: str = LLM_STRUCTURED_OUTPUT) -> Optional[Dict[str, Any]]:
+    """
+    Parâmetro response_format da API compatível com a da OpenAI (Groq).
+
+    Args:
+        model: Modelo da resposta esperada
+        mode: "json_schema", "json_object" ou "off"
+
+    Returns:
+        Optional[Dict[str, Any]]: Valor de response_format, ou None com "off"
+    """
+    if mode == "json_schema":
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": model.__name__, "schema": model.model_json_schema()},
+        }
+    if mode == "json_object":
+        return {"type": "json_object"}
+    return None
+
+
+def parse_structured(text: str, model: Type[Model]) -> Model:
+    """
+    Lê e valida a resposta do modelo. Tolera texto ou blocos de código em
+    volta do objeto JSON (provedores sem suporte a response_format).
+
+    Args:
+        text: Texto da resposta
+        model: Modelo da resposta esperada
+
+    Returns:
+        Model: Resposta validada
+
+    Raises:
+        ValueError: Sem objeto JSON ou fora do esquema (pydantic.ValidationError)
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError(f"Resposta sem objeto JSON: {text[:80]!r}")
+    return model.model_validate_json(text[start:end + 1])
+
+
+def partial_field(text: str, field: str) -> str:
+    """
+    Valor (até onde já foi gerado) de um campo de texto de um JSON
+    incompleto, usado para exibir a resposta durante o streaming.
+
+    Args:
+        text: Início do objeto JSON
+        field: Nome do campo de texto
+
+    Returns:
+        str: Trecho já decodificado do valor ("" se o campo ainda não começou)
+    """
+    key = text.find(json.dumps(field))
+    if key < 0:
+        return ""
+    position = text.find(":", key + len(field) + 2)
+    if position < 0:
+        return ""
+    position += 1
+    while position < len(text) and text[position].isspace():
+        position += 1
+    if position >= len(text) or text[position] != '"':
+        return ""
+
+    value = []
+    position += 1
+    while position < len(text):
+        char = text[position]
+        if char == '"':
+            break
+        if char != "\\":
+            value.append(char)
+            position += 1
+            continue
+        # Sequência de escape ainda incompleta: para antes dela
+        escape = text[position + 1:position + 2]
+        if escape == "u":
+            digits = text[position + 2:position + 6]
+            if len(digits) < 4:
+                break
+            value.append(chr(int(digits, 16)))
+            position += 6
+        elif escape:
+            value.append(_ESCAPES.get(escape, escape))
+            position += 2
+        else:
+            break
+    return "".join(value)
@@ -0,0 +1,18 @@
+"""
+Configuração dos testes: os módulos do projeto ficam na raiz do
+repositório e os testes rodam sem rede externa, com caches desligados e
+o diretório de caches em uma pasta temporária.
+"""
+
+import os
+import sys
+import tempfile
+
+# Antes de importar constants (CACHE_DIR é lido na importação)
+os.environ["WEBSCRAP_CACHE_DIR"] = tempfile.mkdtemp(prefix="webscrap-tests-")
+os.environ["WEBSCRAP_LLM_CACHE"] = "off"
+os.environ["WEBSCRAP_CONTENT_CACHE"] = "off"
+os.environ["WEBSCRAP_RESULT_STORE"] = "off"
+os.environ.setdefault("GROQ_API_KEY", "tests-offline")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
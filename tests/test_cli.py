@@ -0,0 +1,140 @@
+import io
+import json
+
+import pytest
+
+from cli import ParquetResultWriter, Progress, ResultWriter, read_urls, run
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_read_urls_csv_with_header(tmp_path):
+    path = _write(tmp_path / "urls.csv", "nome,URL\nA,a.com\nB,https://b.com\nC,a.com\nD,\n")
+
+    assert read_urls(path) == ["https://a.com", "https://b.com"]
+
+
+def test_read_urls_csv_without_header(tmp_path):
+    path = _write(tmp_path / "urls.csv", "a.com,Empresa A\nhttp://b.com,Empresa B\n")
+
+    assert read_urls(path) == ["https://a.com", "http://b.com"]
+
+
+def test_read_urls_csv_skips_unknown_header(tmp_path):
+    path = _write(tmp_path / "urls.csv", "site,nome\na.com,A\n")
+
+    assert read_urls(path) == ["https://a.com"]
+
+
+def test_read_urls_jsonl_and_lines(tmp_path):
+    jsonl = _write(tmp_path / "urls.jsonl", '{"url": "a.com"}\n\n{"url": "b.com", "nome": "B"}\n')
+    lines = _write(tmp_path / "urls.txt", "# comentário\na.com\n\n  b.com  \na.com\n")
+
+    assert read_urls(jsonl) == ["https://a.com", "https://b.com"]
+    assert read_urls(lines) == ["https://a.com", "https://b.com"]
+
+
+def test_completed_ignores_truncated_last_line(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_text('{"url": "https://a.com", "rating": 7}\n{"url": "https://b.com", "rat', encoding="utf-8")
+    writer = ResultWriter(str(path))
+
+    assert writer.completed() == {"https://a.com"}
+
+    # A retomada completa a linha cortada antes de gravar
+    writer.open()
+    writer.write({"url": "https://b.com", "rating": 5})
+    writer.close()
+    assert writer.completed() == {"https://a.com", "https://b.com"}
+    assert path.read_text(encoding="utf-8").splitlines()[-1] == '{"url": "https://b.com", "rating": 5}'
+
+
+def test_completed_reruns_error_rows(tmp_path, monkeypatch):
+    path = tmp_path / "out.jsonl"
+    path.write_text(
+        '{"url": "https://a.com", "rating": 7}\n'
+        '{"url": "https://b.com", "error": "Exception: timeout"}\n'
+        '{"url": "https://c.com", "rating": 6, "error": null}\n',
+        encoding="utf-8",
+    )
+    writer = ResultWriter(str(path))
+    assert writer.completed() == {"https://a.com", "https://c.com"}
+
+    evaluated = []
+
+    def process_many(urls, on_result, **kwargs):
+        for index, url in enumerate(urls):
+            evaluated.append(url)
+            on_result(index, url, {"rating": 8, "trace": {}})
+
+    monkeypatch.setattr("backend.process_many", process_many)
+    counts = run(["https://a.com", "https://b.com", "https://c.com", "https://d.com"], writer, progress=False)
+
+    assert evaluated == ["https://b.com", "https://d.com"]
+    assert counts == {"total": 4, "skipped": 2, "done": 2, "errors": 0}
+    assert writer.completed() == {"https://a.com", "https://b.com", "https://c.com", "https://d.com"}
+
+
+def test_parquet_resume_with_partial_jsonl(tmp_path):
+    # pyarrow é opcional (requirements-extras.txt) e falha ao importar com um numpy incompatível
+    pytest.importorskip("pyarrow", exc_type=ImportError)
+    import pyarrow.parquet as pq
+
+    path = str(tmp_path / "out.parquet")
+    writer = ParquetResultWriter(path)
+    writer.open()
+    writer.write({"url": "https://a.com", "rating": 7, "thoughts": ["x"], "trace": {"total_ms": 1}})
+    writer.write({"url": "https://b.com", "error": "Exception: timeout"})
+    writer.close()
+    assert not (tmp_path / "out.parquet.partial.jsonl").exists()
+
+    # Execução interrompida: o resultado só chegou ao arquivo parcial
+    writer = ParquetResultWriter(path)
+    writer.open()
+    writer.write({"url": "https://c.com", "rating": 5})
+    writer._file.close()
+
+    writer = ParquetResultWriter(path)
+    assert writer.completed() == {"https://a.com", "https://c.com"}
+    writer.open()
+    writer.write({"url": "https://b.com", "rating": 6})
+    writer.close()
+
+    rows = pq.read_table(path).to_pylist()
+    assert [row["url"] for row in rows] == ["https://a.com", "https://b.com", "https://c.com", "https://b.com"]
+    assert json.loads(rows[0]["trace"]) == {"total_ms": 1}
+    assert rows[0]["thoughts"] == ["x"]
+    assert ParquetResultWriter(path).completed() == {"https://a.com", "https://b.com", "https://c.com"}
+    assert not (tmp_path / "out.parquet.partial.jsonl").exists()
+
+
+def test_progress_renders_counts_and_errors():
+    stream = io.StringIO()
+    progress = Progress(3, stream=stream, interval=0)
+
+    progress.update()
+    progress.update(error=True)
+    progress.update()
+    rendered = stream.getvalue()
+    progress.finish()
+
+    assert rendered.count("\r") == 3
+    assert rendered.rsplit("\r", 1)[-1].startswith("3/3 URLs")
+    assert "erros 1" in rendered
+    # Nada novo a mostrar: finish só encerra a linha
+    assert stream.getvalue() == rendered + "\n"
+
+
+def test_progress_finish_renders_pending_update():
+    stream = io.StringIO()
+    progress = Progress(3, stream=stream, interval=3600)
+    progress.update()
+    progress.update()
+
+    progress.finish()
+
+    assert stream.getvalue().rstrip("\n").rsplit("\r", 1)[-1].startswith("2/3 URLs")
+    assert "ETA" in stream.getvalue()
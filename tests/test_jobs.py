@@ -0,0 +1,168 @@
+import pytest
+
+from jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue, job_id, work
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite"))
+
+
+def _expire(queue, identifier):
+    with queue._connection() as conn:
+        conn.execute("UPDATE jobs SET lease_until = 0 WHERE id = ?", (identifier,))
+
+
+def test_submit_is_idempotent(queue):
+    identifier = queue.submit("https://exemplo.com")
+
+    assert queue.submit("https://exemplo.com/") == identifier
+    assert queue.submit("https://EXEMPLO.com") == identifier
+    assert len(queue.list()) == 1
+    assert queue.get(identifier).run == 1
+
+
+def test_submit_keys_jobs_by_mode(queue):
+    default = queue.submit("https://exemplo.com")
+    parallel = queue.submit("https://exemplo.com", mode="parallel")
+
+    assert default != parallel
+    assert parallel == job_id("https://exemplo.com", "parallel")
+    assert queue.get(parallel).mode == "parallel"
+
+
+def test_submit_keeps_recent_result_and_requeues_stale_one(queue):
+    identifier = queue.submit("https://exemplo.com")
+    queue.complete(queue.claim("w1"), {"rating": 7})
+
+    assert queue.submit("https://exemplo.com") == identifier
+    assert queue.get(identifier).status == DONE
+
+    queue.submit("https://exemplo.com", max_age=0)
+    job = queue.get(identifier)
+    assert (job.status, job.run, job.result) == (QUEUED, 2, None)
+
+
+def test_submit_force_refresh_requeues_done_job(queue):
+    identifier = queue.submit("https://exemplo.com")
+    queue.complete(queue.claim("w1"), {"rating": 7})
+
+    queue.submit("https://exemplo.com", force_refresh=True)
+
+    job = queue.get(identifier)
+    assert (job.status, job.run, job.force_refresh) == (QUEUED, 2, True)
+
+
+def test_claim_takes_oldest_job_once(queue):
+    first = queue.submit("https://a.com")
+    second = queue.submit("https://b.com")
+
+    claimed = [queue.claim("w1"), queue.claim("w2"), queue.claim("w3")]
+
+    assert [job.id for job in claimed[:2]] == [first, second]
+    assert claimed[2] is None
+    assert [job.worker for job in claimed[:2]] == ["w1", "w2"]
+    assert all(job.status == RUNNING and job.attempts == 1 for job in claimed[:2])
+
+
+def test_heartbeat_keeps_lease_of_live_worker(queue):
+    identifier = queue.submit("https://exemplo.com")
+    queue.claim("w1", lease=60)
+    _expire(queue, identifier)
+
+    queue.heartbeat("w1", identifier, lease=60)
+
+    assert queue.claim("w2") is None
+    assert queue.active_workers() == 1
+
+
+def test_stale_job_is_taken_over_by_another_worker(queue):
+    identifier = queue.submit("https://exemplo.com")
+    queue.claim("w1")
+    _expire(queue, identifier)
+
+    job = queue.claim("w2")
+
+    assert (job.id, job.worker, job.attempts) == (identifier, "w2", 2)
+    # O worker antigo não renova nem conclui o job que perdeu
+    queue.heartbeat("w1", identifier)
+    assert queue.get(identifier).worker == "w2"
+
+
+def test_release_returns_job_without_counting_attempt(queue):
+    identifier = queue.submit("https://exemplo.com")
+
+    queue.release(queue.claim("w1"))
+
+    job = queue.get(identifier)
+    assert (job.status, job.attempts) == (QUEUED, 0)
+    assert queue.claim("w2").attempts == 1
+
+
+def test_fail_requeues_until_max_attempts(queue):
+    identifier = queue.submit("https://exemplo.com")
+
+    for attempt in (1, 2):
+        queue.fail(queue.claim("w1"), f"Exception: falha {attempt}", max_attempts=3)
+        job = queue.get(identifier)
+        assert (job.status, job.attempts, job.error) == (QUEUED, attempt, f"Exception: falha {attempt}")
+
+    queue.fail(queue.claim("w1"), "Exception: falha 3", max_attempts=3)
+
+    assert queue.get(identifier).status == FAILED
+    assert queue.claim("w1") is None
+    # Reenviar um job que falhou abre uma nova execução
+    queue.submit("https://exemplo.com")
+    job = queue.get(identifier)
+    assert (job.status, job.attempts, job.run, job.error) == (QUEUED, 0, 2, None)
+
+
+def test_expired_lease_after_max_attempts_fails_job(queue):
+    identifier = queue.submit("https://exemplo.com")
+    queue.claim("w1", max_attempts=1)
+    _expire(queue, identifier)
+
+    assert queue.claim("w2", max_attempts=1) is None
+    job = queue.get(identifier)
+    assert (job.status, job.error) == (FAILED, "Prazo de posse vencido")
+
+
+def test_work_resumes_from_checkpoint_after_node_crash(tmp_path, monkeypatch):
+    import models
+    import scheduler
+    from benchmarks.fake_llm import FINAL_PATTERN, FakeChatModel, decision_script
+    from benchmarks.fixtures import FixtureServer, load_corpus
+
+    prompts = []
+
+    class CrashingModel(FakeChatModel):
+        """Cai na primeira chamada da avaliação final."""
+
+        def respond(self, prompt: str) -> str:
+            prompts.append(prompt)
+            if FINAL_PATTERN in prompt and sum(FINAL_PATTERN in p for p in prompts) == 1:
+                raise RuntimeError("worker caiu")
+            return super().respond(prompt)
+
+    monkeypatch.setattr(models, "_router", models.ModelRouter.single(CrashingModel(script=decision_script([True]))))
+    monkeypatch.setattr(scheduler, "_scheduler", scheduler.LLMScheduler(
+        requests_per_minute=1e9, tokens_per_minute=1e12, max_concurrency=32
+    ))
+    monkeypatch.setattr(scheduler, "_shared", True)
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    checkpoints = str(tmp_path / "checkpoints.sqlite")
+    with FixtureServer(load_corpus(sizes_kb=(5,))) as server:
+        identifier = queue.submit(server.urls(1)[0])
+
+        assert work(queue, worker="w1", checkpoint_path=checkpoints, max_jobs=1) == 1
+        job = queue.get(identifier)
+        assert (job.status, job.attempts, job.error) == (QUEUED, 1, "Exception: worker caiu")
+        before_crash = len(prompts)
+
+        assert work(queue, worker="w2", checkpoint_path=checkpoints, max_jobs=1) == 1
+
+    job = queue.get(identifier)
+    assert (job.status, job.worker, job.result["rating"]) == (DONE, "w2", 7)
+    # Só o nó que caiu roda de novo: os anteriores vêm do checkpoint
+    assert len(prompts) == before_crash + 1
+    assert FINAL_PATTERN in prompts[-1]
@@ -0,0 +1,167 @@
+import json
+import sqlite3
+
+import pytest
+
+from result_store import SQLiteResultStore
+
+
+def _result(descricao, rating, pensamentos=(), resposta_final=""):
+    return {
+        "descricao": descricao,
+        "pensamentos": list(pensamentos),
+        "tendencias_mercado": "",
+        "avaliacao": rating,
+        "resposta_final": resposta_final,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteResultStore(str(tmp_path / "results.sqlite"))
+    for url, result in (
+        ("https://www.financas.com/", _result("Plataforma de gestão financeira", 8, ["Receita recorrente"])),
+        ("https://financas.com/precos", _result("Planos de conciliação bancária", 6)),
+        ("https://loja.com.br/", _result("Loja de roupas com 50% de desconto", 4, resposta_final="Mercado saturado")),
+        ("https://dados.io/", _result("Análise de dados_brutos para varejo", 9)),
+    ):
+        store.save(url, "hash", 0, result)
+    # Datas distintas e na ordem de gravação, sem depender da resolução do relógio
+    with store._connection() as conn:
+        conn.execute("UPDATE evaluations SET created_at = id")
+    return store
+
+
+@pytest.fixture(params=["fts", "like"])
+def any_store(request, store):
+    # Sem o FTS5, a busca cai para LIKE sobre os mesmos campos
+    if request.param == "like":
+        store._fts = False
+    return store
+
+
+def _urls(entries):
+    return [entry.url for entry in entries]
+
+
+def test_fts_search_with_prefix_and_snippet(store):
+    assert store._fts
+
+    entries, total = store.search("gestao financ")
+
+    assert (total, _urls(entries)) == (1, ["https://www.financas.com/"])
+    assert "**" in entries[0].snippet
+
+
+def test_fts_search_covers_thoughts_and_final_answer(store):
+    assert _urls(store.search("recorrente")[0]) == ["https://www.financas.com/"]
+    assert _urls(store.search("saturado")[0]) == ["https://loja.com.br/"]
+
+
+def test_fts_search_ignores_operators(store):
+    assert store.search('financeira OR "roupas"') == ([], 0)
+    assert store.search("NOT")[1] == 0
+
+
+def test_search_requires_every_word(any_store):
+    entries, total = any_store.search("gestão plataforma")
+
+    assert (total, _urls(entries)) == (1, ["https://www.financas.com/"])
+    assert any_store.search("gestão roupas") == ([], 0)
+
+
+def test_like_fallback_escapes_wildcards(store):
+    store._fts = False
+
+    assert _urls(store.search("50%")[0]) == ["https://loja.com.br/"]
+    assert _urls(store.search("dados_brutos")[0]) == ["https://dados.io/"]
+    # % e _ digitados não casam com qualquer texto
+    assert store.search("%")[1] == 1
+    assert store.search("_")[1] == 1
+    assert store.search("a_b") == ([], 0)
+
+
+def test_like_fallback_ignores_json_keys(store):
+    store._fts = False
+
+    assert store.search("avaliacao") == ([], 0)
+    assert store.search("descricao") == ([], 0)
+
+
+def test_like_fallback_orders_relevance_by_date(store):
+    store._fts = False
+
+    entries, total = store.search("de", order="relevance")
+
+    assert total == 4
+    assert _urls(entries)[0] == "https://dados.io/"
+
+
+def test_domain_filter(any_store):
+    entries, total = any_store.search(domain="financas.com")
+
+    assert total == 2
+    assert set(_urls(entries)) == {"https://www.financas.com/", "https://financas.com/precos"}
+    assert any_store.search(domain="https://www.financas.com/sobre")[1] == 2
+    assert any_store.search("conciliação", domain="www.financas.com")[1] == 1
+    assert any_store.search("roupas", domain="financas.com") == ([], 0)
+
+
+def test_rating_filter_and_order(any_store):
+    entries, total = any_store.search(min_rating=6, order="rating")
+
+    assert total == 3
+    assert [entry.result["avaliacao"] for entry in entries] == [9, 8, 6]
+    assert any_store.search("de", min_rating=9)[1] == 1
+
+
+def test_paging_keeps_total(any_store):
+    pages = [any_store.search(limit=3, offset=offset) for offset in (0, 3, 6)]
+
+    assert [total for _, total in pages] == [4, 4, 4]
+    assert [len(entries) for entries, _ in pages] == [3, 1, 0]
+    # Mais recentes primeiro, sem repetições entre as páginas
+    assert _urls(pages[0][0] + pages[1][0]) == [
+        "https://dados.io/", "https://loja.com.br/", "https://financas.com/precos", "https://www.financas.com/",
+    ]
+
+    entries, total = any_store.search("de", limit=2, offset=2)
+    assert (total, len(entries)) == (4, 2)
+
+
+def test_unknown_order(store):
+    with pytest.raises(ValueError):
+        store.search(order="alphabetical")
+
+
+def test_migrates_old_schema(tmp_path):
+    path = str(tmp_path / "old.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE evaluations (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT NOT NULL, "
+        "content_hash TEXT NOT NULL, simhash TEXT NOT NULL, result TEXT NOT NULL, created_at REAL NOT NULL)"
+    )
+    conn.executemany(
+        "INSERT INTO evaluations (url, content_hash, simhash, result, created_at) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("https://www.antigo.com/", "h1", f"{2 ** 63:016x}", json.dumps(_result("Consultoria tributária", 7)), 1.0),
+            ("https://novo.com/", "h2", "0" * 16, json.dumps({"descricao": "Sem nota"}), 2.0),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    store = SQLiteResultStore(path)
+
+    with store._connection() as conn:
+        rows = conn.execute("SELECT url, domain, rating FROM evaluations ORDER BY id").fetchall()
+    assert rows == [("https://www.antigo.com/", "antigo.com", 7), ("https://novo.com/", "novo.com", 0)]
+    assert _urls(store.search("tributaria")[0]) == ["https://www.antigo.com/"]
+    assert store.search(domain="antigo.com", min_rating=5)[1] == 1
+    assert store.latest("https://www.antigo.com/").simhash == 2 ** 63
+
+    # Reabrir o arquivo já migrado não repete a migração
+    store.save("https://www.antigo.com/", "h3", 0, _result("Consultoria tributária e contábil", 8))
+    reopened = SQLiteResultStore(path)
+    assert reopened.search("tributaria")[1] == 2
+    assert reopened.stats()["entries"] == 3
@@ -0,0 +1,80 @@
+import pytest
+
+from structured import Decision, FinalAssessment, Reflection, parse_structured, partial_field
+
+
+def test_parse_structured_plain_json():
+    decision = parse_structured('{"suficiente": true}', Decision)
+
+    assert decision.suficiente is True
+
+
+def test_parse_structured_fenced_json():
+    text = 'Segue a avaliação:\n```json\n{"resumo": "Negócio sólido.", "avaliacao": 8}\n```\nObrigado!'
+
+    assessment = parse_structured(text, FinalAssessment)
+
+    assert (assessment.resumo, assessment.avaliacao) == ("Negócio sólido.", 8)
+
+
+def test_parse_structured_accepts_string_typed_number():
+    assessment = parse_structured('{"resumo": "Ok.", "avaliacao": "7"}', FinalAssessment)
+
+    assert assessment.avaliacao == 7
+
+
+@pytest.mark.parametrize("rating", [0, 11, -3, "nota 8", 7.5])
+def test_parse_structured_rejects_invalid_rating(rating):
+    text = '{"resumo": "Ok.", "avaliacao": %s}' % (f'"{rating}"' if isinstance(rating, str) else rating)
+
+    with pytest.raises(ValueError):
+        parse_structured(text, FinalAssessment)
+
+
+def test_parse_structured_rejects_text_without_json():
+    with pytest.raises(ValueError, match="sem objeto JSON"):
+        parse_structured("Nota 8: negócio promissor.", FinalAssessment)
+
+    with pytest.raises(ValueError):
+        parse_structured("} fechado antes de abrir {", Decision)
+
+
+def test_parse_structured_rejects_missing_field():
+    with pytest.raises(ValueError):
+        parse_structured('{"avaliacao": 8}', FinalAssessment)
+
+
+def test_parse_structured_defaults_optional_field():
+    reflection = parse_structured('{"suficiente": false}', Reflection)
+
+    assert (reflection.suficiente, reflection.insight) == (False, "")
+
+
+def test_partial_field_before_value_starts():
+    assert partial_field("", "resumo") == ""
+    assert partial_field('{"resu', "resumo") == ""
+    assert partial_field('{"resumo"', "resumo") == ""
+    assert partial_field('{"resumo": ', "resumo") == ""
+    assert partial_field('{"avaliacao": 8', "resumo") == ""
+
+
+def test_partial_field_incomplete_value():
+    assert partial_field('{"resumo": "Negócio com', "resumo") == "Negócio com"
+    assert partial_field('{"avaliacao": 8, "resumo":"Ok', "resumo") == "Ok"
+
+
+def test_partial_field_complete_value():
+    assert partial_field('{"resumo": "Negócio sólido.", "avaliacao": 8}', "resumo") == "Negócio sólido."
+
+
+def test_partial_field_escaped_quotes():
+    text = '{"resumo": "O slogan \\"pague menos\\" atrai'
+
+    assert partial_field(text, "resumo") == 'O slogan "pague menos" atrai'
+    assert partial_field(text + ' clientes\\nnovos"}', "resumo") == 'O slogan "pague menos" atrai clientes\nnovos'
+
+
+def test_partial_field_stops_before_incomplete_escape():
+    assert partial_field('{"resumo": "Aspas \\', "resumo") == "Aspas "
+    assert partial_field('{"resumo": "Cr\\u00e', "resumo") == "Cr"
+    assert partial_field('{"resumo": "Cr\\u00e9dito', "resumo") == "Crédito"
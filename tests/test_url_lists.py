@@ -0,0 +1,35 @@
+import io
+
+import pytest
+
+from url_lists import read_url_stream, split_url_text
+
+
+def test_read_url_stream_csv():
+    assert read_url_stream(io.StringIO("url\na.com\n"), "csv") == ["https://a.com"]
+    assert read_url_stream(io.StringIO("a.com,A\nb.com,B\n"), "csv") == ["https://a.com", "https://b.com"]
+    assert read_url_stream(io.StringIO(""), "csv") == []
+
+
+def test_read_url_stream_lines_and_jsonl():
+    lines = io.StringIO("# concorrentes\nhttp://a.com\n\nb.com\nb.com\n")
+    jsonl = io.StringIO('{"url": "a.com"}\n\n{"url": "https://b.com"}\n')
+
+    assert read_url_stream(lines) == ["http://a.com", "https://b.com"]
+    assert read_url_stream(jsonl, "jsonl") == ["https://a.com", "https://b.com"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("a.com\nb.com  c.com\t d.com", ["a.com", "b.com", "c.com", "d.com"]),
+    ("a.com, b.com; c.com,", ["a.com", "b.com", "c.com"]),
+    ("a.com,b.com;https://c.com", ["a.com", "b.com", "https://c.com"]),
+    ("https://a.com/busca?ids=1,2,3", ["https://a.com/busca?ids=1,2,3"]),
+    ("https://a.com/p;jsessionid=AB12", ["https://a.com/p;jsessionid=AB12"]),
+    ("https://a.com/?tag=b.com,c.com", ["https://a.com/?tag=b.com,c.com"]),
+    ("https://a.com/?q=1,https://b.com/?q=2,3", ["https://a.com/?q=1", "https://b.com/?q=2,3"]),
+    ("www.a.com.br/sobre,loja.io", ["www.a.com.br/sobre", "loja.io"]),
+    ("", []),
+    (" ,; ", []),
+])
+def test_split_url_text(text, expected):
+    assert split_url_text(text) == expected
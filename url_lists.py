@@ -0,0 +1,112 @@
+"""
+Listas de URLs para o AI Agent - Avaliação de Negócios
+
+Este arquivo contém a leitura das listas de URLs usadas pela linha de
+comando (cli.py) e pelo modo de comparação da interface: arquivos CSV,
+JSONL ou com uma URL por linha e o texto colado no formulário. As URLs
+voltam sem repetições, na ordem original e com esquema.
+"""
+
+import csv
+import json
+import re
+from typing import Iterator, List, Set, TextIO
+
+# Começo de uma URL: com esquema ou um domínio com extensão (exemplo.com.br/...)
+_SCHEME = re.compile(r"https?://", re.IGNORECASE)
+_URL_START = re.compile(r"(?:https?://)?[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}(?:[/:?#]|$)", re.IGNORECASE)
+
+
+def _urls_from_csv(stream: TextIO) -> Iterator[str]:
+    """
+    URLs de um CSV: a coluna "url" se houver cabeçalho, senão a primeira.
+
+    Args:
+        stream: Arquivo CSV aberto
+
+    Yields:
+        str: URLs na ordem do arquivo
+    """
+    rows = csv.reader(stream)
+    header = next(rows, None)
+    if header is None:
+        return
+    lowered = [column.strip().lower() for column in header]
+    if "url" in lowered:
+        column = lowered.index("url")
+    else:
+        # Sem cabeçalho reconhecido: a primeira linha já é uma URL?
+        column = 0
+        if "." in header[0]:
+            yield header[0]
+    for row in rows:
+        if len(row) > column:
+            yield row[column]
+
+
+def _urls_from_jsonl(stream: TextIO) -> Iterator[str]:
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)["url"]
+
+
+def _urls_from_lines(stream: TextIO) -> Iterator[str]:
+    for line in stream:
+        yield line
+
+
+def read_url_stream(stream: TextIO, input_format: str = "lines") -> List[str]:
+    """
+    Lê as URLs de um arquivo já aberto (ou de um texto em io.StringIO),
+    sem repetições e na ordem original.
+
+    Args:
+        stream: Entrada em texto
+        input_format: "csv", "jsonl" ou "lines"
+
+    Returns:
+        List[str]: URLs normalizadas (com esquema)
+    """
+    readers = {"csv": _urls_from_csv, "jsonl": _urls_from_jsonl, "lines": _urls_from_lines}
+    seen: Set[str] = set()
+    unique = []
+    for url in readers[input_format](stream):
+        url = url.strip()
+        if not url or url.startswith("#"):
+            continue
+        if not url.startswith(("http://", "https://")):
+            url = "https://" + url
+        if url not in seen:
+            seen.add(url)
+            unique.append(url)
+    return unique
+
+
+def split_url_text(text: str) -> List[str]:
+    """
+    Separa as URLs de um texto colado. Espaços e quebras de linha sempre
+    separam; vírgula e ponto e vírgula só separam quando o que vem depois
+    começa uma URL, de modo que URLs com vírgula na query
+    (?ids=1,2 ou ;jsessionid=...) continuam inteiras. Depois de uma query
+    ou âncora, só uma URL com esquema começa um novo item.
+
+    Args:
+        text: URLs coladas
+
+    Returns:
+        List[str]: Itens na ordem do texto (sem normalização)
+    """
+    items = []
+    for token in text.split():
+        parts = re.split(r"([,;])", token.strip(",;"))
+        current = parts[0]
+        for separator, part in zip(parts[1::2], parts[2::2]):
+            starts_url = _SCHEME.match(part) or (_URL_START.match(part) and not re.search(r"[?#]", current))
+            if starts_url:
+                items.append(current.rstrip(",;"))
+                current = part
+            else:
+                current += separator + part
+        items.append(current.rstrip(",;"))
+    return [item for item in items if item]